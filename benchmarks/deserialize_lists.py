@@ -0,0 +1,62 @@
+"""Per-row cost of building model instances from large list responses
+
+Compares the regular marshmallow path (BaseSchema._get_instance) with loaders compiled
+by gradient.api_sdk.serializers.compiler on notebook, machine and model list responses.
+
+Usage: python benchmarks/deserialize_lists.py [--rows N] [--repeat N]
+"""
+import argparse
+import copy
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from gradient.api_sdk import serializers  # noqa: E402
+from gradient.api_sdk.serializers import compiler  # noqa: E402
+from tests import example_responses  # noqa: E402
+
+
+def get_notebook_rows():
+    rows = copy.deepcopy(example_responses.NOTEBOOKS_LIST_RESPONSE_JSON["notebookList"])
+    for row in rows:
+        row["id"] = row["handle"]
+    return rows
+
+
+CASES = [
+    ("notebooks", serializers.NotebookSchema, get_notebook_rows),
+    ("machines", serializers.MachineSchema, lambda: example_responses.LIST_MACHINES_RESPONSE),
+    ("models", serializers.Model, lambda: example_responses.LIST_MODELS_RESPONSE_JSON["modelList"]),
+]
+
+
+def make_rows(sample_rows, count):
+    return [sample_rows[i % len(sample_rows)] for i in range(count)]
+
+
+def measure(func, rows, repeat):
+    timer = timeit.Timer(lambda: [func(row) for row in rows])
+    return min(timer.repeat(repeat=repeat, number=1)) / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000, help="number of rows of every list")
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs, the fastest one is reported")
+    args = parser.parse_args()
+
+    print("{:<12}{:>16}{:>16}{:>10}".format("list", "regular us/row", "compiled us/row", "speedup"))
+    for name, schema_cls, get_sample_rows in CASES:
+        rows = make_rows(get_sample_rows(), args.rows)
+        schema = schema_cls()
+        loader = compiler.get_loader(schema)
+
+        regular = measure(schema._get_instance, rows, args.repeat)
+        compiled = measure(loader, rows, args.repeat)
+        print("{:<12}{:>16.1f}{:>16.1f}{:>9.1f}x".format(name, regular * 1e6, compiled * 1e6, regular / compiled))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-# noinspection PyUnresolvedReferences
-from gradient_utils import *
+from .api_sdk.lazy import lazy_star_import
 
-from .api_sdk import *
+lazy_star_import(__name__, ["gradient_utils", ".api_sdk"])
@@ -1,6 +1,7 @@
-from .clients import *
-from .constants import *
-from .models import *
-from .repositories import *
-from .archivers import ZipArchiver
-from .sdk_exceptions import *
+from .lazy import lazy_star_import
+
+lazy_star_import(
+    __name__,
+    [".clients", ".constants", ".models", ".repositories", ".sdk_exceptions"],
+    names_from={"ZipArchiver": ".archivers"},
+)
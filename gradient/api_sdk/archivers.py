@@ -1,11 +1,26 @@
+import collections
+import concurrent.futures
 import fnmatch
+import multiprocessing
 import os
+import shutil
+import struct
+import tempfile
+import time
 import zipfile
+import zlib
 
 import progressbar
 
 from .logger import MuteLogger
 
+# content of these files is compressed already, deflating it again costs CPU and saves nothing
+STORED_EXTENSIONS = ('.pt', '.pth', '.safetensors', '.npz', '.zip', '.gz', '.bz2', '.xz', '.jpg', '.jpeg', '.png')
+COPY_BUFFER_SIZE = 1024 * 1024
+
+ZIP64_LIMIT = zipfile.ZIP64_LIMIT
+ZIP_FILECOUNT_LIMIT = zipfile.ZIP_FILECOUNT_LIMIT
+
 
 class ZipArchiver(object):
     DEFAULT_EXCLUDED_PATHS = [
@@ -41,6 +56,16 @@ class ZipArchiver(object):
         self._archive(file_paths, output_file_path)
         self.logger.log('Finished creating archive: %s' % output_file_path)
 
+    def get_stream(self, input_dir_path, exclude=None):
+        """Get archive of the directory with stored entries that is built while it is read
+
+        :param str input_dir_path:
+        :param list|tuple|None exclude:
+        :rtype: StoredZipStream
+        """
+        file_paths = self.get_file_paths(input_dir_path, self.get_excluded_paths(exclude))
+        return StoredZipStream(file_paths, logger=self.logger)
+
     def get_excluded_paths(self, exclude=None):
         """
         :param list|tuple|None exclude:
@@ -118,3 +143,349 @@ class ZipArchiverWithProgressbar(ZipArchiver):
 
     def _archive_iterate_callback(self, i):
         self.bar.update(i)
+
+
+def _deflate_file(path, tmp_dir, level):
+    """Compress a file to a temporary file with raw deflate, as it is stored in zip archives
+
+    Runs in worker processes of ParallelZipArchiver.
+
+    :returns: path of the compressed file, CRC-32 and size of the original content and compressed size
+    :rtype: tuple[str,int,int,int]
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    crc = 0
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    with open(path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+        for chunk in iter(lambda: src.read(COPY_BUFFER_SIZE), b''):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            dst.write(compressor.compress(chunk))
+        dst.write(compressor.flush())
+        compress_size = dst.tell()
+
+    return tmp_path, crc, size, compress_size
+
+
+class ZipWriter(object):
+    def __init__(self, f=None, data_descriptors=False):
+        """Writes zip archive of entries that are compressed elsewhere
+
+        Sizes and CRC-32 of deflated entries are known before they are
+        written, so entries go straight to the archive without being
+        compressed again. Zip64 records are added when limits of the
+        original format are exceeded.
+
+        CRC-32 of entries that is computed while they are copied is written
+        to the local header afterwards, or to a data descriptor following
+        the entry if the archive is streamed and can not be seeked.
+
+        :param f: binary file open for writing, seekable unless data descriptors are used.
+            Not needed if archive is read from iter_entry and iter_central_directory
+        :param bool data_descriptors: write CRC-32 computed while copying to data descriptors
+        """
+        self.f = f
+        self.data_descriptors = data_descriptors
+        self.position = 0
+        self.entries = []
+
+    def write(self, name, mtime, compress_type, size, compress_size, data, crc=None):
+        """
+        :param str name: name of the entry in the archive
+        :param float mtime: modification time of the file
+        :param int compress_type: zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED
+        :param int size: size of the original content
+        :param int compress_size: size of data
+        :param data: file-like object with data of the entry
+        :param int crc: CRC-32 of the original content. Computed while data is copied if not set
+        """
+        offset = self.position
+        for chunk in self.iter_entry(name, mtime, compress_type, size, compress_size, data, crc=crc):
+            self.f.write(chunk)
+
+        if crc is None and not self.data_descriptors:
+            self.f.seek(offset + 14)
+            self.f.write(struct.pack('<L', self.entries[-1][5]))
+            self.f.seek(self.position)
+
+    def close(self):
+        """Write central directory"""
+        for chunk in self.iter_central_directory():
+            self.f.write(chunk)
+
+    def iter_entry(self, name, mtime, compress_type, size, compress_size, data, crc=None):
+        """Get bytes of an entry, parameters are the same as of write
+
+        :raises IOError: if data is not compress_size bytes long
+        :rtype: collections.Iterable[bytes]
+        """
+        offset = self.position
+        encoded_name, flags = self._encode_name(name)
+        dos_time, dos_date = self._get_dos_time(mtime)
+        use_data_descriptor = crc is None and self.data_descriptors
+        if use_data_descriptor:
+            flags |= 0x08
+
+        extra = self._get_local_extra(size, compress_size)
+        header_size, header_compress_size = size, compress_size
+        if extra:
+            header_size = header_compress_size = 0xFFFFFFFF
+
+        yield self._advance(struct.pack(
+            '<4s2B4HL2L2H', b'PK\003\004', self._get_version(extra), 0, flags, compress_type,
+            dos_time, dos_date, crc or 0, header_compress_size, header_size, len(encoded_name), len(extra)))
+        yield self._advance(encoded_name + extra)
+
+        copied_crc = 0
+        copied_size = 0
+        for chunk in iter(lambda: data.read(COPY_BUFFER_SIZE), b''):
+            if crc is None:
+                copied_crc = zlib.crc32(chunk, copied_crc)
+            copied_size += len(chunk)
+            yield self._advance(chunk)
+
+        if copied_size != compress_size:
+            raise IOError('%s changed while it was archived' % name)
+
+        if crc is None:
+            crc = copied_crc
+        if use_data_descriptor:
+            size_format = 'Q' if extra else 'L'
+            yield self._advance(struct.pack('<4sL2' + size_format, b'PK\007\010', crc, compress_size, size))
+
+        self.entries.append((encoded_name, flags, compress_type, dos_time, dos_date, crc, size, compress_size,
+                             offset))
+
+    def iter_central_directory(self):
+        """Get bytes of central directory of entries returned by iter_entry
+
+        :rtype: collections.Iterable[bytes]
+        """
+        central_directory_offset = self.position
+
+        for encoded_name, flags, compress_type, dos_time, dos_date, crc, size, compress_size, offset \
+                in self.entries:
+            extra = self._get_central_extra(size, compress_size, offset)
+            if size > ZIP64_LIMIT:
+                size = 0xFFFFFFFF
+            if compress_size > ZIP64_LIMIT:
+                compress_size = 0xFFFFFFFF
+            if offset > ZIP64_LIMIT:
+                offset = 0xFFFFFFFF
+
+            version = self._get_version(extra)
+            yield self._advance(struct.pack(
+                '<4s4B4HL2L5H2L', b'PK\001\002', version, 3, version, 0, flags, compress_type,
+                dos_time, dos_date, crc, compress_size, size, len(encoded_name), len(extra), 0, 0, 0,
+                0o100644 << 16, offset))
+            yield self._advance(encoded_name + extra)
+
+        count = len(self.entries)
+        central_directory_size = self.position - central_directory_offset
+
+        if self._needs_zip64_end(count, central_directory_size, central_directory_offset):
+            zip64_end_offset = self.position
+            yield self._advance(struct.pack(
+                '<4sQ2H2L4Q', b'PK\006\006', 44, 45, 45, 0, 0, count, count,
+                central_directory_size, central_directory_offset))
+            yield self._advance(struct.pack('<4sLQL', b'PK\006\007', 0, zip64_end_offset, 1))
+            count = min(count, 0xFFFF)
+            central_directory_size = min(central_directory_size, 0xFFFFFFFF)
+            central_directory_offset = min(central_directory_offset, 0xFFFFFFFF)
+
+        yield self._advance(struct.pack(
+            '<4s4H2LH', b'PK\005\006', 0, 0, count, count, central_directory_size, central_directory_offset, 0))
+
+    @classmethod
+    def get_stored_archive_size(cls, entries):
+        """Get size of archive of stored entries written with data descriptors
+
+        :param list[tuple[str,int]] entries: names and sizes of entries
+        :rtype: int
+        """
+        position = 0
+        central_directory_size = 0
+        for name, size in entries:
+            encoded_name, _ = cls._encode_name(name)
+            extra = cls._get_local_extra(size, size)
+            central_directory_size += 46 + len(encoded_name) + len(cls._get_central_extra(size, size, position))
+            position += 30 + len(encoded_name) + len(extra) + size + (24 if extra else 16)
+
+        end_size = 22
+        if cls._needs_zip64_end(len(entries), central_directory_size, position):
+            end_size += 56 + 20
+        return position + central_directory_size + end_size
+
+    def _advance(self, data):
+        self.position += len(data)
+        return data
+
+    @staticmethod
+    def _get_local_extra(size, compress_size):
+        if size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT:
+            return struct.pack('<HHQQ', 1, 16, size, compress_size)
+        return b''
+
+    @staticmethod
+    def _get_central_extra(size, compress_size, offset):
+        zip64_fields = [value for value in (size, compress_size, offset) if value > ZIP64_LIMIT]
+        if zip64_fields:
+            return struct.pack('<HH%dQ' % len(zip64_fields), 1, 8 * len(zip64_fields), *zip64_fields)
+        return b''
+
+    @staticmethod
+    def _needs_zip64_end(count, central_directory_size, central_directory_offset):
+        return count >= ZIP_FILECOUNT_LIMIT or central_directory_size > ZIP64_LIMIT \
+            or central_directory_offset > ZIP64_LIMIT
+
+    @staticmethod
+    def _encode_name(name):
+        name = name.replace(os.sep, '/')
+        try:
+            return name.encode('ascii'), 0
+        except UnicodeEncodeError:
+            return name.encode('utf-8'), 0x800
+
+    @staticmethod
+    def _get_dos_time(mtime):
+        t = time.localtime(mtime)
+        if t.tm_year < 1980:
+            return 0, (1 << 5) | 1
+        return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), \
+            ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+    @staticmethod
+    def _get_version(extra):
+        return 45 if extra else 20
+
+
+class StoredZipStream(object):
+    def __init__(self, file_paths, logger=None):
+        """Readable zip archive of files stored without compression, built while it is read
+
+        Size of an archive of stored entries is known from names and sizes
+        of the files, so the archive can be sent with Content-Length without
+        writing it to disk first. CRC-32 of every entry is computed while it is
+        read and written to a data descriptor after it.
+
+        :param dict[str,str] file_paths: absolute paths by relative paths of the files in the archive
+        :param Logger logger:
+        """
+        self.logger = logger or MuteLogger()
+        self.file_paths = file_paths
+        self.sizes = {relative_path: os.path.getsize(abspath) for relative_path, abspath in file_paths.items()}
+        self.size = ZipWriter.get_stored_archive_size(list(self.sizes.items()))
+        self.position = 0
+
+        self._chunks = self._iter_chunks()
+        self._chunk = b''
+        self._chunk_offset = 0
+
+    @property
+    def len(self):
+        """Number of bytes left to read"""
+        return self.size - self.position
+
+    def read(self, size=-1):
+        data = []
+        while size != 0:
+            if self._chunk_offset == len(self._chunk):
+                self._chunk = next(self._chunks, b'')
+                self._chunk_offset = 0
+                if not self._chunk:
+                    break
+
+            end = len(self._chunk) if size < 0 else min(len(self._chunk), self._chunk_offset + size)
+            data.append(self._chunk[self._chunk_offset:end])
+            if size > 0:
+                size -= end - self._chunk_offset
+            self._chunk_offset = end
+
+        data = b''.join(data)
+        self.position += len(data)
+        return data
+
+    def _iter_chunks(self):
+        writer = ZipWriter(data_descriptors=True)
+        for relative_path, abspath in self.file_paths.items():
+            self.logger.debug('Adding %s to archive' % relative_path)
+            size = self.sizes[relative_path]
+            with open(abspath, 'rb') as data:
+                for chunk in writer.iter_entry(relative_path, os.stat(abspath).st_mtime, zipfile.ZIP_STORED,
+                                               size, size, data):
+                    yield chunk
+
+        for chunk in writer.iter_central_directory():
+            yield chunk
+
+
+class ParallelZipArchiver(ZipArchiver):
+    def __init__(self, logger=None, workers=None, compress_level=zlib.Z_DEFAULT_COMPRESSION):
+        """Zip archiver that deflates files in a pool of processes
+
+        Files are compressed in parallel while finished ones are written to
+        the archive in order. Already compressed formats are stored as they are.
+
+        :param Logger logger:
+        :param int workers: number of worker processes. Defaults to number of CPUs
+        :param int compress_level:
+        """
+        super(ParallelZipArchiver, self).__init__(logger=logger)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.compress_level = compress_level
+
+    def _archive(self, file_paths, output_file_path):
+        """Create ZIP archive and add files to it
+
+        :param dict[str,str] file_paths:
+        :param str output_file_path:
+        """
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(output_file_path)))
+        try:
+            with concurrent.futures.ProcessPoolExecutor(self.workers) as executor, \
+                    open(output_file_path, 'wb') as f:
+                writer = ZipWriter(f)
+                pending = collections.deque()
+                i = 0
+                for relative_path, abspath in file_paths.items():
+                    future = None
+                    if not relative_path.lower().endswith(STORED_EXTENSIONS):
+                        future = executor.submit(_deflate_file, abspath, tmp_dir, self.compress_level)
+                    pending.append((relative_path, abspath, future))
+
+                    # compressed files wait on disk until it is their turn so only a few are kept
+                    while len(pending) > self.workers * 2:
+                        i += 1
+                        self._write_entry(writer, *pending.popleft())
+                        self._archive_iterate_callback(i)
+
+                while pending:
+                    i += 1
+                    self._write_entry(writer, *pending.popleft())
+                    self._archive_iterate_callback(i)
+
+                writer.close()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _write_entry(self, writer, relative_path, abspath, future):
+        self.logger.debug('Adding %s to archive' % relative_path)
+        stat = os.stat(abspath)
+
+        if future is not None:
+            tmp_path, crc, size, compress_size = future.result()
+            try:
+                # incompressible content is stored instead
+                if compress_size < size:
+                    with open(tmp_path, 'rb') as data:
+                        writer.write(relative_path, stat.st_mtime, zipfile.ZIP_DEFLATED, size, compress_size, data,
+                                     crc=crc)
+                    return
+            finally:
+                os.remove(tmp_path)
+
+        with open(abspath, 'rb') as data:
+            size = os.fstat(data.fileno()).st_size
+            writer.write(relative_path, stat.st_mtime, zipfile.ZIP_STORED, size, size, data)
@@ -0,0 +1,183 @@
+import heapq
+import io
+import itertools
+import threading
+import time
+
+from requests.utils import super_len
+
+from .config import config
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+READ_SIZE = 64 * 1024
+
+
+class TokenBucket(object):
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        """Token bucket refilled with ``rate`` tokens (bytes) per second
+
+        Waiting consumers are served in order of priority and then arrival,
+        so high priority transfers do not queue behind bulk ones.
+
+        :param float rate: tokens added per second
+        :param float capacity: most tokens that can be saved up. Defaults to one second worth of tokens
+        :param callable clock: monotonic time source
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.clock = clock
+
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._waiters = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def consume(self, amount, priority=PRIORITY_NORMAL):
+        """Block until amount of tokens can be taken from the bucket
+
+        Amount bigger than the capacity is taken as soon as the bucket is
+        full; the bucket then goes into debt that following consumers wait out.
+
+        :param int amount:
+        :param int priority: lower value is served first
+        """
+        ticket = (priority, next(self._counter))
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    required = min(amount, self.capacity)
+                    if self._waiters[0] == ticket and self._tokens >= required:
+                        self._tokens -= amount
+                        return
+
+                    # waiters that are not first are woken up when the first one is served
+                    self._condition.wait(max((required - self._tokens) / self.rate, 0.001))
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+class ThrottledReader(object):
+    def __init__(self, fileobj, limiter, bucket=None, priority=PRIORITY_NORMAL):
+        """File-like object that takes tokens from the limiter for every read
+
+        Other attributes are read from the wrapped object so it can stand in
+        for multipart encoders too.
+
+        :param fileobj: object with read() method
+        :param BandwidthLimiter limiter:
+        :param TokenBucket bucket: bucket limiting this transfer only
+        :param int priority:
+        """
+        self.fileobj = fileobj
+        self.limiter = limiter
+        self.bucket = bucket
+        self.priority = priority
+        # requests reads len to send Content-Length instead of chunked transfer encoding
+        self.len = super_len(fileobj)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.fileobj, name)
+
+    def read(self, size=-1):
+        if size is None:
+            size = -1
+        if 0 <= size <= READ_SIZE:
+            return self._read(size)
+
+        # big reads are split so tokens are taken in small steps
+        parts = []
+        while size != 0:
+            part = self._read(READ_SIZE if size < 0 else min(size, READ_SIZE))
+            if not part:
+                break
+            parts.append(part)
+            if size > 0:
+                size -= len(part)
+        return b''.join(parts)
+
+    def _read(self, size):
+        data = self.fileobj.read(size)
+        if data:
+            self.limiter.consume(len(data), self.priority, self.bucket)
+        return data
+
+
+class BandwidthLimiter(object):
+    def __init__(self, rate=None, transfer_rate=None):
+        """Limits bandwidth used by all transfers together and by every single transfer
+
+        One limiter is shared by all workers of a pool so the limit applies to
+        the process, no matter how many transfers run at the same time.
+
+        :param int rate: bytes per second for all transfers together, unlimited if not set
+        :param int transfer_rate: bytes per second for a single transfer, unlimited if not set
+        """
+        self.bucket = TokenBucket(rate) if rate else None
+        self.transfer_rate = transfer_rate or None
+
+    @property
+    def enabled(self):
+        return self.bucket is not None or self.transfer_rate is not None
+
+    def consume(self, amount, priority=PRIORITY_NORMAL, transfer_bucket=None):
+        if transfer_bucket is not None:
+            transfer_bucket.consume(amount, priority)
+        if self.bucket is not None:
+            self.bucket.consume(amount, priority)
+
+    def new_transfer_bucket(self):
+        """
+        :rtype: TokenBucket|None
+        """
+        if self.transfer_rate is None:
+            return None
+        return TokenBucket(self.transfer_rate)
+
+    def wrap_reader(self, data, priority=PRIORITY_NORMAL):
+        """Throttle request body. Body is returned as is if there are no limits
+
+        :param bytes|file data:
+        :param int priority:
+        """
+        if not self.enabled:
+            return data
+
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = io.BytesIO(data)
+        return ThrottledReader(data, self, self.new_transfer_bucket(), priority)
+
+    def iter_chunks(self, chunks, priority=PRIORITY_NORMAL):
+        """Throttle downloaded chunks, for example response.iter_content()
+
+        :param collections.Iterable[bytes] chunks:
+        :param int priority:
+        :rtype: collections.Iterable[bytes]
+        """
+        if not self.enabled:
+            return chunks
+        return self._iter_chunks(chunks, priority)
+
+    def _iter_chunks(self, chunks, priority):
+        bucket = self.new_transfer_bucket()
+        for chunk in chunks:
+            self.consume(len(chunk), priority, bucket)
+            yield chunk
+
+
+default_limiter = BandwidthLimiter(rate=config.TRANSFER_RATE_LIMIT,
+                                   transfer_rate=config.TRANSFER_RATE_LIMIT_PER_TRANSFER)
@@ -0,0 +1,114 @@
+import asyncio
+import concurrent.futures
+import functools
+
+from .sdk_client import SdkClient
+from .. import logger as sdk_logger
+from ..config import config
+
+
+async def gather(*aws, limit=None, return_exceptions=False):
+    """Run awaitables concurrently, but no more than ``limit`` of them at a time
+
+    :param aws: coroutines or futures to run
+    :param int limit: maximum number of awaitables running at the same time. No limit if not set
+    :param bool return_exceptions: return exceptions as results instead of raising the first one
+    :returns: results in the order of passed awaitables
+    :rtype: list
+    """
+    if not limit:
+        return await asyncio.gather(*aws, return_exceptions=return_exceptions)
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+class AsyncClient(object):
+    # methods returning generators that read data continuously; these are passed through unchanged
+    STREAMING_METHODS = ("stream_metrics", "yield_logs")
+
+    def __init__(self, client, executor):
+        """Awaitable wrapper around a synchronous client.
+
+        Every public method of the wrapped client is exposed as a coroutine function. Calls are sent with
+        the pooled HTTP sessions from a thread of the shared executor so the event loop is never blocked.
+
+        :param BaseClient client: synchronous client to wrap
+        :param concurrent.futures.Executor executor:
+        """
+        self._client = client
+        self._executor = executor
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name.startswith("_") or name in self.STREAMING_METHODS or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(attr, *args, **kwargs))
+
+        return method
+
+
+class AsyncSdkClient(object):
+    def __init__(self, api_key, logger=sdk_logger.MuteLogger(), retry_policy=None, max_workers=None, executor=None):
+        """Asyncio counterpart of SdkClient
+
+        Usage::
+
+            async with AsyncSdkClient(api_key) as sdk:
+                notebooks = await sdk.notebooks.list()
+                details = await sdk.gather(*(sdk.notebooks.get(n.id) for n in notebooks), limit=16)
+
+        :param str api_key: API key
+        :param sdk_logger.Logger logger:
+        :param retry_policy.RetryPolicy retry_policy: policy used to retry failed requests
+        :param int max_workers: number of requests that can be in flight at the same time.
+            Defaults to HTTP connection pool size
+        :param concurrent.futures.Executor executor: executor running the requests. Created if not provided
+        """
+        self._own_executor = executor is None
+        self._executor = executor or concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or config.HTTP_POOL_MAXSIZE)
+
+        sdk_client = SdkClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.clusters = AsyncClient(sdk_client.clusters, self._executor)
+        self.datasets = AsyncClient(sdk_client.datasets, self._executor)
+        self.dataset_tags = AsyncClient(sdk_client.dataset_tags, self._executor)
+        self.dataset_versions = AsyncClient(sdk_client.dataset_versions, self._executor)
+        self.machine_types = AsyncClient(sdk_client.machine_types, self._executor)
+        self.machines = AsyncClient(sdk_client.machines, self._executor)
+        self.models = AsyncClient(sdk_client.models, self._executor)
+        self.notebooks = AsyncClient(sdk_client.notebooks, self._executor)
+        self.projects = AsyncClient(sdk_client.projects, self._executor)
+        self.secrets = AsyncClient(sdk_client.secrets, self._executor)
+        self.storage_providers = AsyncClient(sdk_client.storage_providers, self._executor)
+        self.workflows = AsyncClient(sdk_client.workflows, self._executor)
+
+    @staticmethod
+    async def gather(*aws, limit=None, return_exceptions=False):
+        """Run awaitables concurrently, but no more than ``limit`` of them at a time
+
+        :param aws: coroutines or futures to run
+        :param int limit: maximum number of awaitables running at the same time. No limit if not set
+        :param bool return_exceptions: return exceptions as results instead of raising the first one
+        :rtype: list
+        """
+        return await gather(*aws, limit=limit, return_exceptions=return_exceptions)
+
+    def close(self):
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
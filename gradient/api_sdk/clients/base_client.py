@@ -10,7 +10,9 @@ class BaseClient(object):
             self,
             api_key,
             ps_client_name=None,
-            logger=sdk_logger.MuteLogger()
+            logger=sdk_logger.MuteLogger(),
+            retry_policy=None,
+            memo=None,
     ):
         """
         Base class. All client classes inherit from it.
@@ -18,10 +20,15 @@ class BaseClient(object):
         :param str api_key: your API key
         :param str ps_client_name:
         :param sdk_logger.Logger logger:
+        :param retry_policy.RetryPolicy retry_policy: policy used to retry failed requests
+        :param request_memo.RequestMemo memo: identical GET requests of repositories built by the client
+            are sent only once while the memo is used
         """
         self.api_key = api_key
         self.ps_client_name = ps_client_name
         self.logger = logger
+        self.retry_policy = retry_policy
+        self.memo = memo
 
     def build_repository(self, repository_class, *args, **kwargs):
         """
@@ -33,6 +40,14 @@ class BaseClient(object):
             kwargs = copy.deepcopy(kwargs)
             kwargs["ps_client_name"] = self.ps_client_name
 
+        if self.retry_policy is not None and kwargs.get("retry_policy") is None:
+            kwargs = dict(kwargs)
+            kwargs["retry_policy"] = self.retry_policy
+
+        if self.memo is not None and kwargs.get("memo") is None:
+            kwargs = dict(kwargs)
+            kwargs["memo"] = self.memo
+
         repository = repository_class(*args, api_key=self.api_key, logger=self.logger, **kwargs)
         return repository
 
@@ -1,18 +1,105 @@
 import copy
+import threading
 
 import requests
+from requests.adapters import HTTPAdapter
+from six.moves.urllib.parse import urlparse
 
 from gradient import version
-from .. import utils, logger as sdk_logger
+from .. import http_cache, utils, logger as sdk_logger
 from ..config import config
+from ..retry_policy import default_retry_policy
 
 default_headers = {"X-API-Key": config.PAPERSPACE_API_KEY,
                    "ps_client_name": "gradient-cli-sdk",
                    "ps_client_version": version.version}
 
 
+class SessionPool(object):
+    def __init__(self, pool_connections=None, pool_maxsize=None, keep_alive=None):
+        """Process-wide collection of HTTP sessions, one per scheme and host.
+
+        Requests sent through the same session reuse open TCP/TLS connections
+        so consecutive calls to the same host skip the handshake.
+
+        :param int pool_connections: number of connection pools to cache per session
+        :param int pool_maxsize: maximum number of connections kept open per host
+        :param bool keep_alive: keep connections open between requests
+        """
+        self.pool_connections = pool_connections or config.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or config.HTTP_POOL_MAXSIZE
+        self.keep_alive = config.HTTP_KEEP_ALIVE if keep_alive is None else keep_alive
+
+        self._sessions = {}
+        self._response_hooks = []
+        self._lock = threading.Lock()
+
+    def get_session(self, url):
+        """Get session for the host of given url. Session is created on first use
+
+        :param str url:
+        :rtype: requests.Session
+        """
+        key = self._get_key(url)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session()
+                self._sessions[key] = session
+
+        return session
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+    def add_response_hook(self, hook):
+        """Call hook with every response received by sessions of the pool
+
+        :param callable hook: function accepting requests.Response
+        """
+        with self._lock:
+            self._response_hooks.append(hook)
+
+    def remove_response_hook(self, hook):
+        with self._lock:
+            if hook in self._response_hooks:
+                self._response_hooks.remove(hook)
+
+    def _dispatch_response(self, response, *args, **kwargs):
+        with self._lock:
+            hooks = list(self._response_hooks)
+
+        for hook in hooks:
+            hook(response)
+
+    @staticmethod
+    def _get_key(url):
+        parsed_url = urlparse(url or "")
+        return parsed_url.scheme.lower(), parsed_url.netloc.lower()
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        session.hooks["response"].append(self._dispatch_response)
+
+        return session
+
+
+session_pool = SessionPool()
+
+
 class API(object):
-    def __init__(self, api_url, headers=None, api_key=None, ps_client_name=None, logger=sdk_logger.MuteLogger()):
+    def __init__(self, api_url, headers=None, api_key=None, ps_client_name=None, logger=sdk_logger.MuteLogger(),
+                 session=None, retry_policy=None, cache=None, cache_ttl=None, memo=None):
         """
 
         :param str api_url: url you want to connect
@@ -20,8 +107,21 @@ class API(object):
         :param str api_key: your API key
         :param str ps_client_name: Client name
         :param sdk_logger.Logger logger:
+        :param requests.Session session: session used to send requests. Shared session for api_url's host is used
+            if not provided
+        :param retry_policy.RetryPolicy retry_policy: decides which failed requests are sent again.
+            Default policy is used if not provided
+        :param http_cache.HttpCache cache: cache of GET responses. GET requests are always sent if not provided
+        :param int cache_ttl: number of seconds for which cached responses are used without revalidation.
+            Cache-Control of responses is used if not provided
+        :param request_memo.RequestMemo memo: memo of GET responses, cleared after requests changing resources
         """
         self.api_url = api_url
+        self.session = session or session_pool.get_session(api_url)
+        self.retry_policy = retry_policy or default_retry_policy
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.memo = memo
         headers = headers or default_headers
         self.headers = headers.copy()
 
@@ -56,7 +156,11 @@ class API(object):
         full_path = utils.concatenate_urls(self.api_url, url)
         return full_path
 
-    def post(self, url, json=None, params=None, files=None, data=None):
+    def post(self, url, json=None, params=None, files=None, data=None, idempotent=None, read_only=False):
+        """
+        :param bool idempotent: allow retry policy to send the request again. POST requests are not retried by default
+        :param bool read_only: request does not change resources of the API, so cached and memoized responses are kept
+        """
         path = self.get_path(url)
         headers = copy.deepcopy(self.headers)
         if data:
@@ -64,16 +168,31 @@ class API(object):
 
         self.logger.debug("POST request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}\n\tfiles: {}\n\tdata: {}"
                           .format(path, headers, json, params, files, data))
-        response = requests.post(path, json=json, params=params, headers=headers, files=files, data=data)
+        response = self.retry_policy.send(
+            "POST", path,
+            lambda: self.session.post(path, json=json, params=params, headers=headers, files=files, data=data),
+            idempotent=idempotent,
+        )
+        if not read_only:
+            self._invalidate_cache(response)
         self.logger.debug("Response status code: {}".format(response.status_code))
         self.logger.debug("Response content: {}".format(response.content))
         return response
 
-    def put(self, url, json=None, params=None, data=None):
+    def put(self, url, json=None, params=None, data=None, idempotent=None):
+        """
+        :param bool idempotent: allow retry policy to send the request again. Has to be False for bodies
+            that can be read only once
+        """
         path = self.get_path(url)
         self.logger.debug("PUT request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}"
                           .format(path, self.headers, json, params))
-        response = requests.put(path, json=json, params=params, headers=self.headers, data=data)
+        response = self.retry_policy.send(
+            "PUT", path,
+            lambda: self.session.put(path, json=json, params=params, headers=self.headers, data=data),
+            idempotent=idempotent,
+        )
+        self._invalidate_cache(response)
         self.logger.debug("Response status code: {}".format(response.status_code))
         self.logger.debug("Response content: {}".format(response.content))
         return response
@@ -82,20 +201,46 @@ class API(object):
         path = self.get_path(url)
         self.logger.debug("GET request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}"
                           .format(path, self.headers, json, params))
-        response = requests.get(path, params=params, headers=self.headers, json=json)
+        if self.cache is not None and json is None:
+            response = self.cache.send(
+                path, params, self.headers,
+                lambda headers: self._send_get(path, params=params, headers=headers),
+                ttl=self.cache_ttl,
+            )
+        else:
+            response = self._send_get(path, params=params, headers=self.headers, json=json)
         self.logger.debug("Response status code: {}".format(response.status_code))
         self.logger.debug("Response content: {}".format(response.content))
         return response
 
     def delete(self, url, json=None, params=None):
         path = self.get_path(url)
-        response = requests.delete(path, params=params, headers=self.headers, json=json)
+        response = self.retry_policy.send(
+            "DELETE", path,
+            lambda: self.session.delete(path, params=params, headers=self.headers, json=json),
+        )
+        self._invalidate_cache(response)
         self.logger.debug("DELETE request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}"
                           .format(response.url, self.headers, json, params))
         self.logger.debug("Response status code: {}".format(response.status_code))
         self.logger.debug("Response content: {}".format(response.content))
         return response
 
+    def _send_get(self, path, params=None, headers=None, json=None):
+        return self.retry_policy.send(
+            "GET", path,
+            lambda: self.session.get(path, params=params, headers=headers, json=json),
+        )
+
+    def _invalidate_cache(self, response):
+        if self.memo is not None:
+            self.memo.clear()
+
+        # responses of the host may have changed, so they are fetched again by the following GET requests
+        cache = self.cache or http_cache.get_default_cache()
+        if cache is not None and response.ok:
+            cache.invalidate(self.api_url)
+
 
 class GradientResponse(object):
     def __init__(self, body, code, headers, data, request=None):
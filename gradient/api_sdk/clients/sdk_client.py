@@ -6,22 +6,23 @@ from .. import logger as sdk_logger
 
 
 class SdkClient(object):
-    def __init__(self, api_key, logger=sdk_logger.MuteLogger()):
+    def __init__(self, api_key, logger=sdk_logger.MuteLogger(), retry_policy=None):
         """
         :param str api_key: API key
         :param sdk_logger.Logger logger:
+        :param retry_policy.RetryPolicy retry_policy: policy used to retry failed requests
         """
-        self.clusters = ClustersClient(api_key=api_key, logger=logger)
-        self.datasets = DatasetsClient(api_key=api_key, logger=logger)
-        self.dataset_tags = DatasetTagsClient(api_key=api_key, logger=logger)
+        self.clusters = ClustersClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.datasets = DatasetsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.dataset_tags = DatasetTagsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
         self.dataset_versions = DatasetVersionsClient(
-            api_key=api_key, logger=logger)
-        self.machine_types = MachineTypesClient(api_key=api_key, logger=logger)
-        self.machines = MachinesClient(api_key=api_key, logger=logger)
-        self.models = ModelsClient(api_key=api_key, logger=logger)
-        self.notebooks = NotebooksClient(api_key=api_key, logger=logger)
-        self.projects = ProjectsClient(api_key=api_key, logger=logger)
-        self.secrets = SecretsClient(api_key=api_key, logger=logger)
+            api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.machine_types = MachineTypesClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.machines = MachinesClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.models = ModelsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.notebooks = NotebooksClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.projects = ProjectsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.secrets = SecretsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
         self.storage_providers = StorageProvidersClient(
-            api_key=api_key, logger=logger)
-        self.workflows = WorkflowsClient(api_key=api_key, logger=logger)
+            api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.workflows = WorkflowsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
@@ -24,6 +24,26 @@ _DEFAULT_CONFIG_FILE_NAME = os.path.expanduser("config.json")
 _DEFAULT_HELP_HEADERS_COLOR = "yellow"
 _DEFAULT_HELP_OPTIONS_COLOR = "green"
 _DEFAULT_USE_CONSOLE_COLORS = True
+_DEFAULT_HTTP_POOL_CONNECTIONS = 10
+_DEFAULT_HTTP_POOL_MAXSIZE = 32
+_DEFAULT_HTTP_KEEP_ALIVE = True
+_DEFAULT_HTTP_MAX_RETRIES = 3
+_DEFAULT_HTTP_RETRY_BACKOFF_FACTOR = 0.5
+_DEFAULT_HTTP_CACHE = False
+_DEFAULT_HTTP_CACHE_DIR_NAME = "http_cache"
+_DEFAULT_DATASETS_DOWNLOAD_PART_SIZE = 64 * 1024 * 1024
+_DEFAULT_DATASETS_ADAPTIVE_CONCURRENCY = False
+_DEFAULT_DATASETS_MIN_CONCURRENCY = 2
+_DEFAULT_DATASETS_MAX_CONCURRENCY = 32
+_DEFAULT_DATASETS_PACK_FILE_SIZE = 1024 * 1024
+_DEFAULT_DATASETS_PACK_SHARD_SIZE = 256 * 1024 * 1024
+_DEFAULT_DATASETS_LIST_CONCURRENCY = 8
+_DEFAULT_TRANSFER_RATE_LIMIT = 0
+_DEFAULT_TRANSFER_RATE_LIMIT_PER_TRANSFER = 0
+_DEFAULT_MODELS_ARCHIVE_COMPRESS = False
+_DEFAULT_MODELS_ARCHIVE_WORKERS = 0
+_DEFAULT_MODELS_DOWNLOAD_CONCURRENCY = 8
+_DEFAULT_VERSION_CHECK_INTERVAL = 24 * 60 * 60
 
 
 def get_help_colors_dict(use_colors, help_headers_color, help_options_color):
@@ -63,3 +83,44 @@ class config(object):
                                         _DEFAULT_USE_CONSOLE_COLORS) in (True, "true", "1")
     HELP_COLORS_DICT = get_help_colors_dict(
         USE_CONSOLE_COLORS, HELP_HEADERS_COLOR, HELP_OPTIONS_COLOR)
+
+    HTTP_POOL_CONNECTIONS = int(os.environ.get(
+        "PAPERSPACE_HTTP_POOL_CONNECTIONS", _DEFAULT_HTTP_POOL_CONNECTIONS))
+    HTTP_POOL_MAXSIZE = int(os.environ.get(
+        "PAPERSPACE_HTTP_POOL_MAXSIZE", _DEFAULT_HTTP_POOL_MAXSIZE))
+    HTTP_KEEP_ALIVE = os.environ.get("PAPERSPACE_HTTP_KEEP_ALIVE",
+                                     _DEFAULT_HTTP_KEEP_ALIVE) in (True, "true", "1")
+    HTTP_MAX_RETRIES = int(os.environ.get(
+        "PAPERSPACE_HTTP_MAX_RETRIES", _DEFAULT_HTTP_MAX_RETRIES))
+    HTTP_RETRY_BACKOFF_FACTOR = float(os.environ.get(
+        "PAPERSPACE_HTTP_RETRY_BACKOFF_FACTOR", _DEFAULT_HTTP_RETRY_BACKOFF_FACTOR))
+    HTTP_CACHE = os.environ.get("PAPERSPACE_HTTP_CACHE", _DEFAULT_HTTP_CACHE) in (True, "true", "1")
+    HTTP_CACHE_PATH = os.path.expanduser(os.environ.get(
+        "PAPERSPACE_HTTP_CACHE_PATH", os.path.join(CONFIG_DIR_PATH, _DEFAULT_HTTP_CACHE_DIR_NAME)))
+
+    DATASETS_DOWNLOAD_PART_SIZE = int(os.environ.get(
+        "PAPERSPACE_DATASETS_DOWNLOAD_PART_SIZE", _DEFAULT_DATASETS_DOWNLOAD_PART_SIZE))
+    DATASETS_ADAPTIVE_CONCURRENCY = os.environ.get("PAPERSPACE_DATASETS_ADAPTIVE_CONCURRENCY",
+                                                   _DEFAULT_DATASETS_ADAPTIVE_CONCURRENCY) in (True, "true", "1")
+    DATASETS_MIN_CONCURRENCY = int(os.environ.get(
+        "PAPERSPACE_DATASETS_MIN_CONCURRENCY", _DEFAULT_DATASETS_MIN_CONCURRENCY))
+    DATASETS_MAX_CONCURRENCY = int(os.environ.get(
+        "PAPERSPACE_DATASETS_MAX_CONCURRENCY", _DEFAULT_DATASETS_MAX_CONCURRENCY))
+    DATASETS_PACK_FILE_SIZE = int(os.environ.get(
+        "PAPERSPACE_DATASETS_PACK_FILE_SIZE", _DEFAULT_DATASETS_PACK_FILE_SIZE))
+    DATASETS_PACK_SHARD_SIZE = int(os.environ.get(
+        "PAPERSPACE_DATASETS_PACK_SHARD_SIZE", _DEFAULT_DATASETS_PACK_SHARD_SIZE))
+    DATASETS_LIST_CONCURRENCY = int(os.environ.get(
+        "PAPERSPACE_DATASETS_LIST_CONCURRENCY", _DEFAULT_DATASETS_LIST_CONCURRENCY))
+    TRANSFER_RATE_LIMIT = int(os.environ.get(
+        "PAPERSPACE_TRANSFER_RATE_LIMIT", _DEFAULT_TRANSFER_RATE_LIMIT))
+    TRANSFER_RATE_LIMIT_PER_TRANSFER = int(os.environ.get(
+        "PAPERSPACE_TRANSFER_RATE_LIMIT_PER_TRANSFER", _DEFAULT_TRANSFER_RATE_LIMIT_PER_TRANSFER))
+    MODELS_ARCHIVE_COMPRESS = os.environ.get("PAPERSPACE_MODELS_ARCHIVE_COMPRESS",
+                                             _DEFAULT_MODELS_ARCHIVE_COMPRESS) in (True, "true", "1")
+    MODELS_ARCHIVE_WORKERS = int(os.environ.get(
+        "PAPERSPACE_MODELS_ARCHIVE_WORKERS", _DEFAULT_MODELS_ARCHIVE_WORKERS))
+    MODELS_DOWNLOAD_CONCURRENCY = int(os.environ.get(
+        "PAPERSPACE_MODELS_DOWNLOAD_CONCURRENCY", _DEFAULT_MODELS_DOWNLOAD_CONCURRENCY))
+    VERSION_CHECK_INTERVAL = int(os.environ.get(
+        "PAPERSPACE_VERSION_CHECK_INTERVAL", _DEFAULT_VERSION_CHECK_INTERVAL))
@@ -0,0 +1,200 @@
+"""On-disk cache of GET responses
+
+Responses are stored per URL, query parameters and API key. A stored response is used without
+contacting the API while it is fresh - for max-age seconds from Cache-Control or for the TTL
+requested by the repository. A stale response with ETag or Last-Modified header is revalidated
+with a conditional request, so only a "304 Not Modified" is transferred when it did not change.
+"""
+import base64
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import requests
+import six
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from six.moves.urllib.parse import urlparse
+
+from .config import config
+
+# headers describing the connection or the client rather than the stored resource
+_NOT_STORED_HEADERS = ("set-cookie", "connection", "keep-alive", "transfer-encoding")
+
+
+class HttpCache(object):
+    def __init__(self, path):
+        """
+        :param str path: directory with cached responses
+        """
+        self.path = path
+
+    def send(self, url, params, headers, send_request, ttl=None):
+        """Get response from the cache or send GET request and store its response
+
+        :param str url:
+        :param dict params: query parameters
+        :param dict headers: headers of the request
+        :param callable send_request: function sending the request with headers passed to it
+            and returning requests.Response
+        :param int ttl: number of seconds for which response is fresh. Overrides Cache-Control of the response
+        :rtype: requests.Response
+        """
+        entry_path = self._get_entry_path(url, params, headers)
+        entry = self._read(entry_path)
+        now = time.time()
+
+        if entry is not None and now < entry["expiresAt"]:
+            return self._get_response(entry)
+
+        conditional_headers = self._get_conditional_headers(entry)
+        if not conditional_headers:
+            response = send_request(headers)
+            self._store(entry_path, response, ttl, now)
+            return response
+
+        request_headers = dict(headers)
+        request_headers.update(conditional_headers)
+        response = send_request(request_headers)
+        if response.status_code != 304:
+            self._store(entry_path, response, ttl, now)
+            return response
+
+        entry["headers"].update(self._get_stored_headers(response.headers))
+        entry["expiresAt"] = now + self._get_lifetime(entry["headers"], ttl)
+        self._write(entry_path, entry)
+        return self._get_response(entry)
+
+    def invalidate(self, url):
+        """Remove all responses stored for the host of the url
+
+        :param str url:
+        """
+        shutil.rmtree(self._get_host_path(url), ignore_errors=True)
+
+    def _store(self, entry_path, response, ttl, now):
+        cache_control = self._get_cache_control(response.headers)
+        if response.status_code != 200 or (ttl is None and "no-store" in cache_control):
+            self._remove(entry_path)
+            return
+
+        headers = self._get_stored_headers(response.headers)
+        lifetime = self._get_lifetime(headers, ttl)
+        if lifetime <= 0 and not self._get_conditional_headers({"headers": headers}):
+            self._remove(entry_path)
+            return
+
+        entry = {
+            "url": response.url,
+            "status": response.status_code,
+            "headers": headers,
+            "content": base64.b64encode(response.content or b"").decode("ascii"),
+            "expiresAt": now + lifetime,
+        }
+        self._write(entry_path, entry)
+
+    def _get_lifetime(self, headers, ttl):
+        if ttl is not None:
+            return ttl
+
+        cache_control = self._get_cache_control(headers)
+        if "no-cache" in cache_control:
+            return 0
+        try:
+            return int(cache_control.get("max-age", 0))
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def _get_cache_control(headers):
+        directives = {}
+        for directive in CaseInsensitiveDict(headers).get("Cache-Control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            if name:
+                directives[name.lower()] = value.strip('"')
+        return directives
+
+    @staticmethod
+    def _get_conditional_headers(entry):
+        if entry is None:
+            return {}
+
+        headers = CaseInsensitiveDict(entry["headers"])
+        conditional_headers = {}
+        if headers.get("ETag"):
+            conditional_headers["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            conditional_headers["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional_headers
+
+    @staticmethod
+    def _get_stored_headers(headers):
+        return {name: value for name, value in headers.items() if name.lower() not in _NOT_STORED_HEADERS}
+
+    @staticmethod
+    def _get_response(entry):
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = entry["url"]
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(entry["content"])
+        return response
+
+    def _get_host_path(self, url):
+        parsed_url = urlparse(url or "")
+        host = "{}://{}".format(parsed_url.scheme.lower(), parsed_url.netloc.lower())
+        return os.path.join(self.path, hashlib.sha256(host.encode("utf-8")).hexdigest()[:16])
+
+    def _get_entry_path(self, url, params, headers):
+        params = sorted((six.text_type(k), six.text_type(v)) for k, v in (params or {}).items())
+        # API key is a part of the key, so users sharing the cache directory never see each other's responses
+        key = json.dumps([url, params, headers.get("X-API-Key")])
+        file_name = hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+        return os.path.join(self._get_host_path(url), file_name)
+
+    @staticmethod
+    def _read(entry_path):
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or not all(k in entry for k in ("status", "headers", "content", "expiresAt")):
+            return None
+        return entry
+
+    @staticmethod
+    def _write(entry_path, entry):
+        tmp_path = "{}.{}.tmp".format(entry_path, os.getpid())
+        try:
+            dir_path = os.path.dirname(entry_path)
+            if not os.path.isdir(dir_path):
+                os.makedirs(dir_path, 0o700)
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+        except (IOError, OSError):
+            pass
+
+    @staticmethod
+    def _remove(entry_path):
+        try:
+            os.remove(entry_path)
+        except (IOError, OSError):
+            pass
+
+
+def get_default_cache():
+    """Get cache configured with PAPERSPACE_HTTP_CACHE* environment variables
+
+    :returns: cache or None if it is disabled
+    :rtype: HttpCache|None
+    """
+    if not config.HTTP_CACHE:
+        return None
+
+    return HttpCache(config.HTTP_CACHE_PATH)
@@ -0,0 +1,58 @@
+"""Deferred star-imports for package ``__init__`` modules
+
+Importing any submodule runs ``__init__`` of every parent package first, so a package
+re-exporting its submodules with ``from .x import *`` makes even a tiny import (like
+``gradient.api_sdk.config``) load the whole SDK. Packages registered with ``lazy_star_import``
+import the re-exported modules the first time one of their names is looked up instead.
+"""
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class LazyStarImportModule(types.ModuleType):
+    def __getattr__(self, name):
+        # only called for names that are not (yet) in module's namespace
+        # "from package import submodule" looks the name up before importing the submodule
+        if importlib.util.find_spec("{}.{}".format(self.__name__, name)) is not None:
+            return importlib.import_module("{}.{}".format(self.__name__, name))
+
+        self._load_star_imports()
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError("module {!r} has no attribute {!r}".format(self.__name__, name))
+
+    def __dir__(self):
+        self._load_star_imports()
+        return sorted(self.__dict__)
+
+    def _load_star_imports(self):
+        module_names, names_from = self.__dict__.pop("_lazy_star_modules", (None, None))
+        if module_names is None:
+            return
+
+        for name, module_name in names_from.items():
+            module = importlib.import_module(module_name, self.__name__)
+            setattr(self, name, getattr(module, name))
+
+        for module_name in module_names:
+            module = importlib.import_module(module_name, self.__name__)
+            names = getattr(module, "__all__", None)
+            if names is None:
+                names = [name for name in vars(module) if not name.startswith("_")]
+            for name in names:
+                setattr(self, name, getattr(module, name))
+
+
+def lazy_star_import(package_name, module_names, names_from=None):
+    """Defer ``from <module_name> import *`` of all modules until a name is used
+
+    :param str package_name: name of the package to register, usually ``__name__``
+    :param list[str] module_names: absolute or relative (to the package) names of modules to re-export
+    :param dict[str,str] names_from: single names to re-export mapped to modules they are imported from
+    """
+    package = sys.modules[package_name]
+    package.__class__ = LazyStarImportModule
+    package._lazy_star_modules = (module_names, names_from or {})
@@ -34,6 +34,7 @@ class ValidateClusterRepository(GetResource):
 
 class ListClusters(ListResources):
     SERIALIZER_CLS = ClusterSchema
+    HTTP_CACHE_TTL = 5 * 60
 
     def get_request_url(self, **kwargs):
         return "/clusters/getClusters"
@@ -7,7 +7,7 @@ import dateutil
 import six
 import websocket
 
-from .. import serializers, sdk_exceptions
+from .. import http_cache, serializers, sdk_exceptions
 from ..clients import http_client
 from ..config import config
 from ..sdk_exceptions import ResourceFetchingError, ResourceCreatingDataError, ResourceCreatingError, GradientSdkError
@@ -17,11 +17,19 @@ from ..utils import MessageExtractor, concatenate_urls
 @six.add_metaclass(abc.ABCMeta)
 class BaseRepository(object):
     VALIDATION_ERROR_MESSAGE = "Failed to fetch data"
-
-    def __init__(self, api_key, logger, ps_client_name=None):
+    # seconds for which responses stored in HTTP cache (if it is enabled) are used without asking the API.
+    # Cache-Control of responses is used if None
+    HTTP_CACHE_TTL = None
+    # identical GET requests of the repository are sent only once while the same memo is used.
+    # Enabled only for lookups of resources which are not polled for changes
+    MEMOIZE = False
+
+    def __init__(self, api_key, logger, ps_client_name=None, retry_policy=None, memo=None):
         self.api_key = api_key
         self.logger = logger
         self.ps_client_name = ps_client_name
+        self.retry_policy = retry_policy
+        self.memo = memo
 
     @abc.abstractmethod
     def get_request_url(self, **kwargs):
@@ -49,6 +57,10 @@ class BaseRepository(object):
             api_key=self.api_key,
             logger=self.logger,
             ps_client_name=self.ps_client_name,
+            retry_policy=self.retry_policy,
+            cache=http_cache.get_default_cache(),
+            cache_ttl=self.HTTP_CACHE_TTL,
+            memo=self.memo,
         )
         return client
 
@@ -57,7 +69,13 @@ class BaseRepository(object):
         params = self._get_request_params(kwargs)
         url = self.get_request_url(**kwargs)
         client = self._get_client(**kwargs)
-        response = self._send_request(client, url, json=json_, params=params)
+        if self.memo is not None and self.MEMOIZE:
+            response = self.memo.get(
+                client.get_path(url), params, json_, client.headers,
+                lambda: self._send_request(client, url, json=json_, params=params),
+            )
+        else:
+            response = self._send_request(client, url, json=json_, params=params)
         gradient_response = http_client.GradientResponse.interpret_response(response)
 
         return gradient_response
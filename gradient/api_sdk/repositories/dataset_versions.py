@@ -68,4 +68,5 @@ class GenerateDatasetVersionPreSignedS3Urls(DatasetVersionMixin, BaseRepository)
         return {'calls': kwargs['calls']}
 
     def _send_request(self, client, url, json=None, params=None):
-        return client.post(url, json=json, params=params)
+        # signing urls has no side effects so the request can be safely retried and cached responses are kept
+        return client.post(url, json=json, params=params, idempotent=True, read_only=True)
@@ -33,7 +33,8 @@ class CreateDataset(DatasetMixin, CreateResource):
 
 
 class GetDataset(DatasetMixin, GetResource):
-    pass
+    HTTP_CACHE_TTL = 5 * 60
+    MEMOIZE = True
 
 
 class UpdateDataset(DatasetMixin, AlterResource):
@@ -50,6 +51,7 @@ class DeleteDataset(DatasetMixin, DeleteResource):
 
 class GetDatasetRef(DatasetMixin, GetResource):
     SERIALIZER_CLS = serializers.DatasetRefSchema
+    MEMOIZE = True
 
     @staticmethod
     def get_request_url(**kwargs):
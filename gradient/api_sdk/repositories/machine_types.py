@@ -6,6 +6,7 @@ from ..repositories.common import ListResources
 
 class ListMachineTypes(ListResources):
     SERIALIZER_CLS = serializers.VmTypeSchema
+    HTTP_CACHE_TTL = 60 * 60
 
     def get_request_url(self, **kwargs):
         return "vmTypes/getVmTypesByClusters"
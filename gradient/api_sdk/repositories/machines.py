@@ -54,12 +54,7 @@ class DeleteMachine(MachinesApiUrlMixin, DeleteResource):
 
 class ListMachines(MachinesApiUrlMixin, ListResources):
     def _parse_objects(self, data, **kwargs):
-        instances = []
-
-        for machine_dict in data:
-            machine = serializers.MachineSchema().get_instance(machine_dict)
-            instances.append(machine)
-
+        instances = serializers.MachineSchema().get_instance(data, many=True)
         return instances
 
     def get_request_url(self, **kwargs):
@@ -170,10 +165,11 @@ class GetMachineUtilization(MachinesApiUrlMixin, GetResource):
 
 
 class WaitForState(object):
-    def __init__(self, api_key, logger, ps_client_name=None):
+    def __init__(self, api_key, logger, ps_client_name=None, retry_policy=None, memo=None):
         self.api_key = api_key
         self.logger = logger
-        self.get_machine_repository = GetMachine(api_key=api_key, logger=logger, ps_client_name=ps_client_name)
+        self.get_machine_repository = GetMachine(api_key=api_key, logger=logger, ps_client_name=ps_client_name,
+                                                 retry_policy=retry_policy)
 
     def wait_for_state(self, machine_id, state, interval=5):
 
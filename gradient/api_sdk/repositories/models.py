@@ -105,7 +105,8 @@ class UploadModel(GetBaseModelsApiUrlMixin, CreateResource):
 
     def _delete_model(self, model_id):
         repository = DeleteModel(
-            self.api_key, logger=self.logger, ps_client_name=self.ps_client_name)
+            self.api_key, logger=self.logger, ps_client_name=self.ps_client_name, retry_policy=self.retry_policy,
+            memo=self.memo)
         repository.delete(model_id)
 
 
@@ -77,6 +77,8 @@ class DeleteNotebook(GetNotebookApiUrlMixin, DeleteResource):
 
 
 class GetNotebook(GetNotebookApiUrlMixin, GetResource):
+    MEMOIZE = True
+
     def get_request_url(self, **kwargs):
         url = "notebooks/getNotebook"
         return url
@@ -163,7 +165,8 @@ class GetNotebookMetrics(GetMetrics):
     OBJECT_TYPE = "notebook"
 
     def _get_instance_by_id(self, instance_id, **kwargs):
-        repository = GetNotebook(self.api_key, logger=self.logger, ps_client_name=self.ps_client_name)
+        repository = GetNotebook(self.api_key, logger=self.logger, ps_client_name=self.ps_client_name,
+                                 retry_policy=self.retry_policy, memo=self.memo)
         instance = repository.get(id=instance_id)
         return instance
 
@@ -178,7 +181,8 @@ class ListNotebookMetrics(ListMetrics):
     OBJECT_TYPE = "notebook"
 
     def _get_instance_by_id(self, instance_id, **kwargs):
-        repository = GetNotebook(self.api_key, logger=self.logger, ps_client_name=self.ps_client_name)
+        repository = GetNotebook(self.api_key, logger=self.logger, ps_client_name=self.ps_client_name,
+                                 retry_policy=self.retry_policy, memo=self.memo)
         instance = repository.get(id=instance_id)
         return instance
 
@@ -193,7 +197,8 @@ class StreamNotebookMetrics(StreamMetrics):
     OBJECT_TYPE = "notebook"
 
     def _get_metrics_api_url(self, instance_id, protocol="https"):
-        repository = GetNotebook(api_key=self.api_key, logger=self.logger, ps_client_name=self.ps_client_name)
+        repository = GetNotebook(api_key=self.api_key, logger=self.logger, ps_client_name=self.ps_client_name,
+                                 retry_policy=self.retry_policy, memo=self.memo)
         deployment = repository.get(id=instance_id)
 
         metrics_api_url = super(StreamNotebookMetrics, self)._get_metrics_api_url(deployment, protocol="wss")
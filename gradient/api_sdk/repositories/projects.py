@@ -18,6 +18,7 @@ class CreateProject(GetBaseProjectsApiUrlMixin, CreateResource):
 
 class ListProjects(GetBaseProjectsApiUrlMixin, ListResources):
     SERIALIZER_CLS = serializers.Project
+    HTTP_CACHE_TTL = 60
 
     def get_request_url(self, **kwargs):
         return "/projects/"
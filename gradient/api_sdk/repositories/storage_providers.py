@@ -18,6 +18,8 @@ class StorageProviderMixin(object):
 
 
 class ListStorageProviders(StorageProviderMixin, ListResources):
+    HTTP_CACHE_TTL = 5 * 60
+
     def _get_request_params(self, kwargs):
         limit = kwargs.get("limit") or 20
         offset = kwargs.get("offset") or 0
@@ -0,0 +1,72 @@
+import json
+import threading
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class RequestMemo(object):
+    def __init__(self):
+        """Remembers responses of GET requests for the lifetime of the memo, e.g. a single CLI command
+
+        Identical requests sent while the first one is in flight (from any thread) wait for its
+        response instead of being sent again. Failed requests are not remembered.
+        """
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, params, json_data, headers, send_request):
+        """Get remembered response or send the request
+
+        :param str url:
+        :param dict params: query parameters
+        :param dict json_data: body of the request
+        :param dict headers: headers of the request
+        :param callable send_request: function sending the request and returning requests.Response
+        :rtype: requests.Response
+        """
+        key = self._get_key(url, params, json_data, headers)
+        with self._lock:
+            call = self._calls.get(key)
+            is_owner = call is None
+            if is_owner:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_owner:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.response
+
+        try:
+            call.response = send_request()
+        except Exception as e:
+            call.error = e
+            self._forget(key, call)
+            raise
+        finally:
+            call.done.set()
+
+        if not call.response.ok:
+            self._forget(key, call)
+        return call.response
+
+    def clear(self):
+        """Forget all responses, e.g. after a request changing resources"""
+        with self._lock:
+            self._calls.clear()
+
+    def _forget(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    @staticmethod
+    def _get_key(url, params, json_data, headers):
+        params = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return url, json.dumps(params), json.dumps(json_data, sort_keys=True, default=str), headers.get("X-API-Key")
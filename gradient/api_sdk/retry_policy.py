@@ -0,0 +1,156 @@
+import collections
+import email.utils
+import random
+import threading
+import time
+
+import requests
+from six.moves.urllib.parse import urlparse
+
+from .config import config
+from .logger import MuteLogger
+
+
+class RetryPolicy(object):
+    RETRY_STATUS_CODES = frozenset((429, 502, 503, 504))
+    IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+    RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+    def __init__(self, max_retries=None, backoff_factor=None, max_backoff=30, retry_non_idempotent=False,
+                 status_codes=None, logger=None, sleep=time.sleep):
+        """Decides if and when a failed request should be sent again.
+
+        Waiting time grows exponentially with every attempt and is randomized ("full jitter") so clients that failed
+        at the same time do not retry at the same time. ``Retry-After`` header sent by the server takes precedence.
+        Only idempotent methods are retried unless ``retry_non_idempotent`` is set or caller marks the request
+        as idempotent.
+
+        :param int max_retries: how many times a request can be repeated
+        :param float backoff_factor: base of the exponential backoff in seconds
+        :param float max_backoff: longest time to wait between attempts in seconds
+        :param bool retry_non_idempotent: retry POST and PATCH requests too
+        :param set[int] status_codes: response status codes that should be retried
+        :param sdk_logger.Logger logger:
+        :param callable sleep: function used to wait between attempts
+        """
+        self.max_retries = config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = config.HTTP_RETRY_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_non_idempotent = retry_non_idempotent
+        self.status_codes = frozenset(status_codes) if status_codes is not None else self.RETRY_STATUS_CODES
+        self.logger = logger or MuteLogger()
+        self.sleep = sleep
+
+        self._retry_counts = collections.Counter()
+        self._retry_counts_lock = threading.Lock()
+
+    def send(self, method, url, send_request, idempotent=None):
+        """Call send_request until it returns a response that should not be retried or retries run out
+
+        :param str method: HTTP method name
+        :param str url: full url of the request, used to identify the endpoint in retry statistics
+        :param callable send_request: function that sends the request and returns requests.Response
+        :param bool|None idempotent: overrides idempotency derived from the method
+        :rtype: requests.Response
+        """
+        method = method.upper()
+        can_retry = self.is_retryable_method(method, idempotent)
+        attempt = 0
+        while True:
+            try:
+                response = send_request()
+            except self.RETRY_EXCEPTIONS as e:
+                if not can_retry or attempt >= self.max_retries:
+                    raise
+
+                self._wait(method, url, attempt, reason=e)
+                attempt += 1
+                continue
+
+            if not can_retry or attempt >= self.max_retries or response.status_code not in self.status_codes:
+                return response
+
+            self._wait(method, url, attempt, reason=response.status_code, response=response)
+            attempt += 1
+
+    def is_retryable_method(self, method, idempotent=None):
+        if idempotent is not None:
+            return idempotent
+
+        return self.retry_non_idempotent or method.upper() in self.IDEMPOTENT_METHODS
+
+    def get_backoff_time(self, attempt, response=None):
+        """
+        :param int attempt: number of the failed attempt counting from 0
+        :param requests.Response response:
+        :rtype: float
+        """
+        retry_after = self.get_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, backoff)
+
+    @staticmethod
+    def get_retry_after(response):
+        """Read waiting time from response's Retry-After header
+
+        :param requests.Response response:
+        :returns: seconds to wait or None if header was not sent or is malformed
+        :rtype: float|None
+        """
+        headers = getattr(response, "headers", None) or {}
+        value = headers.get("Retry-After")
+        if not value:
+            return None
+
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+
+        retry_date = email.utils.parsedate_tz(value)
+        if retry_date is None:
+            return None
+
+        seconds = email.utils.mktime_tz(retry_date) - time.time()
+        return max(seconds, 0)
+
+    @property
+    def retry_counts(self):
+        """Number of retries per endpoint, e.g.: {"GET https://api.paperspace.io/datasets": 2}
+
+        :rtype: dict[str,int]
+        """
+        with self._retry_counts_lock:
+            return dict(self._retry_counts)
+
+    def reset_retry_counts(self):
+        with self._retry_counts_lock:
+            self._retry_counts.clear()
+
+    def _wait(self, method, url, attempt, reason, response=None):
+        endpoint = self._get_endpoint(method, url)
+        with self._retry_counts_lock:
+            self._retry_counts[endpoint] += 1
+
+        backoff = self.get_backoff_time(attempt, response)
+        self.logger.debug("{} failed ({}). Retrying in {:.2f}s (retry {} of {})".format(
+            endpoint, reason, backoff, attempt + 1, self.max_retries))
+        self.sleep(backoff)
+
+    @staticmethod
+    def _get_endpoint(method, url):
+        parsed_url = urlparse(url)
+        endpoint = "{}://{}{}".format(parsed_url.scheme, parsed_url.netloc, parsed_url.path)
+        return "{} {}".format(method, endpoint)
+
+
+class NoRetryPolicy(RetryPolicy):
+    def __init__(self, **kwargs):
+        kwargs["max_retries"] = 0
+        super(NoRetryPolicy, self).__init__(**kwargs)
+
+
+default_retry_policy = RetryPolicy()
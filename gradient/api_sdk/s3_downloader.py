@@ -1,4 +1,5 @@
 import abc
+import concurrent.futures
 import os
 import time
 
@@ -8,37 +9,85 @@ import six
 from . import sdk_exceptions
 from .clients import ModelsClient
 from .clients.base_client import BaseClient
+from .config import config
 from .logger import MuteLogger
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_TMP_SUFFIX = ".download"
+
 
 class S3FilesDownloader(object):
-    def __init__(self, logger=MuteLogger()):
+    def __init__(self, logger=MuteLogger(), concurrency=None):
+        """
+        :param Logger logger:
+        :param int concurrency: number of files downloaded at the same time
+        """
         self.logger = logger
         self.file_download_retries = 8
+        self.concurrency = concurrency or config.MODELS_DOWNLOAD_CONCURRENCY
 
     def download_list(self, sources, destination_dir):
         """
 
-        :param tuple[tuple[str,str]] sources: tuple/list of (file_path, file_url) pairs
+        :param tuple[tuple] sources: tuple/list of (file_path, file_url) pairs
+            or (file_path, file_url, size) triples if file sizes are known
         :param str destination_dir:
         """
-        for source in sources:
-            self.download_file(source, destination_dir,
-                               max_retries=self.file_download_retries)
+        self._create_directory(destination_dir)
+
+        with concurrent.futures.ThreadPoolExecutor(self.concurrency) as executor:
+            futures = [executor.submit(self.download_file, source, destination_dir,
+                                       max_retries=self.file_download_retries)
+                       for source in sources]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
 
     def download_file(self, source, destination_dir, max_retries=0):
+        """Download a file to a temporary file and move it to its path once it is complete
+
+        Files that already exist with the expected size are skipped. The
+        temporary file of an interrupted download is kept so the download
+        is resumed with a Range request.
+
+        :param tuple source: (file_path, file_url) pair or (file_path, file_url, size) triple
+        :param str destination_dir:
+        :param int max_retries:
+        """
         self._create_directory(destination_dir)
 
-        file_path, file_url = source
+        file_path, file_url = source[:2]
+        size = source[2] if len(source) > 2 else None
+        destination_path = os.path.join(destination_dir, file_path)
+
+        if size is not None and os.path.isfile(destination_path) and os.path.getsize(destination_path) == size:
+            self.logger.debug("Skipping {}: file already exists".format(file_path))
+            return
+
+        self._create_subdirectories(file_path, destination_dir)
+        tmp_path = destination_path + DOWNLOAD_TMP_SUFFIX
+
+        if size is not None and os.path.isfile(tmp_path) and os.path.getsize(tmp_path) >= size:
+            if os.path.getsize(tmp_path) == size:
+                # previous run stopped after the last write, before the file was moved to its path
+                self.logger.debug("Skipping {}: file was downloaded already".format(file_path))
+                os.replace(tmp_path, destination_path)
+                return
+            os.remove(tmp_path)
+
         self.logger.log("Downloading: {}".format(file_path))
 
         # Trying to download several times in case of connection error with S3.
         # The error seems to occur randomly but adding short sleep between retries helps a bit
         for _ in range(max_retries + 1):
             try:
-                response = requests.get(file_url)
+                self._download(file_url, tmp_path, file_path)
                 break
-            except requests.exceptions.ConnectionError:
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError):
                 self.logger.debug(
                     "Downloading {} resulted in error. Trying again...".format(file_path))
                 time.sleep(0.1)
@@ -46,29 +95,64 @@ class S3FilesDownloader(object):
             raise sdk_exceptions.ResourceFetchingError(
                 "Downloading {} resulted in error".format(file_path))
 
-        self._create_subdirectories(file_path, destination_dir)
-        self._save_file(response, file_path, destination_dir)
+        downloaded_size = os.path.getsize(tmp_path)
+        if size is not None and downloaded_size != size:
+            os.remove(tmp_path)
+            raise sdk_exceptions.ResourceFetchingError(
+                "Downloading {} resulted in error: expected {} bytes, received {}".format(
+                    file_path, size, downloaded_size))
+
+        os.replace(tmp_path, destination_path)
+
+    def _download(self, file_url, tmp_path, file_path):
+        """Stream file to tmp_path, resuming from the end of a partially downloaded file
+
+        :param str file_url:
+        :param str tmp_path:
+        :param str file_path: path of the file in the model, used in messages as file_url is signed
+        """
+        offset = os.path.getsize(tmp_path) if os.path.isfile(tmp_path) else 0
+        headers = {"Range": "bytes={}-".format(offset)} if offset else {}
+
+        with requests.get(file_url, headers=headers, stream=True) as response:
+            if response.status_code == 416:
+                content_range = (response.headers or {}).get("Content-Range", "")
+                if content_range == "bytes */{}".format(offset):
+                    # partial file is the whole object already
+                    return
+                # partial file is not a prefix of the object anymore
+                os.remove(tmp_path)
+                return self._download(file_url, tmp_path, file_path)
+            if not response.ok:
+                raise sdk_exceptions.ResourceFetchingError(
+                    "Downloading {} resulted in error: {}".format(file_path, response.status_code))
+            if response.status_code != 206:
+                # whole file was sent
+                offset = 0
+
+            written = 0
+            with open(tmp_path, "r+b" if offset else "wb") as h:
+                h.seek(offset)
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    h.write(chunk)
+                    written += len(chunk)
+
+            content_length = (response.headers or {}).get("Content-Length")
+            if content_length is not None and int(content_length) != written:
+                raise requests.exceptions.ChunkedEncodingError(
+                    "Received {} of {} bytes".format(written, content_length))
 
     def _create_directory(self, destination_dir):
-        if os.path.exists(destination_dir) and os.path.isdir(destination_dir):
+        if os.path.isdir(destination_dir):
             return
 
-        os.makedirs(destination_dir)
+        os.makedirs(destination_dir, exist_ok=True)
 
     def _create_subdirectories(self, file_path, destination_dir):
         file_dirname = os.path.dirname(file_path)
         file_dir_path = os.path.join(destination_dir, file_dirname)
         self._create_directory(file_dir_path)
 
-    def _save_file(self, response, file_path, destination_dir):
-        destination_path = os.path.join(destination_dir, file_path)
-        try:
-            with open(destination_path, "wb") as h:
-                h.write(response.content)
-        except TypeError:  # in py3 TypeError is raised when trying to write str in bytes mode so trying in txt mode
-            with open(destination_path, "w") as h:
-                h.write(response.content)
-
 
 @six.add_metaclass(abc.ABCMeta)
 class ResourceDownloader(object):
@@ -90,8 +174,8 @@ class ResourceDownloader(object):
     def _get_files_list(self, job_id):
         """
         :param str job_id:
-        :returns: Tuple of (file path, url) pairs
-        :rtype: tuple[tuple[str,str]]
+        :returns: Tuple of (file path, url) pairs or (file path, url, size) triples
+        :rtype: tuple[tuple]
         """
         pass
 
@@ -111,6 +195,6 @@ class ModelFilesDownloader(ResourceDownloader):
     CLIENT_CLASS = ModelsClient
 
     def _get_files_list(self, model_id):
-        files = self.client.get_model_files(model_id=model_id, links=True)
-        files = tuple((f.file, f.url) for f in files)
+        files = self.client.get_model_files(model_id=model_id, links=True, size=True)
+        files = tuple((f.file, f.url, f.size) for f in files)
         return files
@@ -1,10 +1,11 @@
 import collections
 import mimetypes
 import os
+import shutil
 import tempfile
 
-from . import sdk_exceptions
-from .archivers import ZipArchiver
+from . import bandwidth, sdk_exceptions
+from .archivers import ParallelZipArchiver, ZipArchiver
 from .clients import http_client
 from .config import config
 from .logger import MuteLogger
@@ -14,14 +15,16 @@ from .utils import MultipartEncoder, MultipartEncoderWithProgressbar
 class S3FileUploader(object):
     DEFAULT_MULTIPART_ENCODER_CLS = MultipartEncoder
 
-    def __init__(self, multipart_encoder_cls=None, logger=None, ps_client_name=None):
+    def __init__(self, multipart_encoder_cls=None, logger=None, ps_client_name=None, limiter=None):
         """
         :param type(MultipartEncoder) multipart_encoder_cls:
         :param Logger logger:
+        :param bandwidth.BandwidthLimiter limiter: limits upload bandwidth. Limits from config are used if not provided
         """
         self.multipart_encoder_cls = multipart_encoder_cls or self.DEFAULT_MULTIPART_ENCODER_CLS
         self.logger = logger or MuteLogger()
         self.ps_client_name = ps_client_name
+        self.limiter = limiter or bandwidth.default_limiter
 
     def upload(self, file_path, url, s3_fields=None):
         """Upload a file to S3
@@ -31,18 +34,29 @@ class S3FileUploader(object):
         :param str bucket_name:
         :param dict[str,str] s3_fields:
 
+        """
+        with open(file_path, "rb") as file_handle:
+            self.upload_file_object(file_path, file_handle, url, s3_fields)
+
+    def upload_file_object(self, file_name, file_object, url, s3_fields=None):
+        """Upload content of a file-like object to S3
+
+        :param str file_name: name of the file, used to guess content type
+        :param file_object: readable file-like object. Its size has to be known from its file
+            descriptor or its len attribute
+        :param str url:
+        :param dict[str,str] s3_fields:
         """
         # the S3 service requires the file field be the last one in sent object so dict needs to be ordered
         s3_fields = s3_fields or {}
         ordered_s3_fields = collections.OrderedDict(s3_fields)
-        with open(file_path, "rb") as file_handle:
-            ordered_s3_fields["file"] = (file_path, file_handle)
-            multipart_encoder_monitor = self._get_multipart_encoder_monitor(
-                ordered_s3_fields)
-            self.logger.debug(
-                "Uploading file: {} to url: {}...".format(file_path, url))
-            self._upload(url, data=multipart_encoder_monitor)
-            self.logger.debug("Uploading completed")
+        ordered_s3_fields["file"] = (file_name, file_object)
+        multipart_encoder_monitor = self._get_multipart_encoder_monitor(
+            ordered_s3_fields)
+        self.logger.debug(
+            "Uploading file: {} to url: {}...".format(file_name, url))
+        self._upload(url, data=self.limiter.wrap_reader(multipart_encoder_monitor))
+        self.logger.debug("Uploading completed")
 
     def _upload(self, url, data):
         """Send data to S3 and raise exception if it was not a success
@@ -94,7 +108,8 @@ class S3PutFileUploader(S3FileUploader):
         client.headers = {
             "Content-Type": mimetypes.guess_type(file_path)[0] or ""}
 
-        response = client.put("", data=data)
+        # the body is streamed from the file once, so a retry would send it empty
+        response = client.put("", data=data, idempotent=False)
         if not response.ok:
             raise sdk_exceptions.S3UploadFailedError(response)
 
@@ -171,23 +186,43 @@ class S3ModelFileUploader(object):
 
 
 class S3ModelUploader(S3ModelFileUploader):
+    ARCHIVE_FILE_NAME = 'model.zip'
+
     def upload(self, file_path, model_id, cluster_id=None):
-        if os.path.isdir(file_path):
-            file_path = self._zip_model_directory(file_path)
+        if not os.path.isdir(file_path):
+            return super(S3ModelUploader, self).upload(file_path, model_id, cluster_id=cluster_id)
 
-        return super(S3ModelUploader, self).upload(file_path, model_id, cluster_id=cluster_id)
+        if not config.MODELS_ARCHIVE_COMPRESS:
+            return self._upload_model_directory_stream(file_path, model_id, cluster_id=cluster_id)
 
-    def _zip_model_directory(self, dir_path):
-        archiver = self._get_archiver()
         archive_path = self._get_archive_path()
+        try:
+            self._zip_model_directory(file_path, archive_path)
+            return super(S3ModelUploader, self).upload(archive_path, model_id, cluster_id=cluster_id)
+        finally:
+            shutil.rmtree(os.path.dirname(archive_path), ignore_errors=True)
+
+    def _upload_model_directory_stream(self, dir_path, model_id, cluster_id=None):
+        # size of an archive of stored entries is known up front, so it is built while it is uploaded
+        # instead of being written to a temporary file first
+        stream = ZipArchiver(logger=self.logger).get_stream(dir_path)
+        url = self._get_upload_data(self.ARCHIVE_FILE_NAME, model_id, cluster_id=cluster_id)
+        self.s3uploader.upload_file_object(self.ARCHIVE_FILE_NAME, stream, url)
+        return url
+
+    def _zip_model_directory(self, dir_path, archive_path):
+        archiver = self._get_archiver()
         archiver.archive(dir_path, archive_path)
-        return archive_path
 
     def _get_archiver(self):
-        return ZipArchiver()
+        # storing entries costs no CPU, deflating in worker processes only pays off for
+        # compressible models uploaded over slow links so it has to be turned on
+        if not config.MODELS_ARCHIVE_COMPRESS:
+            return ZipArchiver()
+        return ParallelZipArchiver(workers=config.MODELS_ARCHIVE_WORKERS or None)
 
     def _get_archive_path(self):
-        archive_file_name = 'model.zip'
+        # every upload gets its own directory so concurrent uploads do not overwrite each other's archive
         archive_file_path = os.path.join(
-            tempfile.gettempdir(), archive_file_name)
+            tempfile.mkdtemp(), self.ARCHIVE_FILE_NAME)
         return archive_file_path
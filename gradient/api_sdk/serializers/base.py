@@ -1,5 +1,7 @@
 import marshmallow
 
+from . import compiler
+
 
 class BaseSchema(marshmallow.Schema):
     MODEL = None
@@ -15,10 +17,11 @@ class BaseSchema(marshmallow.Schema):
         if not self.MODEL:
             raise NotImplementedError
 
+        get_instance = compiler.get_loader(self) or self._get_instance
         if not many:
-            return self._get_instance(obj_dict)
+            return get_instance(obj_dict)
 
-        instances = [self._get_instance(obj_d) for obj_d in obj_dict]
+        instances = [get_instance(obj_d) for obj_d in obj_dict]
         return instances
 
     def _get_instance(self, obj_dict):
@@ -0,0 +1,188 @@
+"""Compiled loaders building model instances from API responses
+
+``BaseSchema.get_instance`` runs a full marshmallow ``load`` (which also loads nested data into
+dicts), builds ``MODEL`` and then walks all fields again to load nested objects with a new
+nested schema instance. Loaders compiled here do the same work in one pass: field mappings are
+computed once per schema class and nested objects are loaded only once, by loaders of their own
+schema classes.
+
+Schemas using marshmallow features not handled here (load hooks, validators, strict mode,
+dotted attributes, non-default options) are not compiled and use the regular path.
+"""
+import collections
+
+import marshmallow
+from marshmallow import missing
+from marshmallow.decorators import POST_LOAD, PRE_LOAD, VALIDATES, VALIDATES_SCHEMA
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+_LOAD_PROCESSOR_TAGS = (PRE_LOAD, POST_LOAD, VALIDATES, VALIDATES_SCHEMA)
+
+# schema class -> (template schema, loader or None if the class can not be compiled)
+_loaders = {}
+
+_LoadedField = collections.namedtuple("_LoadedField", ("attr_name", "load_from", "key", "field", "is_nested"))
+_NestedField = collections.namedtuple("_NestedField", ("field_name", "source", "many", "only", "get_instance"))
+
+
+def get_loader(schema):
+    """Get compiled loader for the schema
+
+    :param marshmallow.Schema schema:
+    :returns: function building model instance from a single object dict
+        or None if the schema has to be loaded the regular way
+    :rtype: callable|None
+    """
+    schema_cls = type(schema)
+    compiled = _loaders.get(schema_cls)
+    if compiled is None:
+        template = schema_cls()
+        compiled = (template, compile_loader(template))
+        _loaders[schema_cls] = compiled
+
+    template, loader = compiled
+    if loader is None or not _has_options_of(schema, template):
+        return None
+
+    return loader
+
+
+def compile_loader(schema):
+    """Build loader specialized for fields of the schema
+
+    :param marshmallow.Schema schema: schema created with default options
+    :rtype: callable|None
+    """
+    if not _is_compilable(schema):
+        return None
+
+    model_cls = schema.MODEL
+    loaded_fields = []
+    nested_fields = []
+    for field_name, field in schema.fields.items():
+        is_nested = isinstance(field, marshmallow.fields.Nested)
+        if is_nested:
+            if field.attribute not in (None, field_name):
+                return None
+            nested_fields.append(_NestedField(
+                field_name, field.load_from or field_name, field.many, field.only, _get_nested_loader(field)))
+
+        if field.dump_only:
+            continue
+
+        key = field.attribute or field_name
+        if "." in key:
+            return None
+        loaded_fields.append(_LoadedField(field_name, field.load_from, key, field, is_nested))
+
+    def load(data):
+        if not isinstance(data, Mapping):
+            return None
+
+        nested_values = {}
+        for nested_field in nested_fields:
+            field_dict = data.get(nested_field.source, {})
+            if field_dict is None:
+                continue
+
+            field_data = nested_field.get_instance(field_dict, nested_field.many)
+            if nested_field.only:
+                if isinstance(field_data, list):
+                    field_data = [getattr(val, nested_field.only) for val in field_data]
+                else:
+                    field_data = getattr(field_data, nested_field.only)
+
+            if field_data:
+                nested_values[nested_field.field_name] = field_data
+
+        kwargs = {}
+        for loaded_field in loaded_fields:
+            if loaded_field.is_nested and loaded_field.key in nested_values:
+                # loaded nested dict would be replaced with the instance anyway
+                kwargs[loaded_field.key] = nested_values[loaded_field.key]
+                continue
+
+            field = loaded_field.field
+            field_name = loaded_field.attr_name
+            raw_value = data.get(field_name, missing)
+            if raw_value is missing and loaded_field.load_from:
+                field_name = loaded_field.load_from
+                raw_value = data.get(field_name, missing)
+            if raw_value is missing:
+                raw_value = field.missing() if callable(field.missing) else field.missing
+                if raw_value is missing and not field.required:
+                    continue
+
+            try:
+                value = field.deserialize(raw_value, loaded_field.load_from or loaded_field.attr_name, data)
+            except marshmallow.ValidationError as e:
+                # invalid values are skipped the same way schema.load() (not strict) skips them
+                value = e.data or missing
+
+            if value is not missing:
+                kwargs[loaded_field.key] = value
+
+        instance = model_cls(**kwargs)
+        for field_name, field_data in nested_values.items():
+            setattr(instance, field_name, field_data)
+        return instance
+
+    load.__name__ = "load_{}".format(type(schema).__name__)
+    return load
+
+
+def _is_compilable(schema):
+    if not getattr(schema, "MODEL", None) or schema.strict:
+        return False
+
+    if getattr(schema, "__error_handler__", None):
+        return False
+
+    for tag_name, pass_many in schema.__processors__:
+        if tag_name in _LOAD_PROCESSOR_TAGS:
+            return False
+
+    return True
+
+
+def _has_options_of(schema, template):
+    return (schema.only == template.only and
+            schema.exclude == template.exclude and
+            schema.load_only == template.load_only and
+            schema.dump_only == template.dump_only and
+            schema.partial == template.partial and
+            schema.strict == template.strict and
+            schema.many == template.many and
+            schema.context == template.context)
+
+
+def _get_nested_loader(field):
+    """
+    :param marshmallow.fields.Nested field:
+    :returns: function getting nested instance(s) the way BaseSchema._get_nested does
+    :rtype: callable
+    """
+    nested_cls = field.nested
+    if not isinstance(nested_cls, type):
+        # let the regular path fail (or succeed) the same way it always did
+        return lambda field_dict, many: nested_cls().get_instance(field_dict, many=many)
+
+    state = {}
+
+    def get_instance(field_dict, many):
+        # resolved on first use, so schemas nesting themselves do not recurse while compiling
+        if "loader" not in state:
+            state["loader"] = get_loader(nested_cls())
+
+        loader = state["loader"]
+        if loader is None:
+            return nested_cls().get_instance(field_dict, many=many)
+        if many:
+            return [loader(obj_dict) for obj_dict in field_dict]
+        return loader(field_dict)
+
+    return get_instance
@@ -2,20 +2,6 @@ import click
 import colorama
 from click._compat import get_text_stderr
 
-import gradient.cli.auth
-import gradient.cli.clusters
-import gradient.cli.datasets
-import gradient.cli.machine_types
-import gradient.cli.machines
-import gradient.cli.models
-import gradient.cli.notebooks
-import gradient.cli.projects
-import gradient.cli.secrets
-import gradient.cli.storage_providers
-import gradient.cli.workflows
-from gradient.api_sdk.config import config
-import gradient.cli.gradient_deployments
-
 
 def show(self, file=None):
     if file is None:
@@ -1,3 +1,6 @@
+import importlib
+import os
+
 import click
 import click_completion
 import requests
@@ -6,13 +9,56 @@ from gradient.api_sdk.config import config
 from gradient.api_sdk.sdk_exceptions import GradientSdkError
 from gradient.cli import common
 from gradient.clilogger import CliLogger
-from gradient.commands import login as login_commands
 from gradient.exceptions import ApplicationError
 
-click_completion.init()
+# modules are imported only when one of their commands is used, so a single command
+# does not pay for importing every command group (and SDK modules used by them)
+LAZY_COMMANDS = {
+    "apiKey": ["gradient.cli.auth"],
+    "clusters": ["gradient.cli.clusters", "gradient.cli.machine_types"],
+    "datasets": ["gradient.cli.datasets"],
+    "deployments": ["gradient.cli.gradient_deployments"],
+    "login": ["gradient.cli.auth"],
+    "logout": ["gradient.cli.auth"],
+    "machines": ["gradient.cli.machines"],
+    "models": ["gradient.cli.models"],
+    "notebooks": ["gradient.cli.notebooks"],
+    "projects": ["gradient.cli.projects"],
+    "secrets": ["gradient.cli.secrets"],
+    "storageProviders": ["gradient.cli.storage_providers"],
+    "workflows": ["gradient.cli.workflows"],
+}
+
+
+def _is_completion_requested():
+    # click sets _<PROG_NAME>_COMPLETE environment variable when shell asks for completions
+    return any(name.startswith("_") and name.endswith("_COMPLETE") for name in os.environ)
+
+
+if _is_completion_requested():
+    click_completion.init()
 
 
 class GradientGroup(common.ClickGroup):
+    def __init__(self, *args, **kwargs):
+        self.lazy_commands = kwargs.pop("lazy_commands", None) or {}
+        super(GradientGroup, self).__init__(*args, **kwargs)
+
+    def list_commands(self, ctx):
+        return sorted(set(self.commands) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        self.load_command(cmd_name)
+        return super(GradientGroup, self).get_command(ctx, cmd_name)
+
+    def load_command(self, cmd_name):
+        """Import modules registering a command, if the command is lazy loaded
+
+        :param str cmd_name:
+        """
+        for module_name in self.lazy_commands.get(cmd_name, []):
+            importlib.import_module(module_name)
+
     def main(self, *args, **kwargs):
         try:
             super(GradientGroup, self).main(*args, **kwargs)
@@ -26,13 +72,15 @@ class GradientGroup(common.ClickGroup):
             CliLogger().error(e)
 
 
-@click.group(cls=GradientGroup, **config.HELP_COLORS_DICT)
+@click.group(cls=GradientGroup, lazy_commands=LAZY_COMMANDS, **config.HELP_COLORS_DICT)
 def cli():
     pass
 
 
 @cli.command("version", help="Show the version and exit")
 def get_version():
+    from gradient.commands import login as login_commands
+
     command = login_commands.ShowVersionCommand()
     command.execute()
 
@@ -361,6 +361,37 @@ def commit_dataset_version(
     command.execute(dataset_version_id)
 
 
+@dataset_versions.command("manifest", help="Write manifest of dataset version files")
+@click.option(
+    "--id",
+    "dataset_version_id",
+    help="Dataset version ID (ex: {}:{})".format(EXAMPLE_ID, EXAMPLE_VERSION),
+    cls=common.GradientOption,
+    required=True,
+)
+@click.option(
+    "--target-path",
+    "target_path",
+    help="Manifest file path",
+    cls=common.GradientOption,
+    required=True,
+)
+@click.option(
+    "--sha256",
+    "sha256",
+    help="Download every file to add SHA-256 of its content to the manifest",
+    is_flag=True,
+    type=bool,
+    cls=common.GradientOption,
+)
+@api_key_option
+@common.options_file
+def export_dataset_version_manifest(api_key, dataset_version_id, target_path, sha256, options_file):
+    validate_dataset_id(dataset_version_id, ref_type='version')
+    command = commands.ExportDatasetVersionManifestCommand(api_key=api_key)
+    command.execute(dataset_version_id, target_path=target_path, sha256=sha256)
+
+
 @dataset_versions.command("delete", help="Delete dataset version")
 @click.option(
     "--id",
@@ -434,13 +465,45 @@ def list_dataset_files(api_key, dataset_version_id, path, recursive, options_fil
     cls=common.GradientOption,
     required=True,
 )
+@click.option(
+    "--part-size",
+    "part_size",
+    help="Files bigger than this many bytes are downloaded in parallel parts of this size",
+    type=int,
+    cls=common.GradientOption,
+)
+@click.option(
+    "--resume",
+    "resume",
+    help="Skip files that did not change since previous download and resume interrupted downloads",
+    is_flag=True,
+    type=bool,
+    cls=common.GradientOption,
+)
+@click.option(
+    "--limit-rate",
+    "limit_rate",
+    help="Limit bandwidth used by all transfers together, in bytes per second",
+    type=int,
+    cls=common.GradientOption,
+)
+@click.option(
+    "--manifest",
+    "manifest_path",
+    help="Download files listed in a manifest written by 'datasets versions manifest' instead of listing storage",
+    cls=common.GradientOption,
+)
 @api_key_option
 @common.options_file
-def get_dataset_files(api_key, dataset_version_id, source_paths, target_path, options_file):
+def get_dataset_files(api_key, dataset_version_id, source_paths, target_path, part_size, resume, limit_rate,
+                      manifest_path, options_file):
     validate_dataset_id(dataset_version_id, ref_type='version')
     command = commands.GetDatasetFilesCommand(api_key=api_key)
+    if limit_rate:
+        command.set_rate_limit(limit_rate)
     command.execute(dataset_version_id=dataset_version_id,
-                    source_paths=source_paths, target_path=target_path)
+                    source_paths=source_paths, target_path=target_path, part_size=part_size, resume=resume,
+                    manifest_path=manifest_path)
 
 
 @dataset_version_files.command("put", help="Put files")
@@ -465,13 +528,79 @@ def get_dataset_files(api_key, dataset_version_id, source_paths, target_path, op
     help="Target dataset file path",
     cls=common.GradientOption,
 )
+@click.option(
+    "--resume",
+    "resume",
+    help="Skip files uploaded by previous runs and resume interrupted multipart uploads",
+    is_flag=True,
+    type=bool,
+    cls=common.GradientOption,
+)
+@click.option(
+    "--pack",
+    "pack",
+    help="Upload small files packed in tar shards. Packed files are listed, downloaded, synced and deleted "
+         "like other files",
+    is_flag=True,
+    type=bool,
+    cls=common.GradientOption,
+)
+@click.option(
+    "--limit-rate",
+    "limit_rate",
+    help="Limit bandwidth used by all transfers together, in bytes per second",
+    type=int,
+    cls=common.GradientOption,
+)
 @api_key_option
 @common.options_file
-def put_dataset_files(api_key, dataset_version_id, source_paths, target_path, options_file):
+def put_dataset_files(api_key, dataset_version_id, source_paths, target_path, resume, pack, limit_rate,
+                      options_file):
     validate_dataset_id(dataset_version_id, ref_type='version')
     command = commands.PutDatasetFilesCommand(api_key=api_key)
+    if limit_rate:
+        command.set_rate_limit(limit_rate)
+    command.execute(dataset_version_id=dataset_version_id,
+                    source_paths=source_paths, target_path=target_path, resume=resume, pack=pack)
+
+
+@dataset_version_files.command("sync", help="Upload new and changed files")
+@click.option(
+    "--id",
+    "dataset_version_id",
+    help="Dataset version ID (ex: {}:{})".format(EXAMPLE_ID, EXAMPLE_VERSION),
+    cls=common.GradientOption,
+    required=True,
+)
+@click.option(
+    "--source-path",
+    "source_paths",
+    help="File or directory to sync",
+    cls=common.GradientOption,
+    multiple=True,
+    required=True,
+)
+@click.option(
+    "--target-path",
+    "target_path",
+    help="Target dataset file path",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--delete",
+    "delete",
+    help="Delete dataset files that do not exist in source path",
+    is_flag=True,
+    type=bool,
+    cls=common.GradientOption,
+)
+@api_key_option
+@common.options_file
+def sync_dataset_files(api_key, dataset_version_id, source_paths, target_path, delete, options_file):
+    validate_dataset_id(dataset_version_id, ref_type='version')
+    command = commands.SyncDatasetFilesCommand(api_key=api_key)
     command.execute(dataset_version_id=dataset_version_id,
-                    source_paths=source_paths, target_path=target_path)
+                    source_paths=source_paths, target_path=target_path, delete=delete)
 
 
 @dataset_version_files.command("delete", help="Delete files")
@@ -1,9 +1,13 @@
 import abc
+import base64
+import hashlib
+import json
 import mimetypes
 import multiprocessing
 import os
 import re
 import threading
+import time
 import uuid
 import math
 try:
@@ -21,18 +25,144 @@ import requests
 import six
 
 from gradient import api_sdk
+from gradient.api_sdk import bandwidth
+from gradient.api_sdk.request_memo import RequestMemo
 from gradient.api_sdk.sdk_exceptions import ResourceFetchingError
 from gradient.cli_constants import CLI_PS_CLIENT_NAME
 from gradient.commands.common import BaseCommand, DetailsCommandMixin, ListCommandPagerMixin
+from gradient.commands.datasets_journal import DownloadJournal, EtagHasher, FileHashCache, ListingCache, \
+    UploadJournal
+from gradient.commands import datasets_manifest, datasets_shards
+from gradient.commands.datasets_pipeline import PrefixLister, PreSignedUrlSigner, SigningPipeline
 from gradient.exceptions import ApplicationError
 
 S3_XMLNS = 'http://s3.amazonaws.com/doc/2006-03-01/'
+LIST_MAX_KEYS = 1000  # S3 limit for a single listObjectsV2 request
+LISTING_CACHE_BATCH_SIZE = 1000
+
+
+class AdaptiveConcurrency(object):
+    THROTTLE_STATUS_CODES = frozenset((429, 503))
+
+    def __init__(self, min_limit=None, max_limit=None, initial_limit=None, interval=2.0,
+                 decrease_factor=0.5, max_error_rate=0.05, clock=time.monotonic):
+        """Limits number of active workers and adjusts the limit in AIMD fashion
+
+        Every interval the limit grows by one if all allowed workers were busy
+        and throughput did not drop, and it is cut by decrease_factor if
+        storage provider throttled requests (503 SlowDown, 429) or too many
+        of them failed.
+
+        :param int min_limit:
+        :param int max_limit:
+        :param int initial_limit: defaults to min_limit
+        :param float interval: seconds between adjustments
+        :param float decrease_factor: limit multiplier used when backing off
+        :param float max_error_rate: share of failed responses that is still tolerated
+        :param callable clock:
+        """
+        self.min_limit = max(min_limit or config.DATASETS_MIN_CONCURRENCY, 1)
+        self.max_limit = max(max_limit or config.DATASETS_MAX_CONCURRENCY, self.min_limit)
+        self.limit = min(max(initial_limit or self.min_limit, self.min_limit), self.max_limit)
+        self.interval = interval
+        self.decrease_factor = decrease_factor
+        self.max_error_rate = max_error_rate
+        self.clock = clock
+
+        self._active = 0
+        self._saturated = False
+        self._condition = threading.Condition()
+        self._last_throughput = None
+        self._reset_window()
+
+    def acquire(self, timeout=None):
+        """Wait until the worker is allowed to run
+
+        :returns: False if timeout passed before the worker was allowed to run
+        :rtype: bool
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._active < self.limit, timeout=timeout):
+                return False
+
+            self._active += 1
+            if self._active >= self.limit:
+                self._saturated = True
+            return True
+
+    def release(self):
+        with self._condition:
+            self._active -= 1
+            self._adjust()
+            self._condition.notify_all()
+
+    def on_response(self, response):
+        """Record response of a request sent by one of the workers
+
+        :param requests.Response response:
+        """
+        size = 0
+        for headers in (response.headers, getattr(response.request, 'headers', None)):
+            try:
+                size += int((headers or {}).get('Content-Length') or 0)
+            except ValueError:
+                pass
+
+        with self._condition:
+            self._responses += 1
+            self._bytes += size
+            if response.status_code in self.THROTTLE_STATUS_CODES:
+                self._throttled += 1
+            elif response.status_code >= 500:
+                self._errors += 1
+            self._adjust()
+            self._condition.notify_all()
+
+    def _reset_window(self):
+        self._window_start = self.clock()
+        self._responses = 0
+        self._bytes = 0
+        self._errors = 0
+        self._throttled = 0
+        self._saturated = self._active >= self.limit
+
+    def _adjust(self):
+        elapsed = self.clock() - self._window_start
+        if elapsed < self.interval:
+            return
+
+        # requests per second matter when objects are too small for their size to show up
+        throughput = (self._bytes or self._responses) / elapsed
+
+        error_rate = float(self._errors) / self._responses if self._responses else 0
+        if self._throttled or error_rate > self.max_error_rate:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        elif self._saturated and (self._last_throughput is None or throughput >= self._last_throughput * 0.95):
+            self.limit = min(self.max_limit, self.limit + 1)
+
+        self._last_throughput = throughput
+        self._reset_window()
 
 
 class WorkerPool(object):
 
-    def __init__(self, count=None, min_count=4, max_count=16, cpu_multiplier=1):
-        if count is None:
+    def __init__(self, count=None, min_count=4, max_count=16, cpu_multiplier=1, adaptive=None):
+        """
+        :param int count: number of worker threads
+        :param int min_count:
+        :param int max_count:
+        :param float cpu_multiplier:
+        :param bool adaptive: start DATASETS_MAX_CONCURRENCY threads, but let AdaptiveConcurrency
+            decide how many of them are working at the same time. Defaults to DATASETS_ADAPTIVE_CONCURRENCY
+        """
+        if adaptive is None:
+            adaptive = config.DATASETS_ADAPTIVE_CONCURRENCY
+
+        self.concurrency = None
+        if adaptive:
+            self.concurrency = AdaptiveConcurrency()
+            count = self.concurrency.max_limit
+        elif count is None:
             count = min(max(round(multiprocessing.cpu_count() *
                                   cpu_multiplier), min_count), max_count)
 
@@ -47,57 +177,90 @@ class WorkerPool(object):
 
         self.worker_count = count
 
+    @property
+    def active_worker_limit(self):
+        """Number of workers allowed to run at the same time"""
+        if self.concurrency is None:
+            return self.worker_count
+        return self.concurrency.limit
+
     def _create_thread(self):
         t = threading.Thread(target=self._worker)
         t.setDaemon(True)
         return t
 
     def __enter__(self):
+        if self.concurrency is not None:
+            http_client.session_pool.add_response_hook(self.concurrency.on_response)
+
         for thread in self._threads:
             thread.start()
 
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self._exception:
-            raise self._exception
+        if exc_val is not None:
+            self.set_exception(exc_val)
 
+        # workers may still be busy with long transfers so wait until
+        # every one of them gets its stop signal instead of giving up
         for _ in range(self.worker_count):
-            try:
-                self._work.put(None, block=True, timeout=1)
-            except queue.Full:
-                break
-
-        self._work.join()
+            self._put_work(None)
 
         for thread in self._threads:
             thread.join()
 
+        if self.concurrency is not None:
+            http_client.session_pool.remove_response_hook(self.concurrency.on_response)
+
+        if self._exception and exc_val is None:
+            raise self._exception
+
     def _worker(self):
         while not self.has_exception():
-            try:
-                work = self._work.get(block=True, timeout=1)
-            except queue.Empty:
+            if self.concurrency is not None and not self.concurrency.acquire(timeout=1):
                 continue
 
             try:
-                if work is None:
+                if not self._run_work():
                     return
+            finally:
+                if self.concurrency is not None:
+                    self.concurrency.release()
+
+    def _run_work(self):
+        """
+        :returns: False if the worker got stop signal
+        :rtype: bool
+        """
+        try:
+            work = self._work.get(block=True, timeout=1)
+        except queue.Empty:
+            return True
 
-                (func, args, kwargs) = work
-                func(*args, **kwargs)
+        try:
+            if work is None:
+                return False
 
-                with self._completed_lock:
-                    self._completed_count += 1
-            except Exception as e:
-                self.set_exception(e)
-            finally:
-                self._work.task_done()
+            (func, args, kwargs) = work
+            func(*args, **kwargs)
+
+            with self._completed_lock:
+                self._completed_count += 1
+        except Exception as e:
+            self.set_exception(e)
+        finally:
+            self._work.task_done()
+
+        return True
 
     def put(self, func, *args, **kwargs):
+        self._put_work((func, args, kwargs))
+
+    def _put_work(self, work):
         while not self.has_exception():
             try:
-                return self._work.put((func, args, kwargs), block=True, timeout=1)
+                return self._work.put(work, block=True, timeout=1)
             except queue.Full:
                 pass
 
@@ -114,6 +277,15 @@ class WorkerPool(object):
         with self._completed_lock:
             return self._completed_count
 
+    def get_progress(self):
+        """Progress shown in status text: completed work and, in adaptive mode, current concurrency
+
+        :rtype: str
+        """
+        if self.concurrency is None:
+            return str(self.completed_count())
+        return '{}, {} workers'.format(self.completed_count(), self.concurrency.limit)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class BaseDatasetsCommand(BaseCommand):
@@ -256,13 +428,29 @@ class CommitDatasetVersionCommand(BaseDatasetVersionsCommand):
     def execute(self, dataset_version_id, message=None):
         dataset_version = self.client.get(dataset_version_id)
         if dataset_version.is_committed:
+            self._set_committed(dataset_version_id, dataset_version)
             self.logger.log('Dataset version already committed')
             return
 
         self.client.update(dataset_version_id, is_committed=True)
+        self._set_committed(dataset_version_id, dataset_version)
         self.logger.log(
             'Committed dataset version: {}'.format(dataset_version_id))
 
+    @staticmethod
+    def _set_committed(dataset_version_id, dataset_version):
+        """Let file commands serve listings of the version from the listing cache"""
+        # tags can be moved to other versions so the version itself is recorded
+        dataset_id, _, _ = dataset_version_id.partition(':')
+        if dataset_version.version:
+            dataset_version_id = '{}:{}'.format(dataset_id, dataset_version.version)
+
+        cache = ListingCache()
+        try:
+            cache.set_committed(dataset_version_id)
+        finally:
+            cache.close()
+
 
 class DeleteDatasetVersionCommand(BaseDatasetVersionsCommand):
     def execute(self, dataset_version_id):
@@ -312,13 +500,34 @@ class DeleteDatasetTagCommand(BaseDatasetTagsCommand):
 @six.add_metaclass(abc.ABCMeta)
 class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
     def __init__(self, *args, **kwargs):
+        # dataset and its reference are looked up a few times during a single command
+        self.memo = RequestMemo()
         super(BaseDatasetFilesCommand, self).__init__(*args, **kwargs)
         self.dataset_client = api_sdk.clients.DatasetsClient(
             api_key=self.api_key,
             logger=self.logger,
             ps_client_name=CLI_PS_CLIENT_NAME,
+            memo=self.memo,
+        )
+        self.limiter = bandwidth.default_limiter
+        self.shard_manifests = None
+
+    def _get_client(self, api_key, logger):
+        return api_sdk.clients.DatasetVersionsClient(
+            api_key=api_key,
+            logger=logger,
+            ps_client_name=CLI_PS_CLIENT_NAME,
+            memo=self.memo,
         )
 
+    def set_rate_limit(self, rate_limit):
+        """Limit bandwidth used by all transfers of the command together
+
+        :param int rate_limit: bytes per second
+        """
+        self.limiter = bandwidth.BandwidthLimiter(
+            rate=rate_limit, transfer_rate=config.TRANSFER_RATE_LIMIT_PER_TRANSFER)
+
     def assert_supported(self, dataset_id):
         dataset_id, _, _ = dataset_id.partition(':')
 
@@ -376,7 +585,11 @@ class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
             self.validate_s3_response(response)
 
             size = response.headers.get('Content-Length', 0)
-            return {'key': path, 'size': size}
+            result = {'key': path, 'size': size}
+            etag = response.headers.get('ETag')
+            if etag:
+                result['etag'] = etag.strip('"')
+            return result
         except requests.exceptions.ConnectionError as e:
             return self.report_connection_error(e)
 
@@ -386,64 +599,377 @@ class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
         if not path.endswith('/'):
             path += '/'
 
+        cache = self.open_listing_cache(dataset_version_id)
+        try:
+            if cache is not None and cache.is_listed(dataset_version_id, path[1:]):
+                pages = self._list_cached_objects(cache, dataset_version_id, recursive, path, absolute, max_keys)
+            else:
+                pages = self._list_remote_objects(cache, dataset_version_id, recursive, path, absolute, max_keys)
+            for page in pages:
+                yield page
+        finally:
+            if cache is not None:
+                cache.close()
+
+    def _list_remote_objects(self, cache, dataset_version_id, recursive, path, absolute, max_keys):
+        # only recursive listings have every object under path and can be cached
+        recorder = ListingRecorder(cache, dataset_version_id) if recursive else None
         next_continuation_token = None
 
         while True:
-            params = {'Prefix': path, 'MaxKeys': max_keys}
-            if next_continuation_token:
-                params['ContinuationToken'] = next_continuation_token
-            if recursive:
-                params['Delimiter'] = ''
+            page = self._list_objects_page(
+                dataset_version_id, path, delimiter='' if recursive else None,
+                continuation_token=next_continuation_token, max_keys=max_keys)
+            if page is None:
+                return
+
+            prefix, contents, common_prefixes, next_continuation_token = page
+            results = []
+
+            key_prefix = path[1:] if absolute else ''
+
+            for result in contents:
+                key = result['key'][len(prefix):]
+                if recorder is not None:
+                    recorder.add(dict(result, key=path[1:] + key))
+
+                is_dir = key.endswith('/')
+
+                if not key or (recursive and is_dir):
+                    continue
+
+                result['key'] = key_prefix + key
+                if is_dir:
+                    result = {'key': result['key']}
+                results.append(result)
+
+            if not recursive:
+                for common_prefix in common_prefixes:
+                    results.append({'key': key_prefix + common_prefix[len(prefix):]})
+
+            if recorder is not None and not next_continuation_token:
+                recorder.complete(path[1:])
+
+            yield results, bool(next_continuation_token)
+
+            if not next_continuation_token:
+                break
+
+    @staticmethod
+    def _list_cached_objects(cache, dataset_version_id, recursive, path, absolute, max_keys):
+        key_prefix = path[1:] if absolute else ''
+
+        def iter_results():
+            last_dir = None
+            for result in cache.iter_objects(dataset_version_id, path[1:]):
+                key = result['key'][len(path) - 1:]
+                if not key:
+                    continue
+
+                if recursive:
+                    if not key.endswith('/'):
+                        result['key'] = key_prefix + key
+                        yield result
+                    continue
+
+                # keys are sorted so all keys of a "subdirectory" are next to each other
+                if '/' in key:
+                    dir_key = key[:key.index('/') + 1]
+                    if dir_key != last_dir:
+                        last_dir = dir_key
+                        yield {'key': key_prefix + dir_key}
+                else:
+                    result['key'] = key_prefix + key
+                    yield result
+
+        results = []
+        for result in iter_results():
+            if len(results) == max_keys:
+                yield results, True
+                results = []
+            results.append(result)
+        yield results, False
+
+    def _list_objects_page(self, dataset_version_id, prefix, delimiter=None, continuation_token=None,
+                           max_keys=LIST_MAX_KEYS):
+        """Send a single listObjectsV2 request
+
+        :returns: listed prefix, objects with full keys, common prefixes and the next continuation token
+            or None if the request could not be sent
+        :rtype: tuple[str,list[dict],list[str],str|None]|None
+        """
+        params = {'Prefix': prefix, 'MaxKeys': max_keys}
+        if continuation_token:
+            params['ContinuationToken'] = continuation_token
+        if delimiter is not None:
+            params['Delimiter'] = delimiter
+
+        pre_signed = self.client.generate_pre_signed_s3_url(
+            dataset_version_id,
+            method='listObjectsV2',
+            params=params,
+        )
+
+        try:
+            response = requests.get(pre_signed.url)
+            self.validate_s3_response(response)
+        except requests.exceptions.ConnectionError as e:
+            self.report_connection_error(e)
+            return
+
+        tree = ElementTree.fromstring(response.text)
+
+        listed_prefix = tree.find('{' + S3_XMLNS + '}Prefix').text or ''
+        contents = []
+        common_prefixes = []
+        next_continuation_token = None
+
+        for item in tree:
+            name = item.tag.rpartition('}')[2]
+            if name == 'Contents':
+                result = {'key': item.find('{' + S3_XMLNS + '}Key').text}
+                result['size'] = item.find(
+                    '{' + S3_XMLNS + '}Size').text
+                etag = item.find('{' + S3_XMLNS + '}ETag')
+                if etag is not None and etag.text:
+                    result['etag'] = etag.text.strip('"')
+                contents.append(result)
+            elif name == 'NextContinuationToken':
+                next_continuation_token = item.text
+            elif name == 'CommonPrefixes':
+                common_prefixes.append(item.find(
+                    '{' + S3_XMLNS + '}Prefix').text)
+
+        return listed_prefix, contents, common_prefixes, next_continuation_token
+
+    def iter_objects(self, dataset_version_id, path='/', absolute=True, concurrency=None):
+        """List all objects under path recursively, "subdirectories" are listed concurrently
+
+        Objects are yielded one by one in no particular order.
+
+        :param str dataset_version_id:
+        :param str path: dataset directory
+        :param bool absolute: yield keys relative to the dataset root instead of path
+        :param int concurrency: number of listing requests sent at the same time
+        :rtype: collections.Iterator[dict]
+        """
+        path = self.normalize_path(path)
+        if not path.endswith('/'):
+            path += '/'
+        key_prefix = path[1:] if absolute else ''
+
+        def list_page(prefix, continuation_token):
+            page = self._list_objects_page(
+                dataset_version_id, prefix, delimiter='/', continuation_token=continuation_token)
+            if page is None:
+                return [], [], None
+            listed_prefix, contents, common_prefixes, next_continuation_token = page
+
+            # keys in the response start with the storage prefix of the listed path, not with the path itself,
+            # objects are passed on with keys relative to the version root like the listing cache keeps them
+            for result in contents:
+                result['key'] = prefix[1:] + result['key'][len(listed_prefix):]
+            common_prefixes = [prefix + p[len(listed_prefix):] for p in common_prefixes]
+            return contents, common_prefixes, next_continuation_token
+
+        cache = self.open_listing_cache(dataset_version_id)
+        try:
+            if cache is not None and cache.is_listed(dataset_version_id, path[1:]):
+                objects = cache.iter_objects(dataset_version_id, path[1:])
+                recorder = None
+            else:
+                lister = PrefixLister(list_page, concurrency=concurrency or config.DATASETS_LIST_CONCURRENCY)
+                objects = lister.iter_objects(path)
+                recorder = ListingRecorder(cache, dataset_version_id)
+
+            for result in objects:
+                if recorder is not None:
+                    recorder.add(result)
+
+                key = result['key'][len(path) - 1:]
+                # keys ending with a slash are directory markers
+                if not key or key.endswith('/'):
+                    continue
+
+                result['key'] = key_prefix + key
+                yield result
+
+            if recorder is not None:
+                recorder.complete(path[1:])
+        finally:
+            if cache is not None:
+                cache.close()
+
+    @staticmethod
+    def open_listing_cache(dataset_version_id):
+        """Open listing cache if the dataset version is known to be committed
+
+        Objects of committed versions can not change. Uncommitted versions
+        bypass the cache.
+
+        :rtype: ListingCache|None
+        """
+        if not ListingCache.exists():
+            return None
+
+        cache = ListingCache()
+        if cache.is_committed(dataset_version_id):
+            return cache
+
+        cache.close()
+        return None
+
+    def _list_shard_manifest_keys(self, dataset_version_id):
+        for result in self.iter_objects(dataset_version_id, path='/' + datasets_shards.SHARDS_PREFIX):
+            if result['key'].endswith('/' + datasets_shards.MANIFEST_NAME):
+                yield result['key']
+
+    def _get_shard_manifests(self, dataset_version_id, manifest_keys=None):
+        """Load manifests of all tar shards of the dataset version. Manifests are loaded once per command
+
+        :param str dataset_version_id:
+        :param list[str] manifest_keys: keys of all manifests if they are known already
+        :returns: manifests with their key and shards
+        :rtype: list[dict]
+        """
+        if self.shard_manifests is not None:
+            return self.shard_manifests
 
+        if manifest_keys is None:
+            manifest_keys = self._list_shard_manifest_keys(dataset_version_id)
+
+        self.shard_manifests = []
+        for key in manifest_keys:
             pre_signed = self.client.generate_pre_signed_s3_url(
                 dataset_version_id,
-                method='listObjectsV2',
-                params=params,
+                method='getObject',
+                params={'Key': key},
             )
-
+            session = http_client.session_pool.get_session(pre_signed.url)
             try:
-                response = requests.get(pre_signed.url)
-                self.validate_s3_response(response)
+                r = session.get(pre_signed.url)
             except requests.exceptions.ConnectionError as e:
-                self.report_connection_error(e)
-                return
+                return self.report_connection_error(e)
+            self.validate_s3_response(r)
+
+            self.shard_manifests.append({'key': key, 'shards': datasets_shards.load_manifest(r.content)})
+
+        return self.shard_manifests
+
+    def iter_packed_files(self, dataset_version_id, path='/', manifest_keys=None):
+        """List files packed in tar shards which are the path itself or lie under it
+
+        :param str dataset_version_id:
+        :param str path: dataset path; paths ending with a slash are directories
+        :param list[str] manifest_keys: keys of all manifests if they are known already
+        :returns: packed files with key relative to the version root, size, etag if it is known
+            and key of their shard
+        :rtype: collections.Iterator[dict]
+        """
+        for manifest in self._get_shard_manifests(dataset_version_id, manifest_keys):
+            for shard in manifest['shards']:
+                for packed_file in shard['files']:
+                    if datasets_shards.is_under_path(packed_file['key'], path):
+                        yield dict(key=packed_file['key'], size=packed_file['size'], etag=packed_file.get('etag'),
+                                   shard=shard['key'])
+
+    def remove_packed_files(self, dataset_version_id, should_remove):
+        """Remove files from tar shards the way deleting their objects removes other files
+
+        Manifests are rewritten without the removed files. Shards left
+        without any files are deleted, as are manifests left without shards.
+
+        :param str dataset_version_id:
+        :param callable should_remove: called with the key of every packed file
+        :returns: number of removed files
+        :rtype: int
+        """
+        removed_count = 0
+        for manifest in self._get_shard_manifests(dataset_version_id):
+            shards, emptied_keys, count = datasets_shards.remove_files(manifest['shards'], should_remove)
+            if not count:
+                continue
 
-            tree = ElementTree.fromstring(response.text)
+            removed_count += count
+            manifest['shards'] = shards
+            # readers must never find a manifest referring to a missing shard
+            if shards:
+                self._put_object(dataset_version_id, manifest['key'], datasets_shards.dump_manifest(shards),
+                                 'application/json')
+            else:
+                emptied_keys.insert(0, manifest['key'])
+            for key in emptied_keys:
+                self._delete_object(dataset_version_id, key)
 
-            prefix = tree.find('{' + S3_XMLNS + '}Prefix').text
-            results = []
-            next_continuation_token = None
+        self.shard_manifests = [manifest for manifest in self.shard_manifests if manifest['shards']]
+        return removed_count
 
-            key_prefix = path[1:] if absolute else ''
+    def _put_object(self, dataset_version_id, key, body, content_type):
+        pre_signed = self.client.generate_pre_signed_s3_url(
+            dataset_version_id,
+            method='putObject',
+            params={'Key': key, 'ContentType': content_type},
+        )
 
-            for item in tree:
-                name = item.tag.rpartition('}')[2]
-                if name == 'Contents':
-                    key = item.find('{' + S3_XMLNS + '}Key').text[len(prefix):]
-                    is_dir = key.endswith('/')
-
-                    if not key or (recursive and is_dir):
-                        continue
-
-                    result = {'key': key_prefix + key}
-                    if not is_dir:
-                        result['size'] = item.find(
-                            '{' + S3_XMLNS + '}Size').text
-
-                    results.append(result)
-                elif name == 'NextContinuationToken':
-                    next_continuation_token = item.text
-                elif name == 'CommonPrefixes':
-                    if recursive:
-                        continue
-                    key = item.find(
-                        '{' + S3_XMLNS + '}Prefix').text[len(prefix):]
-                    results.append({'key': key_prefix + key})
+        session = http_client.session_pool.get_session(pre_signed.url)
+        try:
+            r = session.put(pre_signed.url, data=body, headers={'Content-Type': content_type}, timeout=PUT_TIMEOUT)
+        except requests.exceptions.ConnectionError as e:
+            return self.report_connection_error(e)
+        self.validate_s3_response(r)
 
-            yield results, bool(next_continuation_token)
+    def _delete_object(self, dataset_version_id, key):
+        pre_signed = self.client.generate_pre_signed_s3_url(
+            dataset_version_id,
+            method='deleteObject',
+            params={'Key': key},
+        )
 
-            if not next_continuation_token:
-                break
+        session = http_client.session_pool.get_session(pre_signed.url)
+        try:
+            r = session.delete(pre_signed.url)
+        except requests.exceptions.ConnectionError as e:
+            return self.report_connection_error(e)
+        self.validate_s3_response(r)
+
+
+class ListingRecorder(object):
+    def __init__(self, cache, dataset_version_id):
+        """Writes objects of a remote listing to the listing cache in batches
+
+        :param ListingCache|None cache: objects are not recorded if not set
+        :param str dataset_version_id:
+        """
+        self.cache = cache
+        self.dataset_version_id = dataset_version_id
+        self.batch = []
+
+    def add(self, result):
+        """
+        :param dict result: object with key relative to the version root, size and etag
+        """
+        if self.cache is None:
+            return
+
+        self.batch.append(dict(result))
+        if len(self.batch) >= LISTING_CACHE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self.cache.add_objects(self.dataset_version_id, self.batch)
+            self.batch = []
+
+    def complete(self, prefix):
+        """Record that every object under prefix was listed
+
+        :param str prefix: key prefix relative to the version root, empty for the whole version
+        """
+        if self.cache is None:
+            return
+
+        self.flush()
+        self.cache.set_listed(self.dataset_version_id, prefix)
 
 
 class ListDatasetFilesCommand(ListCommandPagerMixin, BaseDatasetFilesCommand):
@@ -462,40 +988,606 @@ class ListDatasetFilesCommand(ListCommandPagerMixin, BaseDatasetFilesCommand):
         kwargs['dataset_version_id'] = self.resolve_dataset_version_id(
             kwargs['dataset_version_id'])
 
-        return self.list_objects(**kwargs)
+        return self.list_files(**kwargs)
+
+    def list_files(self, dataset_version_id, recursive=False, path='/', absolute=False, max_keys=20):
+        """List objects like list_objects does together with files packed in tar shards
+
+        Objects of the shards themselves are not listed. Packed files are listed after all objects.
+        """
+        path = self.normalize_path(path)
+        if not path.endswith('/'):
+            path += '/'
+        key_prefix = path[1:] if absolute else ''
+
+        # keys relative to the version root
+        listed_keys = set()
+        for results, has_more in self.list_objects(dataset_version_id, recursive, path, absolute, max_keys):
+            keys = [path[1:] + result['key'][len(key_prefix):] for result in results]
+            results = [result for key, result in zip(keys, results) if not datasets_shards.is_shard_key(key)]
+            listed_keys.update(keys)
+
+            if has_more:
+                yield results, True
+                continue
+
+            manifest_keys = self._get_listed_manifest_keys(recursive, path, listed_keys)
+            results += self._list_packed_results(
+                dataset_version_id, recursive, path, key_prefix, listed_keys, manifest_keys)
+            pages = [results[i:i + max_keys] for i in range(0, len(results), max_keys)] or [[]]
+            for i, page in enumerate(pages):
+                yield page, i < len(pages) - 1
+
+    @staticmethod
+    def _get_listed_manifest_keys(recursive, path, listed_keys):
+        """Find keys of shard manifests in a listing of the dataset root, so shards do not have to be listed again
+
+        :returns: keys of all manifests or None if the listing does not tell
+        :rtype: list[str]|None
+        """
+        if path != '/':
+            return None
+        if recursive:
+            return sorted(key for key in listed_keys if datasets_shards.is_shard_key(key) and
+                          key.endswith('/' + datasets_shards.MANIFEST_NAME))
+        if datasets_shards.SHARDS_PREFIX not in listed_keys:
+            return []
+        return None
+
+    def _list_packed_results(self, dataset_version_id, recursive, path, key_prefix, listed_keys, manifest_keys):
+        results = []
+        for packed_file in self.iter_packed_files(dataset_version_id, path, manifest_keys):
+            key = packed_file['key'][len(path) - 1:]
+            if not recursive and '/' in key:
+                dir_key = key[:key.index('/') + 1]
+                if path[1:] + dir_key not in listed_keys:
+                    listed_keys.add(path[1:] + dir_key)
+                    results.append({'key': key_prefix + dir_key})
+            elif packed_file['key'] not in listed_keys:
+                # objects take precedence over packed files with the same key
+                results.append({'key': key_prefix + key, 'size': str(packed_file['size'])})
+
+        return sorted(results, key=lambda result: result['key'])
+
+
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024  # 1MiB
+DOWNLOAD_PART_RETRIES = 5
+DOWNLOAD_TMP_SUFFIX = '.download'
+
+
+def is_md5_etag(etag):
+    return bool(etag) and re.match(r'^[0-9a-f]{32}$', etag) is not None
+
+
+def get_etag_part_size(size, etag):
+    """Get part size the object was uploaded with
+
+    Plain ETags are MD5 of the content. ETags that do not look like MD5, as
+    some S3 compatible stores return, can not be checked. Multipart ETags can
+    only be checked if the object was uploaded with the part size used by this client.
+
+    :returns: part size, 0 for objects uploaded with a single request or None if ETag can not be checked
+    :rtype: int|None
+    """
+    if not etag:
+        return None
+
+    if '-' not in etag:
+        return 0 if is_md5_etag(etag) else None
+
+    digest, _, part_count = etag.rpartition('-')
+    if size is None or not is_md5_etag(digest):
+        return None
+
+    part_size = get_multipart_part_size(size)
+    if part_count != str(int(math.ceil(float(size) / part_size))):
+        return None
+    return part_size
+
+
+def verify_etag(path, size, etag):
+    """Check that a downloaded file matches ETag of the object
+
+    :returns: False if content does not match, True otherwise
+    :rtype: bool
+    """
+    part_size = get_etag_part_size(size, etag)
+    if part_size is None:
+        return True
+
+    return FileHashCache.compute_etag(path, part_size) == etag
+
+
+class RangedDownload(object):
+    def __init__(self, path, size, etag=None, part_size=None, sha256=None):
+        """Tracks byte ranges of a single object that are downloaded by many workers
+
+        Ranges are written at their offsets into a preallocated temporary file.
+        Finished ranges are recorded in a state file next to it, so an
+        interrupted download of the same object version can be resumed.
+
+        Objects with multipart ETags are split at part boundaries of the
+        upload, so MD5 of every upload part is computed while it is written
+        and the file does not have to be read again to be verified.
+
+        :param str path: target file path
+        :param int size: object size in bytes
+        :param str etag: object ETag
+        :param int part_size: size of a single range in bytes
+        :param str sha256: expected SHA-256 of the content, if known
+        """
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.sha256 = sha256
+        self.part_size = part_size or config.DATASETS_DOWNLOAD_PART_SIZE
+        self.etag_part_size = get_etag_part_size(size, etag)
+        if self.etag_part_size:
+            self.part_size = max(1, self.part_size // self.etag_part_size) * self.etag_part_size
+        self.part_count = int(math.ceil(float(size) / self.part_size))
+        self.tmp_path = path + DOWNLOAD_TMP_SUFFIX
+        self.state_path = self.tmp_path + '.json'
+
+        self._completed = set()
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def get_part_range(self, part_number):
+        """
+        :param int part_number: part number counted from 1
+        :returns: offset and length of the part in the file
+        :rtype: tuple[int,int]
+        """
+        offset = (part_number - 1) * self.part_size
+        length = min(self.part_size, self.size - offset)
+        return offset, length
+
+    def prepare(self):
+        """Load progress of a previous attempt or preallocate the temporary file"""
+        state = self._load_state()
+        if state is not None and os.path.isfile(self.tmp_path) \
+                and os.path.getsize(self.tmp_path) == self.size:
+            self._completed, self._digests = state
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.tmp_path, 'wb') as f:
+            f.truncate(self.size)
+        self._completed = set()
+        self._digests = {}
+        self._save_state()
+
+    def get_missing_part_numbers(self):
+        with self._lock:
+            return [part_number for part_number in range(1, self.part_count + 1)
+                    if part_number not in self._completed]
+
+    def new_part_hasher(self):
+        """
+        :returns: hasher of upload parts within a single range, None if they are not hashed
+        :rtype: EtagHasher|None
+        """
+        if not self.etag_part_size:
+            return None
+        return EtagHasher(self.etag_part_size)
+
+    def complete_part(self, part_number, hasher=None):
+        """Record downloaded part
+
+        :param EtagHasher hasher: hasher the part content was fed to
+        :returns: True if it was the last missing part
+        :rtype: bool
+        """
+        with self._lock:
+            self._completed.add(part_number)
+            if hasher is not None:
+                self._digests[part_number] = [digest.hex() for digest in hasher.get_part_digests()]
+            self._save_state()
+            return len(self._completed) == self.part_count
+
+    def verify(self):
+        if os.path.getsize(self.tmp_path) != self.size:
+            return False
+
+        if self.sha256 and datasets_manifest.compute_sha256(self.tmp_path) != self.sha256:
+            return False
+
+        if self.etag_part_size and len(self._digests) == self.part_count:
+            digests = [bytes.fromhex(digest) for part_number in sorted(self._digests)
+                       for digest in self._digests[part_number]]
+            return EtagHasher.combine(digests) == self.etag
+
+        # plain MD5 can not be combined from ranges so the file is read again
+        return verify_etag(self.tmp_path, self.size, self.etag)
+
+    def finish(self):
+        """Verify the temporary file and move it to the target path"""
+        if not self.verify():
+            self.discard()
+            raise ApplicationError('Downloaded file %s does not match remote object' % self.path)
+
+        os.replace(self.tmp_path, self.path)
+        os.remove(self.state_path)
+
+    def discard(self):
+        for path in (self.tmp_path, self.state_path):
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def _get_state_key(self):
+        return {'size': self.size, 'etag': self.etag, 'part_size': self.part_size}
+
+    def _load_state(self):
+        """
+        :returns: parts finished by a previous attempt to download the same object version
+            and MD5 digests of upload parts they contain
+        :rtype: tuple[set[int],dict[int,list[str]]]|None
+        """
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (IOError, ValueError):
+            return None
+
+        completed = state.pop('completed', [])
+        digests = state.pop('digests', {})
+        if state != self._get_state_key():
+            return None
+        return set(completed), {int(part_number): value for part_number, value in digests.items()}
+
+    def _save_state(self):
+        state = self._get_state_key()
+        state['completed'] = sorted(self._completed)
+        state['digests'] = {str(part_number): value for part_number, value in self._digests.items()}
+
+        tmp_state_path = self.state_path + '.tmp'
+        with open(tmp_state_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_state_path, self.state_path)
 
 
 class GetDatasetFilesCommand(BaseDatasetFilesCommand):
+    def __init__(self, *args, **kwargs):
+        super(GetDatasetFilesCommand, self).__init__(*args, **kwargs)
+        self.part_size = config.DATASETS_DOWNLOAD_PART_SIZE
+        self.journal = None
+        self.manifest = None
+
+    @staticmethod
+    def _get_resume_offset(tmp_path, size, etag):
+        """Get number of bytes of the object that were downloaded by a previous attempt
+
+        :returns: offset to resume download from, 0 if the download has to start over
+        :rtype: int
+        """
+        state_path = tmp_path + '.json'
+        state = {'size': size, 'etag': etag}
+        try:
+            with open(state_path) as f:
+                previous_state = json.load(f)
+        except (IOError, ValueError):
+            previous_state = None
+
+        offset = 0
+        if etag and previous_state == state and os.path.isfile(tmp_path):
+            offset = os.path.getsize(tmp_path)
+            if size is not None and offset >= size:
+                offset = 0
+
+        if not offset:
+            with open(state_path, 'w') as f:
+                json.dump(state, f)
 
-    @classmethod
-    def _get(cls, url, path):
+        return offset
+
+    @staticmethod
+    def _get_hasher(tmp_path, offset, size, etag):
+        """Get hasher verifying ETag of the object while it is downloaded
+
+        When download is resumed the part downloaded before is hashed first.
+
+        :returns: hasher or None if ETag can not be checked
+        :rtype: EtagHasher|None
+        """
+        part_size = get_etag_part_size(size, etag)
+        if part_size is None:
+            return None
+
+        hasher = EtagHasher(part_size)
+        if offset:
+            with open(tmp_path, 'rb') as f:
+                remaining = offset
+                while remaining:
+                    chunk = f.read(min(DOWNLOAD_BUFFER_SIZE, remaining))
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    remaining -= len(chunk)
+        return hasher
+
+    def _get(self, pre_signed, path, size=None, etag=None, sha256=None):
         dir_path = os.path.dirname(path)
-        tmp_path = path + '.tmp-%s' % uuid.uuid4()
 
         if os.path.exists(path) and not os.path.isfile(path):
             raise ApplicationError('%s already exists' % path)
 
         os.makedirs(dir_path, exist_ok=True)
 
+        offset = 0
+        if self.journal is None:
+            tmp_path = path + '.tmp-%s' % uuid.uuid4()
+        else:
+            # temporary file is kept when download fails so the next run can resume it
+            tmp_path = path + DOWNLOAD_TMP_SUFFIX
+            offset = self._get_resume_offset(tmp_path, size, etag)
+
         try:
-            with requests.Session() as session:
-                try:
-                    with session.get(url, stream=True) as r:
-                        cls.validate_s3_response(r)
-                        with open(tmp_path, 'wb') as f:
-                            for chunk in r.iter_content(chunk_size=8192):
-                                f.write(chunk)
-                except requests.exceptions.ConnectionError as e:
-                    return cls.report_connection_error(e)
-
-            os.rename(tmp_path, path)
+            url = pre_signed.url
+            session = http_client.session_pool.get_session(url)
+            headers = {}
+            if offset:
+                headers['Range'] = 'bytes={}-'.format(offset)
+
+            try:
+                with session.get(url, headers=headers, stream=True) as r:
+                    self.validate_s3_response(r)
+                    if r.status_code != 206:
+                        # whole object was sent
+                        offset = 0
+
+                    written = 0
+                    hasher = self._get_hasher(tmp_path, offset, size, etag)
+                    chunks = self.limiter.iter_chunks(
+                        r.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE), bandwidth.PRIORITY_HIGH)
+                    with open(tmp_path, 'r+b' if offset else 'wb') as f:
+                        f.seek(offset)
+                        for chunk in chunks:
+                            f.write(chunk)
+                            if hasher is not None:
+                                hasher.update(chunk)
+                            written += len(chunk)
+
+                    content_length = (r.headers or {}).get('Content-Length')
+                    if content_length is not None and int(content_length) != written:
+                        raise ApplicationError('Download of %s was interrupted: received %s of %s bytes' %
+                                               (path, written, content_length))
+            except requests.exceptions.ConnectionError as e:
+                return self.report_connection_error(e)
+
+            if (hasher is not None and hasher.hexdigest() != etag) or \
+                    (sha256 and datasets_manifest.compute_sha256(tmp_path) != sha256):
+                os.remove(tmp_path)
+                raise ApplicationError('Downloaded file %s does not match remote object' % path)
+
+            os.replace(tmp_path, path)
+            if self.journal is not None:
+                os.remove(tmp_path + '.json')
+                self.journal.complete_download(path, etag)
         finally:
-            if os.path.isfile(tmp_path):
+            if self.journal is None and os.path.isfile(tmp_path):
                 os.remove(tmp_path)
 
-    def execute(self, dataset_version_id, source_paths, target_path):
+    def _get_ranged(self, pool, pre_signed, path, size, etag=None, sha256=None):
+        """Queue byte ranges of a big object in the pool
+
+        Ranges are downloaded concurrently by the pool workers; the worker
+        that finishes the last range moves the file to its target path.
+        """
+        if os.path.exists(path) and not os.path.isfile(path):
+            raise ApplicationError('%s already exists' % path)
+
+        download = RangedDownload(path, size, etag=etag, part_size=self.part_size, sha256=sha256)
+        download.prepare()
+
+        missing_part_numbers = download.get_missing_part_numbers()
+        if not missing_part_numbers:
+            download.finish()
+            return
+
+        session = http_client.session_pool.get_session(pre_signed.url)
+        for part_number in missing_part_numbers:
+            pool.put(self._get_part, session, download, part_number, pre_signed)
+
+    def _get_part(self, session, download, part_number, pre_signed):
+        offset, length = download.get_part_range(part_number)
+        headers = {'Range': 'bytes={}-{}'.format(offset, offset + length - 1)}
+
+        for attempt in range(DOWNLOAD_PART_RETRIES):
+            try:
+                with session.get(pre_signed.url, headers=headers, stream=True) as r:
+                    # server ignoring Range would send the whole object
+                    if r.status_code != 206 and not (r.status_code == 200 and length == download.size):
+                        self.validate_s3_response(r)
+                        raise ApplicationError('Storage provider does not support ranged downloads: %s' %
+                                               r.status_code)
+
+                    written = 0
+                    hasher = download.new_part_hasher()
+                    chunks = self.limiter.iter_chunks(
+                        r.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE), bandwidth.PRIORITY_LOW)
+                    with open(download.tmp_path, 'r+b') as f:
+                        f.seek(offset)
+                        for chunk in chunks:
+                            f.write(chunk)
+                            if hasher is not None:
+                                hasher.update(chunk)
+                            written += len(chunk)
+            except requests.exceptions.ConnectionError as e:
+                if attempt == DOWNLOAD_PART_RETRIES - 1:
+                    return self.report_connection_error(e)
+                continue
+
+            if written == length:
+                break
+        else:
+            raise ApplicationError('Unable to complete download of %s' % download.path)
+
+        if download.complete_part(part_number, hasher):
+            download.finish()
+            if self.journal is not None:
+                self.journal.complete_download(download.path, download.etag)
+
+    def _get_shard(self, pre_signed, key, members):
+        """Download tar shard and extract packed files requested from it
+
+        :param dict[str,str] members: local paths by dataset key of packed files
+        """
+        url = pre_signed.url
+        session = http_client.session_pool.get_session(url)
+        try:
+            with session.get(url, stream=True) as r:
+                self.validate_s3_response(r)
+                content_length = (r.headers or {}).get('Content-Length')
+                reader = datasets_shards.ChunksReader(
+                    self.limiter.iter_chunks(r.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE)),
+                    length=int(content_length) if content_length is not None else None)
+                paths = datasets_shards.extract_members(reader, members)
+        except requests.exceptions.ConnectionError as e:
+            return self.report_connection_error(e)
+
+        if len(paths) != len(members):
+            raise ApplicationError('Shard %s is missing files listed in its manifest' % key)
+
+        if self.journal is not None:
+            # shards are never overwritten so their key identifies content of packed files
+            for path in paths:
+                self.journal.complete_download(path, key)
+
+    def _list_shard_manifest_keys(self, dataset_version_id):
+        if self.manifest is None:
+            return super(GetDatasetFilesCommand, self)._list_shard_manifest_keys(dataset_version_id)
+
+        results, _ = datasets_manifest.find_objects(self.manifest, '/' + datasets_shards.SHARDS_PREFIX)
+        return [result['key'] for result in results
+                if result['key'].endswith('/' + datasets_shards.MANIFEST_NAME)]
+
+    def execute(self, dataset_version_id, source_paths, target_path, part_size=None, resume=False,
+                manifest_path=None):
+        """
+        :param str dataset_version_id:
+        :param list[str] source_paths: dataset files and directories to download
+        :param str target_path: local directory path
+        :param int part_size: objects bigger than this are downloaded in parallel ranges of this size
+        :param bool resume: skip files that did not change since they were downloaded
+            and resume interrupted downloads
+        :param str manifest_path: download objects listed in a manifest of the version instead of listing storage
+        """
         self.assert_supported(dataset_version_id)
 
+        if part_size:
+            self.part_size = part_size
+
+        self.manifest = None
+        if manifest_path:
+            self.manifest = self._load_manifest(dataset_version_id, manifest_path)
+
+        if resume:
+            self.journal = DownloadJournal()
+        self.shard_manifests = None
+
+        try:
+            skipped_count = self._get_files(dataset_version_id, source_paths, target_path)
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+
+        if skipped_count:
+            self.logger.log('Skipped {} unchanged files'.format(skipped_count))
+
+    def _load_manifest(self, dataset_version_id, manifest_path):
+        """
+        :returns: objects listed in the manifest
+        :rtype: list[dict]
+        """
+        try:
+            with open(manifest_path) as f:
+                manifest_version_id, objects = datasets_manifest.read_manifest(f)
+        except (IOError, ValueError, KeyError) as e:
+            raise ApplicationError('Unable to read manifest %s: %s' % (manifest_path, e))
+
+        dataset_version_id = self.resolve_dataset_version_id(dataset_version_id)
+        if manifest_version_id != dataset_version_id:
+            raise ApplicationError('Manifest %s describes dataset version %s, not %s' %
+                                   (manifest_path, manifest_version_id, dataset_version_id))
+        return objects
+
+    def _list_download_items(self, dataset_version_id, source_path, target_path, skipped):
+        """Yield remote objects found in source_path together with local paths they should be downloaded to
+
+        Objects that did not change since previous download are counted in skipped instead.
+        """
+        results = None
+        is_file = False
+        has_trailing_slash = source_path.endswith('/')
+
+        if self.manifest is not None:
+            results, is_file = datasets_manifest.find_objects(self.manifest, source_path)
+        elif not has_trailing_slash:
+            result = self.get_object(
+                dataset_version_id, source_path)
+            if result is not None:
+                results = [result]
+                is_file = True
+
+        if results is None:
+            results = self.iter_objects(dataset_version_id, path=source_path)
+
+        listed_keys = set()
+        for result in results:
+            if datasets_shards.is_shard_key(result['key']):
+                continue
+
+            listed_keys.add(result['key'].lstrip('/'))
+            if is_file:
+                path = target_path
+            elif has_trailing_slash:
+                path = os.path.join(
+                    target_path, result['key'][len(source_path)-1:])
+            else:
+                path = os.path.join(target_path, result['key'])
+
+            size = int(result.get('size') or 0)
+            etag = result.get('etag')
+            if self.journal is not None and self.journal.is_unchanged(path, size, etag):
+                skipped.append(path)
+                continue
+
+            yield dict(key=result['key'], path=path, size=size, etag=etag, sha256=result.get('sha256'))
+
+        if is_file:
+            return
+
+        # files uploaded with --pack live in tar shards and are only listed in shard manifests
+        key = source_path.lstrip('/')
+        dir_prefix = key if not key or key.endswith('/') else key + '/'
+        shards = [shard for manifest in self._get_shard_manifests(dataset_version_id) for shard in manifest['shards']]
+        for shard in shards:
+            members = {}
+            for packed_file in shard['files']:
+                if packed_file['key'] in listed_keys:
+                    # objects take precedence over packed files with the same key
+                    continue
+                elif not has_trailing_slash and packed_file['key'] == key:
+                    path = target_path
+                elif not packed_file['key'].startswith(dir_prefix):
+                    continue
+                elif has_trailing_slash:
+                    path = os.path.join(
+                        target_path, packed_file['key'][len(source_path)-1:])
+                else:
+                    path = os.path.join(target_path, packed_file['key'])
+
+                if self.journal is not None and self.journal.is_unchanged(path, packed_file['size'], shard['key']):
+                    skipped.append(path)
+                    continue
+
+                members[packed_file['key']] = path
+
+            if members:
+                yield dict(key=shard['key'], path=None, size=shard['size'], etag=None, members=members)
+
+    def _get_files(self, dataset_version_id, source_paths, target_path):
         dataset_version_id = self.resolve_dataset_version_id(
             dataset_version_id)
 
@@ -505,67 +1597,299 @@ class GetDatasetFilesCommand(BaseDatasetFilesCommand):
             source_paths = ['/']
 
         status_text = 'Downloading files'
+        skipped = []
+        signer = PreSignedUrlSigner(self.client, dataset_version_id)
 
         with halo.Halo(text=status_text, spinner='dots') as status:
             with WorkerPool() as pool:
                 for source_path in source_paths:
                     source_path = self.normalize_path(source_path)
 
-                    list_objects = None
-                    is_file = False
-                    has_trailing_slash = source_path.endswith('/')
-
-                    if not has_trailing_slash:
-                        result = self.get_object(
-                            dataset_version_id, source_path)
-                        if result is not None:
-                            list_objects = [([result], False)]
-                            is_file = True
-
-                    if not list_objects:
-                        list_objects = self.list_objects(
-                            dataset_version_id=dataset_version_id,
-                            path=source_path,
-                            recursive=True,
-                            absolute=True,
-                            max_keys=max(pool.worker_count * 2, 64)
-                        )
-
                     def update_status():
                         status.text = '{}: {} ({})  '.format(
-                            status_text, source_path, pool.completed_count())
-
-                    for results, _ in list_objects:
-                        if not results:
-                            break
-
-                        pre_signeds = self.client.generate_pre_signed_s3_urls(
-                            dataset_version_id,
-                            calls=[dict(method='getObject', params=dict(
-                                Key=r['key'])) for r in results],
-                        )
-
-                        for result, pre_signed in zip(results, pre_signeds):
-                            if is_file:
-                                path = target_path
-                            elif has_trailing_slash:
-                                path = os.path.join(
-                                    target_path, result['key'][len(source_path)-1:])
-                            else:
-                                path = os.path.join(target_path, result['key'])
+                            status_text, source_path, pool.get_progress())
+
+                    def submit(item, pre_signed):
+                        update_status()
+                        if item.get('members'):
+                            pool.put(self._get_shard, pre_signed, item['key'], item['members'])
+                        elif item['size'] > self.part_size:
+                            self._get_ranged(pool, pre_signed, item['path'], item['size'], etag=item['etag'],
+                                             sha256=item['sha256'])
+                        else:
+                            pool.put(self._get, pre_signed, item['path'], size=item['size'], etag=item['etag'],
+                                     sha256=item['sha256'])
 
-                            update_status()
-                            pool.put(self._get, url=pre_signed.url, path=path)
+                    items = self._list_download_items(dataset_version_id, source_path, target_path, skipped)
+                    SigningPipeline(signer).run(
+                        items,
+                        get_call=lambda item: dict(method='getObject', params=dict(Key=item['key'])),
+                        submit=submit,
+                        should_stop=pool.has_exception,
+                    )
+
+        return len(skipped)
+
+
+class ExportDatasetVersionManifestCommand(BaseDatasetFilesCommand):
+    def _hash_object(self, pre_signed, obj):
+        sha256 = hashlib.sha256()
+        session = http_client.session_pool.get_session(pre_signed.url)
+        try:
+            with session.get(pre_signed.url, stream=True) as r:
+                self.validate_s3_response(r)
+                chunks = self.limiter.iter_chunks(
+                    r.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE), bandwidth.PRIORITY_LOW)
+                for chunk in chunks:
+                    sha256.update(chunk)
+        except requests.exceptions.ConnectionError as e:
+            return self.report_connection_error(e)
+
+        obj['sha256'] = sha256.hexdigest()
+
+    def _hash_objects(self, dataset_version_id, objects):
+        signer = PreSignedUrlSigner(self.client, dataset_version_id)
+
+        with halo.Halo(text='Hashing files', spinner='dots'):
+            with WorkerPool() as pool:
+                SigningPipeline(signer).run(
+                    objects,
+                    get_call=lambda obj: dict(method='getObject', params=dict(Key=obj['key'])),
+                    submit=lambda obj, pre_signed: pool.put(self._hash_object, pre_signed, obj),
+                    should_stop=pool.has_exception,
+                )
+
+    def execute(self, dataset_version_id, target_path, sha256=False):
+        """Write manifest of all objects of a dataset version
+
+        :param str dataset_version_id:
+        :param str target_path: manifest file path
+        :param bool sha256: download every object to add SHA-256 of its content to the manifest
+        """
+        self.assert_supported(dataset_version_id)
+
+        dataset_version_id = self.resolve_dataset_version_id(dataset_version_id)
+
+        with halo.Halo(text='Listing files', spinner='dots'):
+            objects = sorted(self.iter_objects(dataset_version_id), key=lambda obj: obj['key'])
+
+        if sha256:
+            self._hash_objects(dataset_version_id, objects)
+
+        tmp_path = target_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            count = datasets_manifest.write_manifest(f, dataset_version_id, objects)
+        os.replace(tmp_path, target_path)
+
+        self.logger.log('Wrote manifest of {} files to {}'.format(count, target_path))
 
 
 MULTIPART_CHUNK_SIZE = int(15e6)  # 15MB
+MULTIPART_MAX_PARTS = 10000
+MULTIPART_PART_RETRIES = 5
+MULTIPART_SIGN_BATCH_SIZE = 1000
 PUT_TIMEOUT = 300  # 5 minutes
 
 
+def get_multipart_part_size(size):
+    """Get part size for a multipart upload of a file
+
+    Parts need to be at least 5MB or AWS throws an EntityTooSmall error and
+    AWS accepts at most 10000 parts, so files that would need more parts than
+    that get proportionally bigger parts (rounded up to a whole MiB).
+
+    :param int size: file size in bytes
+    :rtype: int
+    """
+    if size <= MULTIPART_CHUNK_SIZE * MULTIPART_MAX_PARTS:
+        return MULTIPART_CHUNK_SIZE
+
+    mib = 1024 * 1024
+    part_size = int(math.ceil(float(size) / MULTIPART_MAX_PARTS))
+    return int(math.ceil(float(part_size) / mib)) * mib
+
+
+class FileWindow(object):
+    def __init__(self, f, offset, length):
+        """Read-only file-like view of length bytes of an open file starting at offset
+
+        Part bodies are streamed from the file instead of being read into
+        memory first, and sending a part again only seeks back to the start
+        of the window. MD5 of the window is computed while it is read.
+
+        :param f: file opened in binary mode
+        :param int offset:
+        :param int length:
+        """
+        self.f = f
+        self.offset = offset
+        # requests reads len and tell() to send Content-Length
+        self.len = length
+        self._position = 0
+        self._md5 = hashlib.md5()
+
+    def read(self, size=-1):
+        remaining = self.len - self._position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b''
+
+        self.f.seek(self.offset + self._position)
+        data = self.f.read(size)
+        self._position += len(data)
+        if self._md5 is not None:
+            self._md5.update(data)
+        return data
+
+    def tell(self):
+        return self._position
+
+    def seek(self, position, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            position += self._position
+        elif whence == os.SEEK_END:
+            position += self.len
+        position = min(max(position, 0), self.len)
+
+        if position == 0:
+            self._md5 = hashlib.md5()
+        elif position != self._position:
+            # content was skipped or read twice, MD5 is not known anymore
+            self._md5 = None
+
+        self._position = position
+        return self._position
+
+    def get_md5(self):
+        """
+        :returns: MD5 digest of the whole window or None if it was not read sequentially to the end
+        :rtype: bytes|None
+        """
+        if self._md5 is None or self._position != self.len:
+            return None
+        return self._md5.digest()
+
+
+class MultipartUpload(object):
+    def __init__(self, dataset_version_id, key, path, size, upload_id, part_size=None, mtime=None, etags=None):
+        """Tracks parts of a single multipart upload that are sent by many workers
+
+        :param str dataset_version_id:
+        :param str key: object key
+        :param str path: local file path
+        :param int size: file size in bytes
+        :param str upload_id: UploadId returned by createMultipartUpload
+        :param int part_size:
+        :param int mtime: file modification time in nanoseconds, used by the upload journal
+        :param dict[int,str] etags: ETags of parts uploaded before, when resuming an upload
+        """
+        self.dataset_version_id = dataset_version_id
+        self.key = key
+        self.path = path
+        self.size = size
+        self.upload_id = upload_id
+        self.part_size = part_size or get_multipart_part_size(size)
+        self.part_count = int(math.ceil(float(size) / self.part_size))
+        self.mtime = mtime
+
+        self._etags = dict(etags or {})
+        self._lock = threading.Lock()
+
+    def get_part_range(self, part_number):
+        """
+        :param int part_number: part number counted from 1, as AWS expects
+        :returns: offset and length of the part in the file
+        :rtype: tuple[int,int]
+        """
+        offset = (part_number - 1) * self.part_size
+        length = min(self.part_size, self.size - offset)
+        return offset, length
+
+    def complete_part(self, part_number, etag):
+        """Store part's ETag
+
+        :returns: True if it was the last missing part
+        :rtype: bool
+        """
+        with self._lock:
+            self._etags[part_number] = etag
+            return len(self._etags) == self.part_count
+
+    def get_parts(self):
+        with self._lock:
+            return [{'ETag': etag, 'PartNumber': part_number}
+                    for part_number, etag in sorted(self._etags.items())]
+
+    def get_missing_part_numbers(self):
+        with self._lock:
+            return [part_number for part_number in range(1, self.part_count + 1)
+                    if part_number not in self._etags]
+
+
 class PutDatasetFilesCommand(BaseDatasetFilesCommand):
+    def __init__(self, *args, **kwargs):
+        super(PutDatasetFilesCommand, self).__init__(*args, **kwargs)
+        self.journal = None
+        self.pack = False
+        self.shards = []
+        self.packed_results = []
+        self.content_md5_required = False
+        self.hash_cache = None
 
     # @classmethod
-    def _put(self, session, path, url, content_type, dataset_version_id=None, key=None):
+    def _put_body(self, session, url, body, headers, priority):
+        """Send body and make sure storage received it intact
+
+        MD5 of the body is computed while it is sent and compared with ETag
+        returned by the storage. Attempts after the first one send it in
+        Content-MD5 header, so the storage verifies content itself. Once
+        storage turns out not to use MD5 as ETag, MD5 is computed before
+        every upload so the content is not sent twice.
+
+        :param FileWindow body:
+        :returns: last response, None if content could not be verified
+        :rtype: requests.Response|None
+        """
+        response = None
+        content_md5 = None
+        if self.content_md5_required:
+            for _ in iter(lambda: body.read(DOWNLOAD_BUFFER_SIZE), b''):
+                pass
+            content_md5 = body.get_md5()
+
+        for attempt in range(MULTIPART_PART_RETRIES):
+            body.seek(0)
+            request_headers = dict(headers)
+            if content_md5 is not None:
+                request_headers['Content-MD5'] = base64.b64encode(content_md5).decode()
+
+            try:
+                response = session.put(url, data=self.limiter.wrap_reader(body, priority),
+                                       headers=request_headers, timeout=PUT_TIMEOUT)
+            except requests.exceptions.ConnectionError:
+                if attempt == MULTIPART_PART_RETRIES - 1:
+                    raise
+                continue
+
+            content_md5 = content_md5 or body.get_md5()
+            if response.status_code != 200:
+                continue
+
+            etag = (response.headers or {}).get('ETag', '').strip('"')
+            if 'Content-MD5' in request_headers:
+                if content_md5.hex() != etag:
+                    self.content_md5_required = True
+                return response
+
+            if content_md5 is None or not is_md5_etag(etag) or etag == content_md5.hex():
+                return response
+
+            response = None
+
+        return response
+
+    def _put(self, session, path, url, content_type, dataset_version_id=None, key=None, mtime=None):
         size = os.path.getsize(path)
         headers = {'Content-Type': content_type}
 
@@ -573,131 +1897,194 @@ class PutDatasetFilesCommand(BaseDatasetFilesCommand):
             if size <= 0:
                 headers.update({'Content-Size': '0'})
                 r = session.put(url, data='', headers=headers, timeout=5)
-            # for files under 15MB
-            elif size <= (MULTIPART_CHUNK_SIZE):
-                with open(path, 'rb') as f:
-                    r = session.put(
-                        url, data=f, headers=headers, timeout=PUT_TIMEOUT)
-            # # for chonky files, use a multipart upload
             else:
-                # Chunks need to be at least 5MB or AWS throws an
-                # EntityTooSmall error; we'll arbitrarily choose a
-                # 15MB chunksize
-                #
-                # Note also that AWS limits the max number of chunks
-                # in a multipart upload to 10000, so this setting
-                # currently enforces a hard limit on 150GB per file.
-                #
-                # We can dynamically assign a larger part size if needed,
-                # but for the majority of use cases we should be fine
-                # as-is
-                part_minsize = MULTIPART_CHUNK_SIZE
-                dataset_id, _, version = dataset_version_id.partition(":")
-                mpu_url = f'/datasets/{dataset_id}/versions/{version}/s3/preSignedUrls'
-                api_client = http_client.API(
-                    api_url=config.CONFIG_HOST,
-                    api_key=self.api_key,
-                    ps_client_name=CLI_PS_CLIENT_NAME
-                )
-
-                mpu_create_res = api_client.post(
-                    url=mpu_url,
-                    json={
-                        'datasetId': dataset_id,
-                        'version': version,
-                        'calls': [{
-                            'method': 'createMultipartUpload',
-                            'params': {'Key': key}
-                        }]
-                    }
-                )
-
-                mpu_data = mpu_create_res.json()[0]['url']
-
-                parts = []
                 with open(path, 'rb') as f:
-                    # we +1 the number of parts since we count from zero
-                    # to match what AWS expects for part numbers. We use
-                    # `ceil` to capture any remaining data less than
-                    # part_minsize at the end of upload
-                    for part in range(1, math.ceil(size / part_minsize) + 1):
-                        presigned_url_res = api_client.post(
-                            url=mpu_url,
-                            json={
-                                'datasetId': dataset_id,
-                                'version': version,
-                                'calls': [{
-                                    'method': 'uploadPart',
-                                    'params': {
-                                        'Key': key,
-                                        'UploadId': mpu_data['UploadId'],
-                                        'PartNumber': part
-                                    }
-                                }]
-                            }
-                        )
-
-                        presigned_url = presigned_url_res.json()[0]['url']
-
-                        chunk = f.read(part_minsize)
-
-                        for attempt in range(0, 5):
-                            part_res = session.put(
-                                presigned_url,
-                                data=chunk,
-                                headers=headers,
-                                timeout=PUT_TIMEOUT)
-
-                            if part_res.status_code == 200:
-                                break
-
-                        if part_res.status_code != 200:
-                            # Why do we silence exceptions that get
-                            # explicitly raised? Mystery for the ages, but
-                            # there you have it I guess...
-                            print(f'\nUnable to complete upload of {path}')
-                            raise ApplicationError(
-                                f'Unable to complete upload of {path}')
-                        etag = part_res.headers['ETag'].replace('"', '')
-                        parts.append({'ETag': etag, 'PartNumber': part})
-                        # This is a pretty jank way to get about multipart
-                        # upload status updates, but we structure the Halo
-                        # spinner to report on the number of completed
-                        # tasks dispatched to the workers in the pool.
-                        # Since it's more of a PITA to properly distribute
-                        # this MPU among all workers than I really want to
-                        # deal with, that means we can't easily plug into
-                        # Halo for these updates. But we can print to
-                        # console! Which again, jank and noisy, but arguably
-                        # better than a task sitting forever, never either
-                        # completing or emitting an error message.
-                        print(
-                            f'\nUploaded {len(parts) * part_minsize / 10e5}MB '
-                            f'of {int(size / 10e5)}MB for '
-                            f'{path}'
-                        )
-
-                r = api_client.post(
-                    url=mpu_url,
-                    json={
-                        'datasetId': dataset_id,
-                        'version': version,
-                        'calls': [{
-                            'method': 'completeMultipartUpload',
-                            'params': {
-                                'Key': key,
-                                'UploadId': mpu_data['UploadId'],
-                                'MultipartUpload': {'Parts': parts}
-                            }
-                        }]
-                    }
-                )
-
+                    r = self._put_body(session, url, FileWindow(f, 0, size), headers, bandwidth.PRIORITY_HIGH)
+                if r is None:
+                    raise ApplicationError('Uploaded file %s does not match local file' % path)
+
+            if self.journal and r.ok:
+                self.journal.complete_object(dataset_version_id, key, size, mtime)
+            if r.ok:
+                self._record_upload(path, (r.headers or {}).get('ETag', '').strip('"'))
         except requests.exceptions.ConnectionError as e:
             return self.report_connection_error(e)
+        except ApplicationError:
+            raise
         except Exception as e:
             return e
 
+    def _get_multipart_api_client(self):
+        return http_client.API(
+            api_url=config.CONFIG_HOST,
+            api_key=self.api_key,
+            ps_client_name=CLI_PS_CLIENT_NAME
+        )
+
+    def _post_multipart_call(self, dataset_version_id, method, params, idempotent=None):
+        dataset_id, _, version = dataset_version_id.partition(":")
+        # multipart calls change objects in storage, not the dataset or its versions
+        return self._get_multipart_api_client().post(
+            url=f'/datasets/{dataset_id}/versions/{version}/s3/preSignedUrls',
+            json={
+                'datasetId': dataset_id,
+                'version': version,
+                'calls': [{'method': method, 'params': params}]
+            },
+            idempotent=idempotent,
+            read_only=True,
+        )
+
+    def _send_multipart_call(self, dataset_version_id, method, params, idempotent=None):
+        response = self._post_multipart_call(dataset_version_id, method, params, idempotent=idempotent)
+        return self._get_multipart_call_result(method, response)
+
+    @staticmethod
+    def _get_multipart_call_result(method, response):
+        if not response.ok:
+            raise ApplicationError('Failed to execute %s: %s\n\n%s' %
+                                   (method, response.status_code, response.text))
+
+        return response.json()[0]['url']
+
+    def _start_multipart_upload(self, path, size, dataset_version_id, key, mtime=None):
+        if self.journal:
+            resumed = self.journal.get_multipart_upload(dataset_version_id, key, size, mtime)
+            if resumed:
+                upload_id, part_size, etags = resumed
+                return MultipartUpload(dataset_version_id, key, path, size, upload_id=upload_id,
+                                       part_size=part_size, mtime=mtime, etags=etags)
+
+        mpu_data = self._send_multipart_call(
+            dataset_version_id, 'createMultipartUpload', {'Key': key})
+
+        upload = MultipartUpload(
+            dataset_version_id, key, path, size, upload_id=mpu_data['UploadId'], mtime=mtime)
+
+        if self.journal:
+            self.journal.start_multipart_upload(
+                dataset_version_id, key, size, mtime, upload.upload_id, upload.part_size)
+
+        return upload
+
+    def _put_multipart(self, pool, path, size, content_type, dataset_version_id, key, mtime=None):
+        """Start (or resume) multipart upload and queue its parts in the pool
+
+        Parts are uploaded concurrently by the pool workers; the worker that
+        finishes the last part completes the upload.
+        """
+        upload = self._start_multipart_upload(path, size, dataset_version_id, key, mtime=mtime)
+
+        missing_part_numbers = upload.get_missing_part_numbers()
+        if not missing_part_numbers:
+            # every part was uploaded before the previous run got interrupted
+            self._complete_multipart_upload(upload)
+            return
+
+        for i in range(0, len(missing_part_numbers), MULTIPART_SIGN_BATCH_SIZE):
+            part_numbers = missing_part_numbers[i:i + MULTIPART_SIGN_BATCH_SIZE]
+            pre_signeds = self.client.generate_pre_signed_s3_urls(
+                dataset_version_id,
+                calls=[dict(method='uploadPart', params=dict(
+                    Key=key, UploadId=upload.upload_id, PartNumber=part_number))
+                    for part_number in part_numbers],
+            )
+
+            for part_number, pre_signed in zip(part_numbers, pre_signeds):
+                pool.put(self._put_part,
+                         http_client.session_pool.get_session(pre_signed.url),
+                         upload,
+                         part_number,
+                         pre_signed.url,
+                         content_type)
+
+    def _put_part(self, session, upload, part_number, url, content_type):
+        offset, length = upload.get_part_range(part_number)
+
+        try:
+            with open(upload.path, 'rb') as f:
+                part_res = self._put_body(session, url, FileWindow(f, offset, length),
+                                          {'Content-Type': content_type}, bandwidth.PRIORITY_LOW)
+        except requests.exceptions.ConnectionError:
+            part_res = None
+
+        if self.journal and part_res is not None and part_res.status_code == 404:
+            # upload was aborted or expired since the journal entry was made
+            self.journal.abandon_multipart_upload(upload.dataset_version_id, upload.key)
+            raise ApplicationError(
+                f'Multipart upload of {upload.path} no longer exists, run the command again to restart it')
+
+        if part_res is None or part_res.status_code != 200:
+            raise ApplicationError(
+                f'Unable to complete upload of {upload.path}')
+
+        etag = part_res.headers['ETag'].replace('"', '')
+        if self.journal:
+            self.journal.complete_part(upload.upload_id, part_number, etag)
+        if upload.complete_part(part_number, etag):
+            self._complete_multipart_upload(upload)
+
+    def _complete_multipart_upload(self, upload):
+        """Complete multipart upload and check that the object matches uploaded parts
+
+        Completing an upload is not idempotent. When a completed upload's
+        response is lost, the retry fails with NoSuchUpload, so the upload
+        is taken as complete if the object has the size and ETag it should have.
+        """
+        method = 'completeMultipartUpload'
+        response = self._post_multipart_call(
+            upload.dataset_version_id,
+            method,
+            {
+                'Key': upload.key,
+                'UploadId': upload.upload_id,
+                'MultipartUpload': {'Parts': upload.get_parts()}
+            },
+            idempotent=True,
+        )
+
+        expected_etag = self._get_multipart_etag(upload)
+        if not response.ok and self._is_missing_upload_response(response):
+            if not self._is_object_uploaded(upload, expected_etag):
+                if self.journal:
+                    self.journal.abandon_multipart_upload(upload.dataset_version_id, upload.key)
+                raise ApplicationError(
+                    f'Multipart upload of {upload.path} no longer exists, run the command again to restart it')
+        else:
+            result = self._get_multipart_call_result(method, response)
+            etag = result.get('ETag', '').strip('"') if isinstance(result, dict) else ''
+            if etag and expected_etag and etag != expected_etag:
+                raise ApplicationError('Uploaded file %s does not match local file' % upload.path)
+            self._record_upload(upload.path, etag)
+
+        if self.journal:
+            self.journal.complete_object(upload.dataset_version_id, upload.key, upload.size, upload.mtime)
+
+    def _record_upload(self, path, etag):
+        if self.hash_cache is not None and etag:
+            self.hash_cache.record_upload(path, etag)
+
+    def _get_multipart_etag(self, upload):
+        """Get ETag the object completed from uploaded parts should have
+
+        :returns: ETag or None if ETags of the parts are not MD5 of their content
+        :rtype: str|None
+        """
+        part_etags = [part['ETag'] for part in upload.get_parts()]
+        if self.content_md5_required or not all(is_md5_etag(part_etag) for part_etag in part_etags):
+            return None
+        return EtagHasher.combine([bytes.fromhex(part_etag) for part_etag in part_etags])
+
+    @staticmethod
+    def _is_missing_upload_response(response):
+        return response.status_code == 404 or 'NoSuchUpload' in (response.text or '')
+
+    def _is_object_uploaded(self, upload, expected_etag=None):
+        result = self.get_object(upload.dataset_version_id, upload.key)
+        if not result or int(result['size']) != upload.size:
+            return False
+        return expected_etag is None or result.get('etag') == expected_etag
+
     @staticmethod
     def _list_files(source_path):
         if os.path.isfile(source_path):
@@ -713,64 +2100,355 @@ class PutDatasetFilesCommand(BaseDatasetFilesCommand):
         raise ApplicationError('Invalid source path: ' + source_path)
 
     def _sign_and_put(self, dataset_version_id, pool, results, update_status):
-        pre_signeds = self.client.generate_pre_signed_s3_urls(
-            dataset_version_id,
-            calls=[dict(method='putObject', params=dict(
-                Key=r['key'], ContentType=r['mimetype'])) for r in results],
-        )
+        multipart_results = [r for r in results if r['size'] > MULTIPART_CHUNK_SIZE]
+        results = [r for r in results if r['size'] <= MULTIPART_CHUNK_SIZE]
 
-        with requests.Session() as session:
-            for pre_signed, result in zip(pre_signeds, results):
-                update_status()
-                pool.put(self._put,
-                         session,
-                         result['path'],
-                         pre_signed.url,
-                         content_type=result['mimetype'],
-                         dataset_version_id=dataset_version_id,
-                         key=result['key'])
+        pre_signeds = []
+        if results:
+            pre_signeds = self.client.generate_pre_signed_s3_urls(
+                dataset_version_id,
+                calls=[dict(method='putObject', params=dict(
+                    Key=r['key'], ContentType=r['mimetype'])) for r in results],
+            )
 
-    def execute(self, dataset_version_id, source_paths, target_path):
+        for pre_signed, result in zip(pre_signeds, results):
+            update_status()
+            pool.put(self._put,
+                     http_client.session_pool.get_session(pre_signed.url),
+                     result['path'],
+                     pre_signed.url,
+                     content_type=result['mimetype'],
+                     dataset_version_id=dataset_version_id,
+                     key=result['key'],
+                     mtime=result['mtime'])
+
+        for result in multipart_results:
+            update_status()
+            self._put_multipart(pool,
+                                result['path'],
+                                result['size'],
+                                content_type=result['mimetype'],
+                                dataset_version_id=dataset_version_id,
+                                key=result['key'],
+                                mtime=result['mtime'])
+
+    def execute(self, dataset_version_id, source_paths, target_path, resume=False, pack=False):
+        """
+        :param str dataset_version_id:
+        :param list[str] source_paths: local files and directories to upload
+        :param str target_path: dataset path to upload files to
+        :param bool resume: use upload journal to skip files uploaded by previous runs
+            and resume interrupted multipart uploads
+        :param bool pack: upload small files packed in tar shards described by a manifest
+        """
         self.assert_supported(dataset_version_id)
 
+        if resume:
+            self.journal = UploadJournal()
+        self.pack = pack
+        self.shards = []
+        self.packed_results = []
+
+        try:
+            skipped_count = self._put_files(dataset_version_id, source_paths, target_path)
+            if self.shards:
+                self._put_shards_manifest(dataset_version_id)
+                # packed files replace their copies packed by previous uploads
+                packed_keys = set(result['key'].lstrip('/') for result in self.packed_results)
+                self.remove_packed_files(dataset_version_id, lambda key: key in packed_keys)
+        finally:
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+
+        if skipped_count:
+            self.logger.log('Skipped {} files uploaded before'.format(skipped_count))
+
+    def _normalize_target_path(self, target_path):
         if not target_path:
-            target_path = '/'
-        else:
-            target_path = self.normalize_path(target_path)
-            if not target_path.endswith('/'):
-                target_path += '/'
+            return '/'
+
+        target_path = self.normalize_path(target_path)
+        if not target_path.endswith('/'):
+            target_path += '/'
+        return target_path
+
+    def _list_upload_files(self, source_path, target_path):
+        """Yield local files found in source_path together with keys they should be uploaded to
+
+        :param str source_path: local file or directory. Content of a directory is uploaded
+            into a directory of the same name unless the path ends with a separator
+        :param str target_path: normalized dataset directory path
+        :rtype: collections.Iterable[dict]
+        """
+        has_trailing_slash = source_path.endswith(os.path.sep)
+        source_path = os.path.abspath(source_path)
+        source_name = os.path.basename(source_path)
+
+        for source_path_is_file, path in self._list_files(source_path):
+            path = path.replace(os.path.sep, '/')
+
+            key = target_path
+            if source_path_is_file:
+                key += source_name
+            else:
+                if not has_trailing_slash:
+                    key += source_name + '/'
+                key += path[len(source_path)+1:]
+
+            size, mtime = UploadJournal.get_file_signature(path)
+            mimetype = mimetypes.guess_type(
+                key)[0] or 'application/octet-stream'
+
+            yield dict(key=key, path=path, mimetype=mimetype, size=size, mtime=mtime)
+
+    def _list_object_keys(self, dataset_version_id, target_path):
+        """List keys of objects under target path and load manifests of shards uploaded before
+
+        :returns: keys of objects which are not part of shards, keys start with a slash as keys of uploaded files do
+        :rtype: set[str]
+        """
+        keys = set()
+        manifest_keys = [] if target_path == '/' else None
+        for result in self.iter_objects(dataset_version_id, path=target_path):
+            if not datasets_shards.is_shard_key(result['key']):
+                keys.add('/' + result['key'])
+            elif manifest_keys is not None and result['key'].endswith('/' + datasets_shards.MANIFEST_NAME):
+                manifest_keys.append(result['key'])
+
+        # loaded before this command writes a manifest, so only shards of previous uploads are updated later
+        self._get_shard_manifests(dataset_version_id, manifest_keys)
+        return keys
+
+    def _new_shard(self, shards_path):
+        shard = datasets_shards.TarShard('{}{}.tar'.format(shards_path, len(self.shards)))
+        self.shards.append(shard)
+        return shard
+
+    def _put_shard(self, session, shard, url):
+        for attempt in range(MULTIPART_PART_RETRIES):
+            try:
+                r = session.put(url, data=self.limiter.wrap_reader(shard.open()),
+                                headers={'Content-Type': 'application/x-tar'},
+                                timeout=PUT_TIMEOUT)
+            except requests.exceptions.ConnectionError as e:
+                if attempt == MULTIPART_PART_RETRIES - 1:
+                    return self.report_connection_error(e)
+                continue
+
+            if r.ok:
+                return
+
+        self.validate_s3_response(r)
+
+    def _sign_and_put_shard(self, dataset_version_id, pool, shard):
+        pre_signed = self.client.generate_pre_signed_s3_urls(
+            dataset_version_id,
+            calls=[dict(method='putObject', params=dict(Key=shard.key, ContentType='application/x-tar'))],
+        )[0]
+        pool.put(self._put_shard, http_client.session_pool.get_session(pre_signed.url), shard, pre_signed.url)
+
+    def _put_shards_manifest(self, dataset_version_id):
+        """Upload index of shards uploaded by this command; it is written last so readers never see missing shards"""
+        key = self.shards[0].key.rpartition('/')[0] + '/' + datasets_shards.MANIFEST_NAME
+        self._put_object(dataset_version_id, key, datasets_shards.dump_manifest(self.shards), 'application/json')
+
+        # packed files can only be found through the manifest so they are journaled after it is written
+        if self.journal:
+            for result in self.packed_results:
+                self.journal.complete_object(dataset_version_id, result['key'], result['size'], result['mtime'])
+
+    def _put_files(self, dataset_version_id, source_paths, target_path):
+        target_path = self._normalize_target_path(target_path)
 
         status_text = 'Uploading files'
+        skipped_count = 0
+        shards_path = '/{}{}/'.format(datasets_shards.SHARDS_PREFIX, uuid.uuid4().hex)
+        shard = None
+        object_keys = self._list_object_keys(dataset_version_id, target_path) if self.pack else set()
 
         with halo.Halo(text=status_text, spinner='dots') as status:
             with WorkerPool() as pool:
                 for source_path in source_paths:
-                    has_trailing_slash = source_path.endswith(os.path.sep)
-                    source_path = os.path.abspath(source_path)
-                    source_name = os.path.basename(source_path)
-
                     def update_status():
                         status.text = '{}: {} ({})'.format(
-                            status_text, source_path, pool.completed_count())
+                            status_text, source_path, pool.get_progress())
 
                     results = []
 
-                    for source_path_is_file, path in self._list_files(source_path):
-                        path = path.replace(os.path.sep, '/')
+                    for result in self._list_upload_files(source_path, target_path):
+                        if self.journal and self.journal.is_object_completed(
+                                dataset_version_id, result['key'], result['size'], result['mtime']):
+                            skipped_count += 1
+                            continue
+
+                        # objects take precedence over packed files, so they are overwritten by objects
+                        if (self.pack and result['size'] <= config.DATASETS_PACK_FILE_SIZE and
+                                result['key'] not in object_keys):
+                            if shard is None:
+                                shard = self._new_shard(shards_path)
+                            shard.add(result['path'], result['key'], result['size'], result['mtime'] / 1e9)
+                            self.packed_results.append(result)
+                            if shard.size >= config.DATASETS_PACK_SHARD_SIZE:
+                                update_status()
+                                self._sign_and_put_shard(dataset_version_id, pool, shard)
+                                shard = None
+                            continue
+
+                        results.append(result)
 
-                        key = target_path
-                        if source_path_is_file:
-                            key += source_name
-                        else:
-                            if not has_trailing_slash:
-                                key += source_name + '/'
-                            key += path[len(source_path)+1:]
+                        if len(results) == pool.worker_count:
+                            self._sign_and_put(
+                                dataset_version_id, pool, results, update_status)
+                            results = []
+
+                    if results:
+                        self._sign_and_put(
+                            dataset_version_id, pool, results, update_status)
+
+                if shard is not None:
+                    self._sign_and_put_shard(dataset_version_id, pool, shard)
+
+        return skipped_count
+
+
+class SyncDatasetFilesCommand(PutDatasetFilesCommand):
+    def __init__(self, *args, **kwargs):
+        super(SyncDatasetFilesCommand, self).__init__(*args, **kwargs)
+        self.incomparable_count = 0
+
+    @staticmethod
+    def _get_remote_path(source_path, target_path):
+        """Dataset path mirroring a local source path
+
+        :returns: directory path for directories and object key for files
+        :rtype: str
+        """
+        has_trailing_slash = source_path.endswith(os.path.sep)
+        source_path = os.path.abspath(source_path)
+
+        if has_trailing_slash and not os.path.isfile(source_path):
+            return target_path
+
+        source_name = os.path.basename(source_path)
+        if os.path.isfile(source_path):
+            return target_path + source_name
+        return target_path + source_name + '/'
+
+    def _get_remote_objects(self, dataset_version_id, remote_path):
+        """List remote objects and packed files; objects of tar shards themselves are left out
+
+        :returns: remote objects by their key, keys start with a slash as keys of uploaded files do.
+            Packed files have the key of their shard in shard
+        :rtype: dict[str,dict]
+        """
+        objects = {}
+        manifest_keys = None
+        if not remote_path.endswith('/'):
+            result = self.get_object(dataset_version_id, remote_path)
+            if result is not None:
+                return {remote_path: result}
+        else:
+            # listing of the whole version names all shard manifests
+            manifest_keys = [] if remote_path == '/' else None
+            for result in self.iter_objects(dataset_version_id, path=remote_path):
+                if not datasets_shards.is_shard_key(result['key']):
+                    objects['/' + result['key']] = result
+                elif manifest_keys is not None and result['key'].endswith('/' + datasets_shards.MANIFEST_NAME):
+                    manifest_keys.append(result['key'])
+
+        for packed_file in self.iter_packed_files(dataset_version_id, remote_path, manifest_keys):
+            key = '/' + packed_file['key']
+            if remote_path.endswith('/') or key == remote_path:
+                # objects take precedence over packed files with the same key
+                objects.setdefault(key, packed_file)
+        return objects
+
+    def is_changed(self, local, remote):
+        """Compare local file with remote object by size and then by ETag
+
+        :param dict local: local file as returned by _list_upload_files
+        :param dict|None remote: remote object as returned by list_objects
+        :rtype: bool
+        """
+        if remote is None or int(remote.get('size') or 0) != local['size']:
+            return True
+
+        etag = remote.get('etag')
+        part_size = get_etag_part_size(local['size'], etag)
+        if part_size is not None and self.hash_cache.get_etag(local['path'], part_size) == etag:
+            return False
+
+        # ETags of SSE-KMS objects look like MD5 but are not, so objects uploaded from the file are recognized
+        # by the ETag the storage returned for the upload
+        if etag and self.hash_cache.is_uploaded(local['path'], etag):
+            return False
+
+        if part_size is None:
+            # ETag is not MD5 of the content or the object was uploaded in parts of another size
+            self.logger.debug('Can not compare {} with remote object by ETag'.format(local['path']))
+            self.incomparable_count += 1
+        return True
+
+    def execute(self, dataset_version_id, source_paths, target_path, delete=False):
+        """Upload new and changed files and optionally delete remote files that do not exist locally
+
+        :param str dataset_version_id:
+        :param list[str] source_paths: local files and directories to sync
+        :param str target_path: dataset path to sync files to
+        :param bool delete: delete remote files missing in source paths
+        """
+        self.assert_supported(dataset_version_id)
+
+        self.hash_cache = FileHashCache()
+        self.incomparable_count = 0
+        deleter = DeleteDatasetFilesCommand(api_key=self.api_key, logger=self.logger) if delete else None
+        try:
+            uploaded_count, deleted_count, unchanged_count = self._sync_files(
+                dataset_version_id, source_paths, target_path, deleter)
+        finally:
+            self.hash_cache.close()
+            self.hash_cache = None
+
+        if deleter is not None:
+            deleter.report_failures()
+
+        self.logger.log('Uploaded {} files, deleted {} files, {} files unchanged'.format(
+            uploaded_count, deleted_count, unchanged_count))
+        if self.incomparable_count:
+            self.logger.log('{} files could not be compared with remote objects by ETag and were uploaded again'
+                            .format(self.incomparable_count))
+
+    def _sync_files(self, dataset_version_id, source_paths, target_path, deleter=None):
+        target_path = self._normalize_target_path(target_path)
 
-                        mimetype = mimetypes.guess_type(
-                            key)[0] or 'application/octet-stream'
+        status_text = 'Syncing files'
+        uploaded_count = deleted_count = unchanged_count = 0
+        # packed files replaced by uploaded objects or deleted
+        removed_packed_keys = set()
 
-                        results.append(
-                            dict(key=key, path=path, mimetype=mimetype))
+        with halo.Halo(text=status_text, spinner='dots') as status:
+            with WorkerPool() as pool:
+                for source_path in source_paths:
+                    def update_status():
+                        status.text = '{}: {} ({})'.format(
+                            status_text, source_path, pool.get_progress())
+
+                    remote_path = self._get_remote_path(source_path, target_path)
+                    remote_objects = self._get_remote_objects(dataset_version_id, remote_path)
+
+                    results = []
+
+                    for result in self._list_upload_files(source_path, target_path):
+                        remote = remote_objects.pop(result['key'], None)
+                        if not self.is_changed(result, remote):
+                            unchanged_count += 1
+                            continue
+
+                        if remote is not None and remote.get('shard'):
+                            removed_packed_keys.add(remote['key'])
+                        results.append(result)
+                        uploaded_count += 1
 
                         if len(results) == pool.worker_count:
                             self._sign_and_put(
@@ -781,17 +2459,194 @@ class PutDatasetFilesCommand(BaseDatasetFilesCommand):
                         self._sign_and_put(
                             dataset_version_id, pool, results, update_status)
 
+                    # objects left in the listing have no local counterpart
+                    if deleter is not None and remote_objects:
+                        keys = [obj['key'] for obj in remote_objects.values() if not obj.get('shard')]
+                        packed_keys = [obj['key'] for obj in remote_objects.values() if obj.get('shard')]
+                        if keys:
+                            update_status()
+                            deleter.delete_keys(dataset_version_id, keys, pool)
+                        removed_packed_keys.update(packed_keys)
+                        deleted_count += len(keys) + len(packed_keys)
+
+        # manifests are rewritten once every upload finished, so packed files are never lost
+        if removed_packed_keys:
+            self.remove_packed_files(dataset_version_id, lambda key: key in removed_packed_keys)
+
+        return uploaded_count, deleted_count, unchanged_count
+
+
+DELETE_BATCH_SIZE = 1000  # S3 limit for a single DeleteObjects request
+
 
 class DeleteDatasetFilesCommand(BaseDatasetFilesCommand):
+    def __init__(self, *args, **kwargs):
+        super(DeleteDatasetFilesCommand, self).__init__(*args, **kwargs)
+        self.bulk_delete_supported = True
+        self.bulk_deleted_count = 0
+        self.failures = []
+        self._failures_lock = threading.Lock()
+
+    def _add_failure(self, key, reason):
+        with self._failures_lock:
+            self.failures.append((key, reason))
+
+    def _delete(self, pre_signed, key=None):
+        url = pre_signed.url
+        session = http_client.session_pool.get_session(url)
+        try:
+            r = session.delete(url)
+        except requests.exceptions.ConnectionError as e:
+            return self._add_failure(key, e)
 
-    @classmethod
-    def _delete(cls, url):
-        with requests.Session() as session:
+        if not r.ok:
+            self._add_failure(key, '%s %s' % (r.status_code, r.text))
+
+    def _delete_keys(self, dataset_version_id, keys):
+        pre_signeds = self.client.generate_pre_signed_s3_urls(
+            dataset_version_id,
+            calls=[dict(method='deleteObject', params=dict(Key=key)) for key in keys],
+        )
+        for key, pre_signed in zip(keys, pre_signeds):
+            self._delete(pre_signed, key=key)
+
+    @staticmethod
+    def _get_delete_objects_body(keys):
+        delete = ElementTree.Element('Delete', xmlns=S3_XMLNS)
+        ElementTree.SubElement(delete, 'Quiet').text = 'true'
+        for key in keys:
+            obj = ElementTree.SubElement(delete, 'Object')
+            ElementTree.SubElement(obj, 'Key').text = key
+        return ElementTree.tostring(delete, encoding='utf-8')
+
+    def _delete_batch(self, dataset_version_id, pre_signed, keys):
+        """Delete up to 1000 keys with a single DeleteObjects request
+
+        Falls back to deleting keys one by one if the storage provider
+        rejects the bulk request. Bulk deletes are not attempted again after that.
+        """
+        if self.bulk_delete_supported:
+            body = self._get_delete_objects_body(keys)
+            headers = {
+                'Content-Type': 'application/xml',
+                'Content-MD5': base64.b64encode(hashlib.md5(body).digest()).decode(),
+            }
+
+            url = pre_signed.url
+            session = http_client.session_pool.get_session(url)
             try:
-                r = session.delete(url)
-                cls.validate_s3_response(r)
+                r = session.post(url, data=body, headers=headers)
             except requests.exceptions.ConnectionError as e:
-                return cls.report_connection_error(e)
+                r = None
+                self.logger.debug('Bulk delete failed: %s' % e)
+
+            if r is not None and r.ok:
+                tree = ElementTree.fromstring(r.content)
+                failed_count = 0
+                for error in tree.iter('{' + S3_XMLNS + '}Error'):
+                    failed_count += 1
+                    self._add_failure(
+                        error.findtext('{' + S3_XMLNS + '}Key'),
+                        '%s: %s' % (error.findtext('{' + S3_XMLNS + '}Code'),
+                                    error.findtext('{' + S3_XMLNS + '}Message')),
+                    )
+                with self._failures_lock:
+                    self.bulk_deleted_count += len(keys) - failed_count
+                return
+
+            if r is not None:
+                self.logger.debug('Bulk delete not supported: %s %s' % (r.status_code, r.text))
+            self.bulk_delete_supported = False
+
+        self._delete_keys(dataset_version_id, keys)
+
+    def delete_keys(self, dataset_version_id, keys, pool):
+        """Queue deletes of given keys in the pool, in bulk if the storage provider supports it
+
+        :param str dataset_version_id:
+        :param list[str] keys:
+        :param WorkerPool pool:
+        """
+        for i in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[i:i + DELETE_BATCH_SIZE]
+
+            if self.bulk_delete_supported:
+                try:
+                    pre_signed = self.client.generate_pre_signed_s3_urls(
+                        dataset_version_id, calls=[self._get_delete_objects_call(batch)])[0]
+                except ResourceFetchingError as e:
+                    self.logger.debug('Bulk delete not supported: %s' % e)
+                    self.bulk_delete_supported = False
+                else:
+                    pool.put(self._delete_batch, dataset_version_id, pre_signed, batch)
+                    continue
+
+            # spread single deletes over all workers
+            step = int(math.ceil(float(len(batch)) / pool.worker_count))
+            for j in range(0, len(batch), step):
+                pool.put(self._delete_keys, dataset_version_id, batch[j:j + step])
+
+    def report_failures(self):
+        if not self.failures:
+            return
+
+        for key, reason in self.failures:
+            self.logger.error('Failed to delete {}: {}'.format(key, reason))
+        raise ApplicationError('Failed to delete {} files'.format(len(self.failures)))
+
+    def _list_delete_items(self, dataset_version_id, path):
+        if not path.endswith('/'):
+            result = self.get_object(dataset_version_id, path)
+            if result is not None:
+                yield result
+                return
+
+        for result in self.iter_objects(dataset_version_id, path=path):
+            yield result
+
+    def _list_delete_batches(self, dataset_version_id, path):
+        keys = []
+        for result in self._list_delete_items(dataset_version_id, path):
+            keys.append(result['key'])
+            if len(keys) == DELETE_BATCH_SIZE:
+                yield keys
+                keys = []
+
+        if keys:
+            yield keys
+
+    @staticmethod
+    def _get_delete_objects_call(keys):
+        return dict(method='deleteObjects', params=dict(
+            Delete=dict(Objects=[dict(Key=key) for key in keys], Quiet=True)))
+
+    def _delete_in_bulk(self, dataset_version_id, path, pool, update_status):
+        signer = PreSignedUrlSigner(self.client, dataset_version_id)
+
+        def submit(keys, pre_signed):
+            update_status()
+            pool.put(self._delete_batch, dataset_version_id, pre_signed, keys)
+
+        SigningPipeline(signer, batch_size=1).run(
+            self._list_delete_batches(dataset_version_id, path),
+            get_call=self._get_delete_objects_call,
+            submit=submit,
+            should_stop=pool.has_exception,
+        )
+
+    def _delete_one_by_one(self, dataset_version_id, path, pool, update_status):
+        signer = PreSignedUrlSigner(self.client, dataset_version_id)
+
+        def submit(item, pre_signed):
+            update_status()
+            pool.put(self._delete, pre_signed, key=item['key'])
+
+        SigningPipeline(signer).run(
+            self._list_delete_items(dataset_version_id, path),
+            get_call=lambda item: dict(method='deleteObject', params=dict(Key=item['key'])),
+            submit=submit,
+            should_stop=pool.has_exception,
+        )
 
     def execute(self, dataset_version_id, paths):
         self.assert_supported(dataset_version_id)
@@ -803,36 +2658,27 @@ class DeleteDatasetFilesCommand(BaseDatasetFilesCommand):
                 for path in paths:
                     path = self.normalize_path(path)
 
-                    list_objects = None
-                    has_trailing_slash = path.endswith('/')
-
                     def update_status():
                         status.text = '{}: {} ({})'.format(
-                            status_text, path, pool.completed_count())
-
-                    if not has_trailing_slash:
-                        result = self.get_object(dataset_version_id, path)
-                        if result is not None:
-                            list_objects = [([result], False)]
-
-                    if not list_objects:
-                        list_objects = self.list_objects(
-                            dataset_version_id=dataset_version_id,
-                            path=path,
-                            recursive=True,
-                            absolute=True,
-                        )
-
-                    for results, _ in list_objects:
-                        if not results:
-                            break
-
-                        pre_signeds = self.client.generate_pre_signed_s3_urls(
-                            dataset_version_id,
-                            calls=[dict(method='deleteObject', params=dict(
-                                Key=r['key'])) for r in results],
-                        )
-
-                        for pre_signed in pre_signeds:
-                            update_status()
-                            pool.put(self._delete, url=pre_signed.url)
+                            status_text, path, pool.get_progress())
+
+                    # deleting the whole version deletes shards as well
+                    if path != '/' and not datasets_shards.is_shard_key(path):
+                        self.remove_packed_files(
+                            dataset_version_id, lambda key: datasets_shards.is_under_path(key, path))
+
+                    if self.bulk_delete_supported:
+                        try:
+                            self._delete_in_bulk(dataset_version_id, path, pool, update_status)
+                            continue
+                        except ResourceFetchingError as e:
+                            # storage provider can't sign deleteObjects at all;
+                            # keys deleted so far won't be listed again
+                            if self.bulk_deleted_count:
+                                raise
+                            self.logger.debug('Bulk delete not supported: %s' % e)
+                            self.bulk_delete_supported = False
+
+                    self._delete_one_by_one(dataset_version_id, path, pool, update_status)
+
+        self.report_failures()
@@ -0,0 +1,529 @@
+import hashlib
+import os
+import sqlite3
+import threading
+
+from gradient.api_sdk.config import config
+
+UPLOAD_JOURNAL_FILE_NAME = "datasets_upload_journal.sqlite"
+HASH_CACHE_FILE_NAME = "datasets_hash_cache.sqlite"
+DOWNLOAD_JOURNAL_FILE_NAME = "datasets_download_journal.sqlite"
+LISTING_CACHE_FILE_NAME = "datasets_listing_cache.sqlite"
+HASH_READ_SIZE = 1024 * 1024
+
+
+def _connect(path, default_file_name):
+    if path is None:
+        path = os.path.join(config.CONFIG_DIR_PATH, default_file_name)
+
+    dir_path = os.path.dirname(path)
+    if dir_path:
+        os.makedirs(dir_path, exist_ok=True)
+
+    connection = sqlite3.connect(path, check_same_thread=False)
+    with connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+    return path, connection
+
+
+class UploadJournal(object):
+    """Persistent record of finished dataset uploads
+
+    Files are identified by dataset version, object key, size and
+    modification time so a file that changed since it was uploaded is
+    uploaded again. For multipart uploads the journal also keeps UploadId
+    and ETags of uploaded parts so an interrupted upload can be resumed.
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS objects (
+            dataset_version_id TEXT NOT NULL,
+            key TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            PRIMARY KEY (dataset_version_id, key, size, mtime)
+        )""",
+        """CREATE TABLE IF NOT EXISTS multipart_uploads (
+            dataset_version_id TEXT NOT NULL,
+            key TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            upload_id TEXT NOT NULL,
+            part_size INTEGER NOT NULL,
+            PRIMARY KEY (dataset_version_id, key, size, mtime)
+        )""",
+        """CREATE TABLE IF NOT EXISTS multipart_parts (
+            upload_id TEXT NOT NULL,
+            part_number INTEGER NOT NULL,
+            etag TEXT NOT NULL,
+            PRIMARY KEY (upload_id, part_number)
+        )""",
+    )
+
+    def __init__(self, path=None):
+        """
+        :param str path: path to the journal file. Defaults to a file in the config directory
+        """
+        # workers of the pool record their progress concurrently so the
+        # connection is shared between threads and guarded with a lock
+        self.path, self._connection = _connect(path, UPLOAD_JOURNAL_FILE_NAME)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+
+    @staticmethod
+    def get_file_signature(path):
+        """
+        :returns: size and modification time (in nanoseconds) of a local file
+        :rtype: tuple[int,int]
+        """
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def is_object_completed(self, dataset_version_id, key, size, mtime):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM objects WHERE dataset_version_id = ? AND key = ? AND size = ? AND mtime = ?",
+                (dataset_version_id, key, size, mtime),
+            ).fetchone()
+        return row is not None
+
+    def complete_object(self, dataset_version_id, key, size, mtime):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO objects (dataset_version_id, key, size, mtime) VALUES (?, ?, ?, ?)",
+                (dataset_version_id, key, size, mtime),
+            )
+            self._delete_multipart_upload(dataset_version_id, key)
+
+    def get_multipart_upload(self, dataset_version_id, key, size, mtime):
+        """
+        :returns: UploadId, part size and ETags of uploaded parts or None if there is no upload to resume
+        :rtype: tuple[str,int,dict[int,str]]|None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT upload_id, part_size FROM multipart_uploads "
+                "WHERE dataset_version_id = ? AND key = ? AND size = ? AND mtime = ?",
+                (dataset_version_id, key, size, mtime),
+            ).fetchone()
+            if row is None:
+                return None
+
+            upload_id, part_size = row
+            etags = dict(self._connection.execute(
+                "SELECT part_number, etag FROM multipart_parts WHERE upload_id = ?",
+                (upload_id,),
+            ).fetchall())
+
+        return upload_id, part_size, etags
+
+    def start_multipart_upload(self, dataset_version_id, key, size, mtime, upload_id, part_size):
+        with self._lock, self._connection:
+            # file could have changed since previous attempt; stale upload is not resumable anymore
+            self._delete_multipart_upload(dataset_version_id, key)
+            self._connection.execute(
+                "INSERT INTO multipart_uploads (dataset_version_id, key, size, mtime, upload_id, part_size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (dataset_version_id, key, size, mtime, upload_id, part_size),
+            )
+
+    def complete_part(self, upload_id, part_number, etag):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO multipart_parts (upload_id, part_number, etag) VALUES (?, ?, ?)",
+                (upload_id, part_number, etag),
+            )
+
+    def abandon_multipart_upload(self, dataset_version_id, key):
+        with self._lock, self._connection:
+            self._delete_multipart_upload(dataset_version_id, key)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _delete_multipart_upload(self, dataset_version_id, key):
+        self._connection.execute(
+            "DELETE FROM multipart_parts WHERE upload_id IN ("
+            "SELECT upload_id FROM multipart_uploads WHERE dataset_version_id = ? AND key = ?)",
+            (dataset_version_id, key),
+        )
+        self._connection.execute(
+            "DELETE FROM multipart_uploads WHERE dataset_version_id = ? AND key = ?",
+            (dataset_version_id, key),
+        )
+
+
+class EtagHasher(object):
+    def __init__(self, part_size=None):
+        """Computes S3-compatible ETag of content fed to it in order
+
+        :param int part_size: part size of a multipart upload or None if content is uploaded with a single request
+        """
+        self.part_size = part_size or None
+        self.digests = []
+
+        self._md5 = hashlib.md5()
+        self._part_remaining = self.part_size
+
+    def update(self, data):
+        if not self.part_size:
+            self._md5.update(data)
+            return
+
+        view = memoryview(data)
+        while view:
+            length = min(len(view), self._part_remaining)
+            self._md5.update(view[:length])
+            view = view[length:]
+            self._part_remaining -= length
+            if not self._part_remaining:
+                self.digests.append(self._md5.digest())
+                self._md5 = hashlib.md5()
+                self._part_remaining = self.part_size
+
+    def get_part_digests(self):
+        """
+        :returns: MD5 digests of all parts fed so far, including the last unfinished one
+        :rtype: list[bytes]
+        """
+        if self._part_remaining == self.part_size:
+            return list(self.digests)
+        return self.digests + [self._md5.digest()]
+
+    def hexdigest(self):
+        if not self.part_size:
+            return self._md5.hexdigest()
+        return self.combine(self.get_part_digests())
+
+    @staticmethod
+    def combine(digests):
+        """
+        :param list[bytes] digests: MD5 digests of parts in order
+        :returns: ETag of a multipart upload made of the parts
+        :rtype: str
+        """
+        return '{}-{}'.format(hashlib.md5(b''.join(digests)).hexdigest(), len(digests))
+
+
+class FileHashCache(object):
+    """Cache of S3-compatible ETags of local files
+
+    Hashing a big tree takes long so ETags are kept between runs. Entries are
+    identified by device and inode and are valid as long as size and
+    modification time of the file did not change.
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS hashes (
+            device INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            part_size INTEGER NOT NULL,
+            etag TEXT NOT NULL,
+            PRIMARY KEY (device, inode)
+        )""",
+        """CREATE TABLE IF NOT EXISTS uploads (
+            device INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            etag TEXT NOT NULL,
+            PRIMARY KEY (device, inode, etag)
+        )""",
+    )
+
+    def __init__(self, path=None):
+        """
+        :param str path: path to the cache file. Defaults to a file in the config directory
+        """
+        self.path, self._connection = _connect(path, HASH_CACHE_FILE_NAME)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+
+    def get_etag(self, path, part_size=None):
+        """Get ETag S3 would return for the file if it was uploaded in parts of part_size
+
+        :param str path: local file path
+        :param int part_size: part size of a multipart upload or None if file is uploaded with a single request
+        :rtype: str
+        """
+        stat = os.stat(path)
+        part_size = part_size or 0
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag FROM hashes WHERE device = ? AND inode = ? AND size = ? AND mtime = ? AND part_size = ?",
+                (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, part_size),
+            ).fetchone()
+        if row is not None:
+            return row[0]
+
+        etag = self.compute_etag(path, part_size)
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO hashes (device, inode, size, mtime, part_size, etag) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, part_size, etag),
+            )
+
+        return etag
+
+    def record_upload(self, path, etag):
+        """Remember ETag the storage returned for an upload of the file
+
+        Objects encrypted with SSE-KMS and objects of some S3 compatible
+        stores have ETags that are not MD5 of the content, such objects can
+        only be compared with the files they were uploaded from.
+
+        :param str path: local file path
+        :param str etag: ETag of the uploaded object
+        """
+        stat = os.stat(path)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO uploads (device, inode, size, mtime, etag) VALUES (?, ?, ?, ?, ?)",
+                (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, etag),
+            )
+
+    def is_uploaded(self, path, etag):
+        """Check if object with given ETag was uploaded from the file and the file did not change since
+
+        :param str path: local file path
+        :param str etag: ETag of the remote object
+        :rtype: bool
+        """
+        stat = os.stat(path)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM uploads WHERE device = ? AND inode = ? AND size = ? AND mtime = ? AND etag = ?",
+                (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, etag),
+            ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def compute_etag(path, part_size=None):
+        """Compute ETag of a file: MD5 of its content or, for multipart uploads,
+        MD5 of concatenated part digests followed by the number of parts
+
+        :param str path: local file path
+        :param int part_size: part size of a multipart upload or None if file is uploaded with a single request
+        :rtype: str
+        """
+        hasher = EtagHasher(part_size)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_READ_SIZE), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class DownloadJournal(object):
+    """Persistent record of downloaded dataset files
+
+    Keeps size and modification time of every downloaded file together with
+    ETag of the object it was downloaded from. A file that was not modified
+    since does not have to be downloaded again as long as the ETag of the
+    remote object is the same.
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS files (
+            path TEXT NOT NULL PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            etag TEXT
+        )""",
+    )
+
+    def __init__(self, path=None):
+        """
+        :param str path: path to the journal file. Defaults to a file in the config directory
+        """
+        self.path, self._connection = _connect(path, DOWNLOAD_JOURNAL_FILE_NAME)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+
+    def is_unchanged(self, path, size, etag=None):
+        """Check if local file is the same as it was after downloading object with given size and ETag
+
+        :param str path: absolute local file path
+        :param int size: remote object size
+        :param str etag: remote object ETag
+        :rtype: bool
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        if stat.st_size != size:
+            return False
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag FROM files WHERE path = ? AND size = ? AND mtime = ?",
+                (path, stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+
+        return row is not None and row[0] == etag
+
+    def complete_download(self, path, etag=None):
+        stat = os.stat(path)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime, etag) VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, etag),
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class ListingCache(object):
+    """Local copy of listings of committed dataset versions
+
+    Committed versions can not change, so once a prefix of a version was
+    listed completely, its objects are served from the cache. Keys and
+    prefixes are relative to the version root, without a leading slash, and
+    kept in an index, so listing a prefix is a range scan.
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS committed_versions (
+            dataset_version_id TEXT NOT NULL PRIMARY KEY
+        )""",
+        """CREATE TABLE IF NOT EXISTS listed_prefixes (
+            dataset_version_id TEXT NOT NULL,
+            prefix TEXT NOT NULL,
+            PRIMARY KEY (dataset_version_id, prefix)
+        )""",
+        """CREATE TABLE IF NOT EXISTS objects (
+            dataset_version_id TEXT NOT NULL,
+            key TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            etag TEXT,
+            PRIMARY KEY (dataset_version_id, key)
+        ) WITHOUT ROWID""",
+    )
+    FETCH_SIZE = 1000
+
+    def __init__(self, path=None):
+        """
+        :param str path: path to the cache file. Defaults to a file in the config directory
+        """
+        self.path, self._connection = _connect(path, LISTING_CACHE_FILE_NAME)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+
+    @staticmethod
+    def exists(path=None):
+        return os.path.isfile(path or os.path.join(config.CONFIG_DIR_PATH, LISTING_CACHE_FILE_NAME))
+
+    def is_committed(self, dataset_version_id):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM committed_versions WHERE dataset_version_id = ?",
+                (dataset_version_id,),
+            ).fetchone()
+        return row is not None
+
+    def set_committed(self, dataset_version_id):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO committed_versions (dataset_version_id) VALUES (?)",
+                (dataset_version_id,),
+            )
+
+    def is_listed(self, dataset_version_id, prefix):
+        """Check if prefix or one of its parents was listed completely
+
+        :param str dataset_version_id:
+        :param str prefix: key prefix, empty for the whole version
+        :rtype: bool
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT prefix FROM listed_prefixes WHERE dataset_version_id = ?",
+                (dataset_version_id,),
+            ).fetchall()
+        return any(prefix.startswith(listed_prefix) for listed_prefix, in rows)
+
+    def add_objects(self, dataset_version_id, objects):
+        """
+        :param list[dict] objects: objects with key relative to the version root, size and etag
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO objects (dataset_version_id, key, size, etag) VALUES (?, ?, ?, ?)",
+                [(dataset_version_id, o['key'], int(o.get('size') or 0), o.get('etag')) for o in objects],
+            )
+
+    def set_listed(self, dataset_version_id, prefix):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO listed_prefixes (dataset_version_id, prefix) VALUES (?, ?)",
+                (dataset_version_id, prefix),
+            )
+
+    def iter_objects(self, dataset_version_id, prefix):
+        """
+        :param str dataset_version_id:
+        :param str prefix: key prefix, empty for the whole version
+        :returns: objects with keys starting with prefix, sorted by key
+        :rtype: collections.Iterator[dict]
+        """
+        # every key starting with prefix sorts before prefix with its last character incremented
+        upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else None
+
+        last_key = None
+        while True:
+            query = "SELECT key, size, etag FROM objects WHERE dataset_version_id = ?"
+            params = [dataset_version_id]
+            if last_key is None:
+                query += " AND key >= ?"
+                params.append(prefix)
+            else:
+                query += " AND key > ?"
+                params.append(last_key)
+            if upper_bound is not None:
+                query += " AND key < ?"
+                params.append(upper_bound)
+            query += " ORDER BY key LIMIT ?"
+            params.append(self.FETCH_SIZE)
+
+            with self._lock:
+                rows = self._connection.execute(query, params).fetchall()
+
+            for key, size, etag in rows:
+                result = {'key': key, 'size': str(size)}
+                if etag:
+                    result['etag'] = etag
+                yield result
+
+            if len(rows) < self.FETCH_SIZE:
+                return
+            last_key = rows[-1][0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,86 @@
+import hashlib
+import json
+
+MANIFEST_VERSION = 1
+HASH_READ_SIZE = 1024 * 1024
+
+
+def write_manifest(f, dataset_version_id, objects):
+    """Write manifest of a dataset version as newline delimited JSON
+
+    The first line is a header, every following line describes one object
+    with its key, size, ETag and optionally SHA-256 of its content.
+
+    :param f: text file open for writing
+    :param str dataset_version_id:
+    :param collections.Iterable[dict] objects: objects with key (relative to the dataset root), size and etag
+    :returns: number of written objects
+    :rtype: int
+    """
+    header = {'version': MANIFEST_VERSION, 'datasetVersionId': dataset_version_id}
+    f.write(json.dumps(header, separators=(',', ':')) + '\n')
+
+    count = 0
+    for obj in objects:
+        entry = {'key': obj['key'], 'size': int(obj.get('size') or 0)}
+        for name in ('etag', 'sha256'):
+            if obj.get(name):
+                entry[name] = obj[name]
+        f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        count += 1
+    return count
+
+
+def read_manifest(f):
+    """
+    :param f: text file open for reading
+    :returns: dataset version ID and objects described in the manifest
+    :rtype: tuple[str,list[dict]]
+    """
+    header = json.loads(f.readline() or 'null')
+    if not isinstance(header, dict) or header.get('version') != MANIFEST_VERSION:
+        raise ValueError('Unsupported dataset version manifest')
+
+    objects = []
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        entry = json.loads(line)
+        objects.append({
+            'key': entry['key'],
+            'size': int(entry['size']),
+            'etag': entry.get('etag'),
+            'sha256': entry.get('sha256'),
+        })
+    return header['datasetVersionId'], objects
+
+
+def find_objects(objects, source_path):
+    """Find manifest objects that a source path of a download refers to
+
+    :param list[dict] objects: objects of the manifest
+    :param str source_path: normalized dataset path of a file or directory
+    :returns: objects found and whether source path is a single file
+    :rtype: tuple[list[dict],bool]
+    """
+    key = source_path.lstrip('/')
+    if not source_path.endswith('/'):
+        for obj in objects:
+            if obj['key'] == key:
+                return [dict(obj)], True
+
+    dir_prefix = key if not key or key.endswith('/') else key + '/'
+    return [dict(obj) for obj in objects if obj['key'].startswith(dir_prefix)], False
+
+
+def compute_sha256(path):
+    """
+    :param str path: local file path
+    :rtype: str
+    """
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_READ_SIZE), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
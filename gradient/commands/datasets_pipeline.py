@@ -0,0 +1,319 @@
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+SIGN_BATCH_SIZE = 1000
+SIGN_REFRESH_MARGIN = 60  # seconds
+QUEUE_TIMEOUT = 1  # seconds
+LIST_CONCURRENCY = 8
+LIST_QUEUE_SIZE = 10000
+
+_END = object()
+
+
+class PreSignedUrl(object):
+    def __init__(self, signer, call, url, expires_at=None):
+        """Pre-signed URL that is signed again when it is about to expire
+
+        Work can sit in the pool queue for a long time and ranged downloads
+        reuse the URL for many requests, so the URL is read right before
+        every request.
+
+        :param PreSignedUrlSigner signer:
+        :param dict call: S3 call the URL was signed for
+        :param str url:
+        :param float expires_at: timestamp the URL expires at, None if it never expires
+        """
+        self.signer = signer
+        self.call = call
+        self.expires_at = expires_at
+
+        self._url = url
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        with self._lock:
+            if self.expires_at is not None and time.time() >= self.expires_at - self.signer.refresh_margin:
+                self._url, self.expires_at = self.signer.sign_call(self.call)
+            return self._url
+
+
+class PreSignedUrlSigner(object):
+    def __init__(self, client, dataset_version_id, refresh_margin=SIGN_REFRESH_MARGIN):
+        """
+        :param DatasetVersionsClient client:
+        :param str dataset_version_id:
+        :param float refresh_margin: URLs expiring sooner than this many seconds are signed again before use
+        """
+        self.client = client
+        self.dataset_version_id = dataset_version_id
+        self.refresh_margin = refresh_margin
+
+    def sign(self, calls):
+        """
+        :param list[dict] calls: S3 calls
+        :rtype: list[PreSignedUrl]
+        """
+        pre_signeds = self.client.generate_pre_signed_s3_urls(self.dataset_version_id, calls=calls)
+        now = time.time()
+        return [PreSignedUrl(self, call, pre_signed.url, self._get_expires_at(now, pre_signed))
+                for call, pre_signed in zip(calls, pre_signeds)]
+
+    def sign_call(self, call):
+        """
+        :param dict call: S3 call
+        :returns: URL and timestamp it expires at
+        :rtype: tuple[str,float|None]
+        """
+        pre_signed = self.client.generate_pre_signed_s3_urls(self.dataset_version_id, calls=[call])[0]
+        return pre_signed.url, self._get_expires_at(time.time(), pre_signed)
+
+    @staticmethod
+    def _get_expires_at(now, pre_signed):
+        if not pre_signed.expires_in:
+            return None
+        return now + pre_signed.expires_in
+
+
+class SigningPipeline(object):
+    def __init__(self, signer, batch_size=SIGN_BATCH_SIZE, queue_size=None):
+        """Streams items through listing, signing and transfer stages running at the same time
+
+        Lister thread reads items, signer thread batches them into large
+        preSignedUrls calls and the calling thread hands signed items over to
+        the transfer pool. Stages are connected with bounded queues so none of
+        them runs far ahead of the others and the pool always has work queued.
+
+        :param PreSignedUrlSigner signer:
+        :param int batch_size: maximum number of calls signed with a single request
+        :param int queue_size: capacity of queues between stages. Defaults to two batches
+        """
+        self.signer = signer
+        self.batch_size = batch_size
+        self.queue_size = queue_size or batch_size * 2
+
+        self._stopped = threading.Event()
+        self._exception = None
+        self._exception_lock = threading.Lock()
+
+    def run(self, items, get_call, submit, should_stop=None):
+        """
+        :param collections.Iterable items: items to process; iterated in the lister thread
+        :param callable get_call: returns S3 call dict for an item
+        :param callable submit: called with an item and its PreSignedUrl, usually queues the transfer
+        :param callable should_stop: returns True when processing should be stopped early,
+            for example after a transfer failed
+        """
+        listed = queue.Queue(maxsize=self.queue_size)
+        signed = queue.Queue(maxsize=self.queue_size)
+
+        threads = [
+            threading.Thread(target=self._list, args=(items, listed)),
+            threading.Thread(target=self._sign, args=(listed, signed, get_call)),
+        ]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            while not self._stopped.is_set():
+                if should_stop is not None and should_stop():
+                    break
+
+                try:
+                    work = signed.get(timeout=QUEUE_TIMEOUT)
+                except queue.Empty:
+                    continue
+
+                if work is _END:
+                    break
+
+                submit(*work)
+        finally:
+            self._stopped.set()
+            for thread in threads:
+                thread.join()
+
+        if self._exception is not None:
+            raise self._exception
+
+    def _put(self, q, item):
+        while not self._stopped.is_set():
+            try:
+                return q.put(item, timeout=QUEUE_TIMEOUT)
+            except queue.Full:
+                pass
+
+    def _get_batch(self, q):
+        """Wait for at least one item, then take whatever else is already queued up to the batch size"""
+        batch = []
+        while not self._stopped.is_set():
+            try:
+                item = q.get(timeout=QUEUE_TIMEOUT)
+            except queue.Empty:
+                continue
+
+            while True:
+                if item is _END:
+                    return batch, True
+
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    return batch, False
+
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    return batch, False
+
+        return batch, True
+
+    def _list(self, items, listed):
+        try:
+            for item in items:
+                if self._stopped.is_set():
+                    return
+                self._put(listed, item)
+        except Exception as e:
+            self._set_exception(e)
+        finally:
+            self._put(listed, _END)
+
+    def _sign(self, listed, signed, get_call):
+        try:
+            done = False
+            while not done and not self._stopped.is_set():
+                batch, done = self._get_batch(listed)
+                if not batch:
+                    continue
+
+                pre_signeds = self.signer.sign([get_call(item) for item in batch])
+                for work in zip(batch, pre_signeds):
+                    self._put(signed, work)
+        except Exception as e:
+            self._set_exception(e)
+        finally:
+            self._put(signed, _END)
+
+    def _set_exception(self, exception):
+        with self._exception_lock:
+            if self._exception is None:
+                self._exception = exception
+        self._stopped.set()
+
+
+class PrefixLister(object):
+    def __init__(self, list_page, concurrency=LIST_CONCURRENCY, queue_size=LIST_QUEUE_SIZE):
+        """Lists all objects under a prefix with many listing requests running at the same time
+
+        Every prefix is listed with a delimiter, so its response also names
+        the "subdirectories" of the prefix which are then listed by other
+        threads. Listed objects are merged into a single unordered stream.
+        The stream is backed by a bounded queue, so listing pauses while the
+        consumer falls behind.
+
+        :param callable list_page: called with a prefix and a continuation token (None for the first page);
+            returns listed objects, common prefixes and the next continuation token
+        :param int concurrency: number of prefixes listed at the same time
+        :param int queue_size: number of listed objects waiting for the consumer
+        """
+        self.list_page = list_page
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+
+        self._stopped = threading.Event()
+        self._exception = None
+        self._exception_lock = threading.Lock()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def iter_objects(self, prefix):
+        """
+        :param str prefix:
+        :rtype: collections.Iterator[dict]
+        """
+        prefixes = queue.Queue()
+        results = queue.Queue(maxsize=self.queue_size)
+
+        self._pending = 1
+        prefixes.put(prefix)
+
+        threads = [threading.Thread(target=self._list, args=(prefixes, results)) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            while True:
+                try:
+                    result = results.get(timeout=QUEUE_TIMEOUT)
+                except queue.Empty:
+                    if self._stopped.is_set():
+                        break
+                    continue
+
+                if result is _END:
+                    break
+                yield result
+        finally:
+            self._stopped.set()
+            # wake up threads waiting for prefixes
+            for _ in threads:
+                prefixes.put(_END)
+            for thread in threads:
+                thread.join()
+
+        if self._exception is not None:
+            raise self._exception
+
+    def _put(self, q, item):
+        while not self._stopped.is_set():
+            try:
+                return q.put(item, timeout=QUEUE_TIMEOUT)
+            except queue.Full:
+                pass
+
+    def _list(self, prefixes, results):
+        try:
+            while not self._stopped.is_set():
+                prefix = prefixes.get()
+                if prefix is _END:
+                    return
+
+                self._list_prefix(prefix, prefixes, results)
+
+                with self._lock:
+                    self._pending -= 1
+                    done = self._pending == 0
+                if done:
+                    self._put(results, _END)
+                    return
+        except Exception as e:
+            self._set_exception(e)
+
+    def _list_prefix(self, prefix, prefixes, results):
+        continuation_token = None
+        while not self._stopped.is_set():
+            objects, common_prefixes, continuation_token = self.list_page(prefix, continuation_token)
+
+            with self._lock:
+                self._pending += len(common_prefixes)
+            for common_prefix in common_prefixes:
+                prefixes.put(common_prefix)
+
+            for result in objects:
+                self._put(results, result)
+
+            if not continuation_token:
+                return
+
+    def _set_exception(self, exception):
+        with self._exception_lock:
+            if self._exception is None:
+                self._exception = exception
+        self._stopped.set()
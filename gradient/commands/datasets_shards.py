@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import tarfile
+
+SHARDS_PREFIX = '.shards/'
+MANIFEST_NAME = 'index.json'
+MANIFEST_VERSION = 1
+
+TAR_BLOCK_SIZE = tarfile.BLOCKSIZE
+TAR_END_SIZE = 2 * TAR_BLOCK_SIZE
+READ_SIZE = 1024 * 1024
+
+
+def is_shard_key(key):
+    """
+    :param str key: object key, with or without leading slash
+    :rtype: bool
+    """
+    return key.lstrip('/').startswith(SHARDS_PREFIX)
+
+
+def is_under_path(key, path):
+    """Check if packed file is the dataset path itself or lies under it
+
+    :param str key: key of the packed file, relative to the version root
+    :param str path: dataset path; paths ending with a slash are directories
+    :rtype: bool
+    """
+    path = path.lstrip('/')
+    if not path:
+        return True
+    if path.endswith('/'):
+        return key.startswith(path)
+    return key == path or key.startswith(path + '/')
+
+
+class ChunksReader(object):
+    def __init__(self, chunks, length=None):
+        """File-like object reading from an iterable of byte strings
+
+        requests reads the len attribute to send Content-Length instead of
+        chunked transfer encoding. It is not __len__ so empty readers are
+        not falsy when passed as fileobj.
+
+        :param collections.Iterable[bytes] chunks:
+        :param int length: total number of bytes, if known
+        """
+        self._chunks = iter(chunks)
+        self._chunk = b''
+        self._position = 0
+        self.len = length
+
+    def read(self, size=-1):
+        parts = []
+        remaining = size
+        while remaining != 0:
+            if self._position >= len(self._chunk):
+                try:
+                    self._chunk = next(self._chunks)
+                except StopIteration:
+                    break
+                self._position = 0
+                continue
+
+            end = len(self._chunk) if remaining < 0 else min(len(self._chunk), self._position + remaining)
+            parts.append(self._chunk[self._position:end])
+            if remaining > 0:
+                remaining -= end - self._position
+            self._position = end
+
+        return b''.join(parts)
+
+
+class TarShard(object):
+    def __init__(self, key):
+        """Uncompressed tar archive of small files that is built while it is uploaded
+
+        Size of the archive and offsets of all members are known before any
+        file is read, so the archive can be streamed straight from the
+        original files with a single PUT.
+
+        :param str key: object key of the shard
+        """
+        self.key = key
+        self.files = []
+        self.size = TAR_END_SIZE
+
+    def add(self, path, key, size, mtime=None):
+        """
+        :param str path: local file path
+        :param str key: dataset key of the file
+        :param int size: file size in bytes
+        :param float mtime: modification time in seconds
+        """
+        header = self._get_header(key, size, mtime)
+        offset = self.size - TAR_END_SIZE
+        self.files.append(dict(path=path, key=key.lstrip('/'), size=size, header=header,
+                               offset=offset + len(header)))
+        self.size += len(header) + self._get_padded_size(size)
+
+    def open(self):
+        """
+        :returns: file-like object with content of the archive
+        :rtype: ChunksReader
+        """
+        return ChunksReader(self._iter_chunks(), length=self.size)
+
+    def get_manifest_entry(self):
+        """
+        :returns: entry of the shard in the manifest, files have their MD5 in etag once the shard was read
+        :rtype: dict
+        """
+        files = []
+        for f in self.files:
+            entry = {'key': f['key'], 'size': f['size'], 'offset': f['offset']}
+            if 'etag' in f:
+                entry['etag'] = f['etag']
+            files.append(entry)
+        return {'key': self.key.lstrip('/'), 'size': self.size, 'files': files}
+
+    def _iter_chunks(self):
+        for f in self.files:
+            yield f['header']
+
+            remaining = f['size']
+            md5 = hashlib.md5()
+            with open(f['path'], 'rb') as fp:
+                while remaining:
+                    chunk = fp.read(min(READ_SIZE, remaining))
+                    if not chunk:
+                        raise IOError('%s changed while it was uploaded' % f['path'])
+                    remaining -= len(chunk)
+                    md5.update(chunk)
+                    yield chunk
+            # same as ETag of the file uploaded on its own, so sync can compare packed files
+            f['etag'] = md5.hexdigest()
+
+            padding = self._get_padded_size(f['size']) - f['size']
+            if padding:
+                yield b'\0' * padding
+
+        yield b'\0' * TAR_END_SIZE
+
+    @staticmethod
+    def _get_header(key, size, mtime):
+        info = tarfile.TarInfo(key.lstrip('/'))
+        info.size = size
+        info.mtime = int(mtime or 0)
+        info.mode = 0o644
+        return info.tobuf(format=tarfile.PAX_FORMAT, encoding='utf-8', errors='surrogateescape')
+
+    @staticmethod
+    def _get_padded_size(size):
+        blocks, remainder = divmod(size, TAR_BLOCK_SIZE)
+        if remainder:
+            blocks += 1
+        return blocks * TAR_BLOCK_SIZE
+
+
+def dump_manifest(shards):
+    """
+    :param list[TarShard|dict] shards: shards or their manifest entries
+    :rtype: bytes
+    """
+    entries = [shard if isinstance(shard, dict) else shard.get_manifest_entry() for shard in shards]
+    manifest = {'version': MANIFEST_VERSION, 'shards': entries}
+    return json.dumps(manifest).encode('utf-8')
+
+
+def load_manifest(content):
+    """
+    :param bytes|str content:
+    :returns: shards described in the manifest
+    :rtype: list[dict]
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8')
+    manifest = json.loads(content)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError('Unsupported shard manifest version: %s' % manifest.get('version'))
+    return manifest['shards']
+
+
+def remove_files(shards, should_remove):
+    """Drop packed files from manifest entries of shards
+
+    Content of dropped files stays in their shard, it is just not listed anymore.
+
+    :param list[dict] shards: shards as returned by load_manifest
+    :param callable should_remove: called with the key of every packed file
+    :returns: shards that still have some files, keys of shards left without files and number of dropped files
+    :rtype: tuple[list[dict],list[str],int]
+    """
+    kept_shards = []
+    emptied_keys = []
+    removed_count = 0
+    for shard in shards:
+        files = [f for f in shard['files'] if not should_remove(f['key'])]
+        removed_count += len(shard['files']) - len(files)
+        if files:
+            kept_shards.append(dict(shard, files=files))
+        else:
+            emptied_keys.append(shard['key'])
+
+    return kept_shards, emptied_keys, removed_count
+
+
+def extract_members(fileobj, paths):
+    """Extract files from a tar stream
+
+    :param fileobj: file-like object with the archive
+    :param dict[str,str] paths: local paths by member name; other members are skipped
+    :returns: local paths of extracted files
+    :rtype: list[str]
+    """
+    extracted = []
+    with tarfile.open(fileobj=fileobj, mode='r|') as tar:
+        for member in tar:
+            path = paths.get(member.name)
+            if path is None or not member.isfile():
+                continue
+
+            dir_path = os.path.dirname(path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+
+            tmp_path = path + '.tmp'
+            source = tar.extractfile(member)
+            with open(tmp_path, 'wb') as f:
+                for chunk in iter(lambda: source.read(READ_SIZE), b''):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+            extracted.append(path)
+
+    return extracted
@@ -9,6 +9,7 @@ from click import style
 
 from gradient import api_sdk, exceptions
 from gradient.api_sdk import sdk_exceptions
+from gradient.api_sdk.request_memo import RequestMemo
 from gradient.cli_constants import CLI_PS_CLIENT_NAME
 from gradient.cliutils import get_terminal_lines
 from gradient.commands.common import BaseCommand, ListCommandMixin, DetailsCommandMixin, StreamMetricsCommand, \
@@ -22,6 +23,8 @@ class BaseNotebookCommand(BaseCommand):
             api_key=api_key,
             logger=logger,
             ps_client_name=CLI_PS_CLIENT_NAME,
+            # notebook is fetched again e.g. to find its metrics API or when metrics stream reconnects
+            memo=RequestMemo(),
         )
         return client
 
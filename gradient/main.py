@@ -3,5 +3,5 @@ from gradient.cli.cli import cli as _cli_entry_point
 
 
 def main():
-    version_checker.GradientVersionChecker.look_for_new_version_with_timeout()
+    version_checker.GradientVersionChecker.look_for_new_version_in_background()
     _cli_entry_point()
@@ -1,10 +1,14 @@
+import json
 import os
+import socket
+import subprocess
 import sys
+import time
 from platform import system
 
 import six
-from distutils.version import StrictVersion
 
+from gradient.api_sdk.config import config
 from gradient.clilogger import CliLogger
 from gradient.version import version
 
@@ -15,6 +19,11 @@ else:
 
 logger = CliLogger()
 
+VERSION_CHECK_CACHE_FILE_NAME = "version_check.json"
+# do not start another refresh while previous one may still be running
+VERSION_CHECK_RETRY_INTERVAL = 5 * 60
+VERSION_CHECK_TIMEOUT = 10
+
 
 class PackageNotFoundError(Exception):
     pass
@@ -24,9 +33,16 @@ class VersionChecker(object):
     def is_up_to_date(self, module_name, current_version):
         version_in_repository = self.get_version_from_repository(module_name)
 
-        up_to_date = StrictVersion(current_version) >= StrictVersion(version_in_repository)
+        up_to_date = self.is_version_up_to_date(current_version, version_in_repository)
         return up_to_date, version_in_repository
 
+    @staticmethod
+    def is_version_up_to_date(current_version, latest_version):
+        # distutils pulls in setuptools, which is slow to import and only needed here
+        from distutils.version import StrictVersion
+
+        return StrictVersion(current_version) >= StrictVersion(latest_version)
+
     def get_version_from_repository(self, module_name, repository_url="http://pypi.python.org/pypi"):
         pypi = xmlrpclib.ServerProxy(repository_url)
         versions = pypi.package_releases(module_name)
@@ -74,10 +90,112 @@ class GradientVersionChecker(object):
             return
 
         if not up_to_date:
-            msg = "Warning: this version of the Gradient CLI ({current_version}) is out of date. " \
-                  "Some functionality might not be supported until you upgrade. \n\n" \
-                  "Run `pip install -U gradient` to upgrade\n".format(current_version=version)
-            logger.warning(msg)
+            GradientVersionChecker._warn_about_new_version()
+
+    @classmethod
+    def look_for_new_version_in_background(cls):
+        """Warn about new version using cached result of the last check
+
+        The cache is refreshed by a detached process when it is older than
+        config.VERSION_CHECK_INTERVAL, so the check never delays the command.
+        """
+        if not cls._should_check_version():
+            return
+
+        cache = cls._read_cache()
+        latest_version = cache.get("latestVersion")
+        if latest_version:
+            try:
+                up_to_date = VersionChecker.is_version_up_to_date(version, latest_version)
+            except ValueError as e:
+                logger.debug(e)
+            else:
+                if not up_to_date:
+                    cls._warn_about_new_version()
+
+        now = time.time()
+        if now - cache.get("checkedAt", 0) < config.VERSION_CHECK_INTERVAL:
+            return
+        if now - cache.get("attemptedAt", 0) < VERSION_CHECK_RETRY_INTERVAL:
+            return
+
+        cache["attemptedAt"] = now
+        cls._write_cache(cache)
+        cls._start_cache_refresh()
+
+    @classmethod
+    def refresh_cache(cls):
+        """Get latest version from the repository and save it in the cache"""
+        socket.setdefaulttimeout(VERSION_CHECK_TIMEOUT)
+        try:
+            latest_version = VersionChecker().get_version_from_repository("gradient")
+        except Exception as e:
+            logger.debug(e)
+            return
+
+        cache = cls._read_cache()
+        cache.update(checkedAt=time.time(), latestVersion=latest_version)
+        cls._write_cache(cache)
+
+    @staticmethod
+    def _warn_about_new_version():
+        msg = "Warning: this version of the Gradient CLI ({current_version}) is out of date. " \
+              "Some functionality might not be supported until you upgrade. \n\n" \
+              "Run `pip install -U gradient` to upgrade\n".format(current_version=version)
+        logger.warning(msg)
+
+    @staticmethod
+    def _get_cache_path():
+        return os.path.join(config.CONFIG_DIR_PATH, VERSION_CHECK_CACHE_FILE_NAME)
+
+    @classmethod
+    def _read_cache(cls):
+        try:
+            with open(cls._get_cache_path()) as f:
+                cache = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        if not isinstance(cache, dict):
+            return {}
+        return cache
+
+    @classmethod
+    def _write_cache(cls, cache):
+        path = cls._get_cache_path()
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            if not os.path.isdir(config.CONFIG_DIR_PATH):
+                os.makedirs(config.CONFIG_DIR_PATH)
+            with open(tmp_path, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, path)
+        except (IOError, OSError) as e:
+            logger.debug(e)
+
+    @staticmethod
+    def _start_cache_refresh():
+        if not sys.executable:
+            return
+
+        kwargs = {}
+        if system() == "Windows":
+            kwargs["creationflags"] = getattr(subprocess, "DETACHED_PROCESS", 0x8)
+        else:
+            kwargs["start_new_session"] = True
+
+        try:
+            with open(os.devnull, "r+b") as devnull:
+                subprocess.Popen(
+                    [sys.executable, "-m", "gradient.version_checker"],
+                    stdin=devnull,
+                    stdout=devnull,
+                    stderr=devnull,
+                    close_fds=True,
+                    **kwargs
+                )
+        except (IOError, OSError) as e:
+            logger.debug(e)
 
     @staticmethod
     def _should_check_version():
@@ -89,3 +207,7 @@ class GradientVersionChecker(object):
             return False
 
         return True
+
+
+if __name__ == "__main__":
+    GradientVersionChecker.refresh_cache()
@@ -19,3 +19,19 @@ class MockResponse:
         if self.json_data is None:
             raise ValueError("No JSON")
         return self.json_data
+
+
+class MockStreamResponse(MockResponse):
+    def __init__(self, data, status_code=200, headers=None):
+        super(MockStreamResponse, self).__init__(status_code=status_code, content=data, headers=headers)
+        self.text = ""
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
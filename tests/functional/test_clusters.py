@@ -50,7 +50,7 @@ Do you want to continue? [y/N]:
 Aborted!
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_list_of_clusters(self, get_patched):
         get_patched.return_value = MockResponse(self.LIST_CLUSTERS)
 
@@ -63,7 +63,7 @@ Aborted!
                                             json=None,
                                             params=self.DEFAULT_PARAMS)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_paginate_list_of_clusters(self, get_patched):
         get_patched.return_value = MockResponse(self.LIMITED_LIST_CLUSTERS)
 
@@ -76,7 +76,7 @@ Aborted!
                                             json=None,
                                             params=self.LIMITED_PARAMS)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_defined_in_a_config_file(self, get_patched, clusters_list_config_path):
         get_patched.return_value = MockResponse(json_data=self.LIMITED_LIST_CLUSTERS)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [clusters_list_config_path]
@@ -129,7 +129,7 @@ class TestListVmTypes(object):
     EXPECTED_STDOUT_WHEN_WRONG_API_KEY_WAS_USED = "Failed to fetch data: Invalid API token\n"
     DEFAULT_PARAMS = {'includePublicClusters': 'true'}
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_list_of_machine_types(self, get_patched):
         get_patched.return_value = MockResponse(self.LIST_JSON)
 
@@ -144,7 +144,7 @@ class TestListVmTypes(object):
 
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_list_of_vm_machine_types_filtered_by_cluster_id(self, get_patched):
         get_patched.return_value = MockResponse(self.LIST_JSON)
 
@@ -157,7 +157,7 @@ class TestListVmTypes(object):
                                             json=None,
                                             params=self.DEFAULT_PARAMS)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_list_of_machine_types_but_none_found(self, get_patched):
         get_patched.return_value = MockResponse(self.LIST_JSON)
 
@@ -171,7 +171,7 @@ class TestListVmTypes(object):
 
         assert result.output == "No data found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WHEN_WRONG_API_KEY_WAS_USED,
                                                 status_code=403)
@@ -187,7 +187,7 @@ class TestListVmTypes(object):
         assert result.output == self.EXPECTED_STDOUT_WHEN_WRONG_API_KEY_WAS_USED
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_defined_in_a_config_file(self, get_patched, vm_machine_types_list_config_path):
         get_patched.return_value = MockResponse(self.LIST_JSON)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [vm_machine_types_list_config_path]
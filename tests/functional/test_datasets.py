@@ -1,9 +1,21 @@
+import base64
+import hashlib
+import io
+import json
+import re
+import tarfile
+from urllib.parse import parse_qs, urlencode, urlparse
+
 import mock
+import pytest
+import requests
 from click.testing import CliRunner
 
 from gradient.api_sdk.clients import http_client
 from gradient.cli import cli
-from tests import example_responses, MockResponse
+from gradient.commands import datasets as datasets_commands
+from gradient.commands import datasets_journal
+from tests import example_responses, MockResponse, MockStreamResponse
 
 EXPECTED_HEADERS = http_client.default_headers.copy()
 EXPECTED_HEADERS["ps_client_name"] = "gradient-cli"
@@ -12,6 +24,102 @@ EXPECTED_HEADERS_WITH_CHANGED_API_KEY = EXPECTED_HEADERS.copy()
 EXPECTED_HEADERS_WITH_CHANGED_API_KEY["X-API-Key"] = "some_key"
 
 URL = "https://api.paperspace.io"
+S3_URL = "https://s3.amazonaws.com/"
+
+
+class FakeStorage(object):
+    """Bucket behind pre-signed URLs, objects of the version are stored under a prefix of their own
+
+    Listings name the storage prefix and full storage keys like S3 does,
+    so they never start with the dataset path that was requested.
+    """
+
+    def __init__(self, objects, root="dsttn2y7j1ux882/1rn19s2/"):
+        """
+        :param dict[str,bytes] objects: content by dataset key
+        :param str root: storage prefix of the dataset version
+        """
+        self.objects = dict(objects)
+        self.root = root
+
+    def presign(self, *args, **kwargs):
+        urls = []
+        for call in kwargs["json"]["calls"]:
+            if call["method"] == "listObjectsV2":
+                # listings are not recursive unless an empty delimiter is sent
+                url = S3_URL + "?" + urlencode({"prefix": call["params"]["Prefix"],
+                                                "delimiter": call["params"].get("Delimiter", "/")})
+            elif call["method"] == "deleteObjects":
+                url = S3_URL + "?delete"
+            else:
+                url = S3_URL + call["params"]["Key"].lstrip("/")
+            urls.append({"url": url, "expiresIn": 3600})
+        return MockResponse(urls)
+
+    def list_objects(self, url):
+        query = parse_qs(urlparse(url).query, keep_blank_values=True)
+        storage_prefix = self.root + query.get("prefix", [""])[0].lstrip("/")
+        delimiter = query.get("delimiter", [""])[0]
+
+        keys = []
+        common_prefixes = []
+        for key in sorted(self.root + k for k in self.objects):
+            if not key.startswith(storage_prefix):
+                continue
+            rest = key[len(storage_prefix):]
+            if delimiter and delimiter in rest:
+                common_prefix = storage_prefix + rest[:rest.index(delimiter) + 1]
+                if common_prefix not in common_prefixes:
+                    common_prefixes.append(common_prefix)
+            else:
+                keys.append(key)
+
+        text = """<?xml version="1.0" encoding="UTF-8"?>
+<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/"><Prefix>{}</Prefix>{}{}</ListBucketResult>""".format(
+            storage_prefix,
+            "".join("<Contents><Key>{}</Key><Size>{}</Size></Contents>".format(
+                key, len(self.objects[key[len(self.root):]])) for key in keys),
+            "".join("<CommonPrefixes><Prefix>{}</Prefix></CommonPrefixes>".format(p) for p in common_prefixes))
+        response = MockResponse(content=text)
+        response.text = text
+        return response
+
+    def head(self, url):
+        content = self.objects.get(url[len(S3_URL):])
+        if content is None:
+            return MockResponse(status_code=404)
+        return MockResponse(headers={"Content-Length": str(len(content))})
+
+    def get(self, url, headers=None, **kwargs):
+        if not url.startswith(S3_URL):
+            return TestListDatasetFiles.get(url)
+        return MockStreamResponse(self.objects[url[len(S3_URL):]])
+
+    def put(self, url, data=None, headers=None, timeout=None):
+        self.objects[url[len(S3_URL):]] = data.read() if hasattr(data, "read") else data
+        return MockResponse()
+
+    def delete(self, url, **kwargs):
+        self.objects.pop(url[len(S3_URL):], None)
+        return MockResponse(status_code=204)
+
+    def post(self, url, data=None, headers=None, json=None, **kwargs):
+        if not url.startswith(S3_URL):
+            return self.presign(json=json)
+
+        for key in re.findall(r"<Key>(.*?)</Key>", data.decode("utf-8")):
+            self.objects.pop(key, None)
+        return MockResponse(content=TestDeleteDatasetFiles.DELETE_RESULT)
+
+    def patch(self, get_patched, post_patched, list_patched, head_patched=None, put_patched=None,
+              delete_patched=None):
+        get_patched.side_effect = self.get
+        post_patched.side_effect = self.post
+        list_patched.side_effect = self.list_objects
+        for patched, side_effect in ((head_patched, self.head), (put_patched, self.put),
+                                     (delete_patched, self.delete)):
+            if patched is not None:
+                patched.side_effect = side_effect
 
 
 class TestListDatasets(object):
@@ -26,7 +134,7 @@ class TestListDatasets(object):
 +-------+-----------------+-------------------------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_list_datasets(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -59,7 +167,7 @@ class TestShowDatasetDetails(object):
 +-----------------+-------------------------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_show_dataset_details(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -82,7 +190,7 @@ class TestCreateDataset(object):
     STDOUT = """Created dataset: dsttn2y7j1ux882
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_create_dataset(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -108,7 +216,7 @@ class TestUpdateDataset(object):
     STDOUT = """Updated dataset: dsttn2y7j1ux882
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_update_dataset(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -132,7 +240,7 @@ class TestDeleteDataset(object):
     STDOUT = """Deleted dataset: dsttn2y7j1ux882
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
     def test_delete_dataset(self, method):
         method.return_value = MockResponse(status_code=204)
 
@@ -159,7 +267,7 @@ class TestListDatasetVersions(object):
 +-------------------------+---------+-------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_list_dataset_versions(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -193,7 +301,7 @@ class TestShowDatasetVersionDetails(object):
 +-----------+-------------------------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_show_dataset_details(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -216,7 +324,7 @@ class TestUpdateDatasetVersion(object):
     STDOUT = """Updated dataset version: dsttn2y7j1ux882:1rn19s2
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_update_dataset_version(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -240,7 +348,7 @@ class TestDeleteDatasetVersion(object):
     STDOUT = """Deleted dataset version: dsttn2y7j1ux882:1rn19s2
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
     def test_delete_dataset_version(self, method):
         method.return_value = MockResponse(status_code=204)
 
@@ -263,7 +371,7 @@ class TestSetDatasetTag(object):
     STDOUT = """Set dataset tag: dsttn2y7j1ux882:hello
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
     def test_update_dataset_version(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -286,7 +394,7 @@ class TestDeleteDatasetTag(object):
     STDOUT = """Deleted dataset tag: dsttn2y7j1ux882:hello
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
     def test_update_dataset_version(self, method):
         method.return_value = MockResponse()
 
@@ -300,3 +408,1094 @@ class TestDeleteDatasetTag(object):
             headers=EXPECTED_HEADERS,
             json=None
         )
+
+
+class TestListDatasetFiles(object):
+    COMMAND = ["datasets", "files", "list"]
+
+    @staticmethod
+    def get(url, **kwargs):
+        if "/datasets/ref/" in url:
+            return MockResponse(dict(example_responses.SHOW_DATASET_DETAILS_RESPONSE,
+                                     version=example_responses.SHOW_DATASET_VERSION_DETAILS_RESPONSE))
+        if "/versions/" in url:
+            return MockResponse(example_responses.SHOW_DATASET_VERSION_DETAILS_RESPONSE)
+        return MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+
+    def setup_mocks(self, get_patched, post_patched, list_patched):
+        get_patched.side_effect = self.get
+        post_patched.side_effect = TestPutDatasetFiles.presign
+        list_patched.return_value = MockResponse(content=TestSyncDatasetFiles.LIST_OBJECTS_RESPONSE)
+        list_patched.return_value.text = TestSyncDatasetFiles.LIST_OBJECTS_RESPONSE
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_serve_listing_of_committed_version_from_listing_cache(
+            self, get_patched, post_patched, list_patched, tmpdir):
+        self.setup_mocks(get_patched, post_patched, list_patched)
+
+        with mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            commit_result = CliRunner().invoke(cli.cli, [
+                "datasets", "versions", "commit", "--id=dsttn2y7j1ux882:1rn19s2"])
+            results = [CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--recursive", "true"]) for _ in range(2)]
+            subdirectory_result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--path", "/"])
+
+        assert "Dataset version already committed" in commit_result.output, commit_result.exc_info
+        for result in results + [subdirectory_result]:
+            assert result.exit_code == 0, result.exc_info
+            for key in ("same.txt", "changed.txt", "stale.txt"):
+                assert key in result.output
+        assert list_patched.call_count == 1
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_list_uncommitted_version_from_storage_every_time(
+            self, get_patched, post_patched, list_patched, tmpdir):
+        self.setup_mocks(get_patched, post_patched, list_patched)
+
+        with mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            datasets_journal.ListingCache().set_committed("dsttn2y7j1ux882:other")
+            for _ in range(2):
+                result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                    "--id=dsttn2y7j1ux882:1rn19s2", "--recursive", "true"])
+                assert result.exit_code == 0, result.exc_info
+
+        assert list_patched.call_count == 2
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_cache_keys_relative_to_version_root_and_serve_subdirectories_from_them(
+            self, get_patched, post_patched, list_patched, tmpdir):
+        storage = FakeStorage({"data/a.txt": b"aaa", "data/sub/b.txt": b"bb", "other.txt": b"o"})
+        storage.patch(get_patched, post_patched, list_patched)
+        target_path = tmpdir.join("target")
+
+        with mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            CliRunner().invoke(cli.cli, ["datasets", "versions", "commit", "--id=dsttn2y7j1ux882:1rn19s2"])
+            root_result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--recursive", "true"])
+            subdirectory_result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--path", "/data", "--recursive", "true"])
+            get_result = CliRunner().invoke(cli.cli, TestGetDatasetFiles.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/data/", "--target-path", str(target_path)])
+
+            cache = datasets_journal.ListingCache()
+            cached_keys = [o["key"] for o in cache.iter_objects("dsttn2y7j1ux882:1rn19s2", "")]
+            cache.close()
+
+        assert list_patched.call_count == 1
+        assert cached_keys == ["data/a.txt", "data/sub/b.txt", "other.txt"]
+        for result in (root_result, subdirectory_result, get_result):
+            assert result.exit_code == 0, result.exc_info
+        assert "data/sub/b.txt" in root_result.output
+        assert "| a.txt " in subdirectory_result.output
+        assert "| sub/b.txt " in subdirectory_result.output
+        assert storage.root not in subdirectory_result.output
+        assert target_path.join("a.txt").read_binary() == b"aaa"
+        assert target_path.join("sub", "b.txt").read_binary() == b"bb"
+
+
+class TestGetDatasetFiles(object):
+    COMMAND = ["datasets", "files", "get"]
+    CONTENT = b"0123456789abcdefghijKLMNO"
+
+    @staticmethod
+    def presign(*args, **kwargs):
+        calls = kwargs["json"]["calls"]
+        return MockResponse([{"url": "https://s3.amazonaws.com/{}".format(call["params"]["Key"]), "expiresIn": 3600}
+                             for call in calls])
+
+    def get(self, url, headers=None, **kwargs):
+        if not url.startswith("https://s3.amazonaws.com"):
+            return MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+
+        if not headers.get("Range"):
+            return MockStreamResponse(self.CONTENT)
+
+        start, _, end = headers["Range"][len("bytes="):].partition("-")
+        end = int(end) + 1 if end else len(self.CONTENT)
+        return MockStreamResponse(self.CONTENT[int(start):end], status_code=206)
+
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_download_big_file_in_parallel_ranges(self, get_patched, post_patched, head_patched, tmpdir):
+        get_patched.side_effect = self.get
+        post_patched.side_effect = self.presign
+        head_patched.return_value = MockResponse(headers={
+            "Content-Length": str(len(self.CONTENT)),
+            "ETag": '"{}"'.format(hashlib.md5(self.CONTENT).hexdigest()),
+        })
+        target_path = tmpdir.join("checkpoint.bin")
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/checkpoint.bin",
+            "--target-path", str(target_path), "--part-size", "10"])
+
+        assert result.exit_code == 0, result.exc_info
+        assert target_path.read_binary() == self.CONTENT
+        ranges = sorted(c[1]["headers"]["Range"] for c in get_patched.call_args_list
+                        if c[0][0].startswith("https://s3.amazonaws.com"))
+        assert ranges == ["bytes=0-9", "bytes=10-19", "bytes=20-24"]
+        assert sorted(p.basename for p in tmpdir.listdir()) == ["checkpoint.bin"]
+
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_download_only_missing_ranges_of_interrupted_download(
+            self, get_patched, post_patched, head_patched, tmpdir):
+        etag = hashlib.md5(self.CONTENT).hexdigest()
+        get_patched.side_effect = self.get
+        post_patched.side_effect = self.presign
+        head_patched.return_value = MockResponse(headers={
+            "Content-Length": str(len(self.CONTENT)),
+            "ETag": '"{}"'.format(etag),
+        })
+        target_path = tmpdir.join("checkpoint.bin")
+        download = datasets_commands.RangedDownload(str(target_path), len(self.CONTENT), etag=etag, part_size=10)
+        download.prepare()
+        with open(download.tmp_path, "r+b") as f:
+            f.write(self.CONTENT[:10])
+        download.complete_part(1)
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/checkpoint.bin",
+            "--target-path", str(target_path), "--part-size", "10"])
+
+        assert result.exit_code == 0, result.exc_info
+        assert target_path.read_binary() == self.CONTENT
+        ranges = sorted(c[1]["headers"]["Range"] for c in get_patched.call_args_list
+                        if c[0][0].startswith("https://s3.amazonaws.com"))
+        assert ranges == ["bytes=10-19", "bytes=20-24"]
+
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_fail_when_downloaded_file_does_not_match_etag(
+            self, get_patched, post_patched, head_patched, tmpdir):
+        get_patched.side_effect = self.get
+        post_patched.side_effect = self.presign
+        head_patched.return_value = MockResponse(headers={
+            "Content-Length": str(len(self.CONTENT)),
+            "ETag": '"{}"'.format(hashlib.md5(b"something else").hexdigest()),
+        })
+        target_path = tmpdir.join("checkpoint.bin")
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/checkpoint.bin",
+            "--target-path", str(target_path), "--part-size", "10"])
+
+        assert "does not match remote object" in result.output
+        assert tmpdir.listdir() == []
+
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_fail_when_file_downloaded_with_single_request_does_not_match_etag(
+            self, get_patched, post_patched, head_patched, tmpdir):
+        get_patched.side_effect = self.get
+        post_patched.side_effect = self.presign
+        head_patched.return_value = MockResponse(headers={
+            "Content-Length": str(len(self.CONTENT)),
+            "ETag": '"{}"'.format(hashlib.md5(b"something else").hexdigest()),
+        })
+        target_path = tmpdir.join("checkpoint.bin")
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/checkpoint.bin",
+            "--target-path", str(target_path)])
+
+        assert "does not match remote object" in result.output
+        assert tmpdir.listdir() == []
+
+    @pytest.mark.parametrize("etag", ["0x8DB4F5E3C2A1B00", "not-an-md5-1"])
+    @pytest.mark.parametrize("part_size", [None, "10"])
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_not_verify_etag_that_is_not_md5_of_content(
+            self, get_patched, post_patched, head_patched, part_size, etag, tmpdir):
+        get_patched.side_effect = self.get
+        post_patched.side_effect = self.presign
+        head_patched.return_value = MockResponse(headers={
+            "Content-Length": str(len(self.CONTENT)),
+            "ETag": '"{}"'.format(etag),
+        })
+        target_path = tmpdir.join("checkpoint.bin")
+        part_size_args = ["--part-size", part_size] if part_size else []
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/checkpoint.bin",
+            "--target-path", str(target_path)] + part_size_args)
+
+        assert result.exit_code == 0, result.exc_info
+        assert "does not match remote object" not in result.output
+        assert target_path.read_binary() == self.CONTENT
+
+    @mock.patch("gradient.commands.datasets.MULTIPART_CHUNK_SIZE", 10)
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_verify_multipart_etag_while_ranges_are_downloaded(
+            self, get_patched, post_patched, head_patched, tmpdir):
+        etag = datasets_journal.EtagHasher.combine(
+            [hashlib.md5(self.CONTENT[i:i + 10]).digest() for i in range(0, len(self.CONTENT), 10)])
+        get_patched.side_effect = self.get
+        post_patched.side_effect = self.presign
+        head_patched.return_value = MockResponse(headers={
+            "Content-Length": str(len(self.CONTENT)),
+            "ETag": '"{}"'.format(etag),
+        })
+        target_path = tmpdir.join("checkpoint.bin")
+
+        with mock.patch.object(datasets_journal.FileHashCache, "compute_etag") as compute_etag_patched:
+            result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/checkpoint.bin",
+                "--target-path", str(target_path), "--part-size", "15"])
+
+        assert result.exit_code == 0, result.exc_info
+        assert target_path.read_binary() == self.CONTENT
+        compute_etag_patched.assert_not_called()
+        ranges = sorted(c[1]["headers"]["Range"] for c in get_patched.call_args_list
+                        if c[0][0].startswith("https://s3.amazonaws.com"))
+        assert ranges == ["bytes=0-9", "bytes=10-19", "bytes=20-24"]
+
+
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_skip_files_that_did_not_change_since_previous_download_when_resuming(
+            self, get_patched, post_patched, head_patched, tmpdir):
+        etag = hashlib.md5(self.CONTENT).hexdigest()
+        get_patched.side_effect = self.get
+        post_patched.side_effect = self.presign
+        head_patched.return_value = MockResponse(headers={
+            "Content-Length": str(len(self.CONTENT)),
+            "ETag": '"{}"'.format(etag),
+        })
+        target_path = tmpdir.join("checkpoint.bin")
+        target_path.write_binary(self.CONTENT)
+
+        with mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            journal = datasets_journal.DownloadJournal()
+            journal.complete_download(str(target_path), etag)
+            journal.close()
+
+            result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/checkpoint.bin",
+                "--target-path", str(target_path), "--resume"])
+
+        assert result.exit_code == 0, result.exc_info
+        assert "Skipped 1 unchanged files" in result.output
+        methods = [c["method"] for call in post_patched.call_args_list for c in call[1]["json"]["calls"]]
+        assert methods == ["headObject"]
+
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_resume_partially_downloaded_file_with_range_request(
+            self, get_patched, post_patched, head_patched, tmpdir):
+        etag = hashlib.md5(self.CONTENT).hexdigest()
+        get_patched.side_effect = self.get
+        post_patched.side_effect = self.presign
+        head_patched.return_value = MockResponse(headers={
+            "Content-Length": str(len(self.CONTENT)),
+            "ETag": '"{}"'.format(etag),
+        })
+        target_path = tmpdir.join("checkpoint.bin")
+        tmpdir.join("checkpoint.bin.download").write_binary(self.CONTENT[:10])
+        tmpdir.join("checkpoint.bin.download.json").write(json.dumps({"size": len(self.CONTENT), "etag": etag}))
+
+        with mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/checkpoint.bin",
+                "--target-path", str(target_path), "--resume"])
+
+            journal = datasets_journal.DownloadJournal()
+            assert journal.is_unchanged(str(target_path), len(self.CONTENT), etag)
+            journal.close()
+
+        assert result.exit_code == 0, result.exc_info
+        assert target_path.read_binary() == self.CONTENT
+        ranges = [c[1]["headers"].get("Range") for c in get_patched.call_args_list
+                  if c[0][0].startswith("https://s3.amazonaws.com")]
+        assert ranges == ["bytes=10-"]
+        assert sorted(p.basename for p in tmpdir.listdir()) == ["checkpoint.bin", "config"]
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_download_and_expand_packed_files_from_tar_shards(
+            self, get_patched, post_patched, list_patched, tmpdir):
+        shard = io.BytesIO()
+        with tarfile.open(fileobj=shard, mode="w") as tar:
+            for name, content in [("data/a.txt", b"aaa"), ("data/sub/b.txt", b"bb"), ("other.txt", b"o")]:
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+        manifest = json.dumps({"version": 1, "shards": [{"key": ".shards/abc/0.tar", "size": len(shard.getvalue()),
+                                                         "files": [{"key": "data/a.txt", "size": 3, "offset": 512},
+                                                                   {"key": "data/sub/b.txt", "size": 2, "offset": 1536},
+                                                                   {"key": "other.txt", "size": 1, "offset": 2560}]}]})
+        objects = {
+            ".shards/abc/0.tar": shard.getvalue(),
+            ".shards/abc/index.json": manifest.encode("utf-8"),
+        }
+
+        def presign(*args, **kwargs):
+            calls = kwargs["json"]["calls"]
+            return MockResponse([{"url": "https://s3.amazonaws.com/{}".format(
+                call["params"]["Prefix"] if call["method"] == "listObjectsV2" else call["params"]["Key"])}
+                for call in calls])
+
+        def get(url, headers=None, **kwargs):
+            if not url.startswith("https://s3.amazonaws.com"):
+                return MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+            return MockStreamResponse(objects[url[len("https://s3.amazonaws.com/"):]])
+
+        def list_objects(url):
+            prefix = url[len("https://s3.amazonaws.com/"):]
+            keys = "".join("<Contents><Key>/{}</Key><Size>1</Size></Contents>".format(key)
+                           for key in objects if ("/" + key).startswith(prefix))
+            response_text = """<?xml version="1.0" encoding="UTF-8"?>
+<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/"><Prefix>{}</Prefix>{}</ListBucketResult>""".format(
+                prefix, keys)
+            response = MockResponse(content=response_text)
+            response.text = response_text
+            return response
+
+        get_patched.side_effect = get
+        post_patched.side_effect = presign
+        list_patched.side_effect = list_objects
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/data/", "--target-path", str(tmpdir)])
+
+        assert result.exit_code == 0, result.exc_info
+        assert tmpdir.join("a.txt").read_binary() == b"aaa"
+        assert tmpdir.join("sub", "b.txt").read_binary() == b"bb"
+        assert sorted(p.basename for p in tmpdir.listdir()) == ["a.txt", "sub"]
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_download_directory_stored_under_prefix_other_than_requested_path(
+            self, get_patched, post_patched, head_patched, list_patched, tmpdir):
+        storage = FakeStorage({"data/a.txt": b"aaa", "data/sub/b.txt": b"bb", "other.txt": b"o"})
+        storage.patch(get_patched, post_patched, list_patched, head_patched=head_patched)
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/data", "--target-path", str(tmpdir)])
+
+        assert result.exit_code == 0, result.exc_info
+        assert tmpdir.join("data", "a.txt").read_binary() == b"aaa"
+        assert tmpdir.join("data", "sub", "b.txt").read_binary() == b"bb"
+        assert sorted(p.basename for p in tmpdir.listdir()) == ["data"]
+
+
+    def write_manifest(self, tmpdir, sha256):
+        manifest_path = tmpdir.join("manifest.ndjson")
+        manifest_path.write("\n".join(json.dumps(line) for line in [
+            {"version": 1, "datasetVersionId": "dsttn2y7j1ux882:1rn19s2"},
+            {"key": "data/checkpoint.bin", "size": len(self.CONTENT),
+             "etag": hashlib.md5(self.CONTENT).hexdigest(), "sha256": sha256},
+            {"key": "other.bin", "size": len(self.CONTENT)},
+        ]) + "\n")
+        return str(manifest_path)
+
+    def get_with_ref(self, url, headers=None, **kwargs):
+        if not url.startswith("https://s3.amazonaws.com"):
+            return TestListDatasetFiles.get(url)
+        return self.get(url, headers=headers, **kwargs)
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_download_files_listed_in_manifest_without_listing_storage(
+            self, get_patched, post_patched, head_patched, list_patched, tmpdir):
+        get_patched.side_effect = self.get_with_ref
+        post_patched.side_effect = self.presign
+        manifest_path = self.write_manifest(tmpdir, hashlib.sha256(self.CONTENT).hexdigest())
+        target_dir = tmpdir.mkdir("target")
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/data/", "--target-path", str(target_dir),
+            "--manifest", manifest_path])
+
+        assert result.exit_code == 0, result.exc_info
+        assert target_dir.join("checkpoint.bin").read_binary() == self.CONTENT
+        assert target_dir.listdir() == [target_dir.join("checkpoint.bin")]
+        list_patched.assert_not_called()
+        head_patched.assert_not_called()
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_fail_when_downloaded_file_does_not_match_sha256_from_manifest(
+            self, get_patched, post_patched, head_patched, list_patched, tmpdir):
+        get_patched.side_effect = self.get_with_ref
+        post_patched.side_effect = self.presign
+        manifest_path = self.write_manifest(tmpdir, hashlib.sha256(b"something else").hexdigest())
+        target_dir = tmpdir.mkdir("target")
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", "/data/checkpoint.bin",
+            "--target-path", str(target_dir.join("checkpoint.bin")), "--manifest", manifest_path])
+
+        assert "does not match remote object" in result.output
+        assert target_dir.listdir() == []
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_refuse_manifest_of_other_dataset_version(self, get_patched, tmpdir):
+        get_patched.side_effect = self.get_with_ref
+        manifest_path = tmpdir.join("manifest.ndjson")
+        manifest_path.write('{"version": 1, "datasetVersionId": "dsttn2y7j1ux882:other"}\n')
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--target-path", str(tmpdir.join("target")),
+            "--manifest", str(manifest_path)])
+
+        assert "describes dataset version dsttn2y7j1ux882:other, not dsttn2y7j1ux882:1rn19s2" in result.output
+
+
+class TestExportDatasetVersionManifest(object):
+    COMMAND = ["datasets", "versions", "manifest"]
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_write_sorted_manifest_with_sha256_of_every_object(
+            self, get_patched, post_patched, list_patched, tmpdir):
+        def get(url, **kwargs):
+            if not url.startswith("https://s3.amazonaws.com"):
+                return TestListDatasetFiles.get(url)
+            return MockStreamResponse(url.rsplit("/", 1)[-1].encode())
+
+        get_patched.side_effect = get
+        post_patched.side_effect = TestPutDatasetFiles.presign
+        list_patched.return_value = MockResponse(content=TestSyncDatasetFiles.LIST_OBJECTS_RESPONSE)
+        list_patched.return_value.text = TestSyncDatasetFiles.LIST_OBJECTS_RESPONSE
+        manifest_path = tmpdir.join("manifest.ndjson")
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--target-path", str(manifest_path), "--sha256"])
+
+        assert result.exit_code == 0, result.exc_info
+        assert "Wrote manifest of 3 files" in result.output
+        lines = [json.loads(line) for line in manifest_path.read().splitlines()]
+        assert lines[0] == {"version": 1, "datasetVersionId": "dsttn2y7j1ux882:1rn19s2"}
+        assert [line["key"] for line in lines[1:]] == ["changed.txt", "same.txt", "stale.txt"]
+        assert lines[2] == {"key": "same.txt", "size": 4, "etag": hashlib.md5(b"same").hexdigest(),
+                            "sha256": hashlib.sha256(b"same.txt").hexdigest()}
+
+
+class TestPutDatasetFiles(object):
+    COMMAND = ["datasets", "files", "put"]
+
+    @staticmethod
+    def presign(*args, **kwargs):
+        calls = kwargs["json"]["calls"]
+        urls = []
+        for call in calls:
+            method = call["method"]
+            if method == "createMultipartUpload":
+                url = {"UploadId": "some_upload_id"}
+            elif method == "completeMultipartUpload":
+                url = {"Location": call["params"]["Key"]}
+            elif method == "uploadPart":
+                url = "https://s3.amazonaws.com/part/{}".format(call["params"]["PartNumber"])
+            elif method == "listObjectsV2":
+                url = "https://s3.amazonaws.com/?list-type=2"
+            elif method == "deleteObjects":
+                url = "https://s3.amazonaws.com/?delete"
+            else:
+                url = "https://s3.amazonaws.com/{}".format(call["params"]["Key"])
+            urls.append({"url": url, "expiresIn": 3600})
+        return MockResponse(urls)
+
+    @staticmethod
+    def upload(url, data=None, headers=None, timeout=None):
+        return MockResponse(headers={"ETag": '"etag-{}"'.format(url.rsplit("/", 1)[-1])})
+
+    def record_uploads(self, url, data=None, headers=None, timeout=None):
+        # bodies are streamed from files that are closed once the request is sent
+        self.uploaded_parts.append((url, data.read() if hasattr(data, "read") else data))
+        return self.upload(url, data=data, headers=headers, timeout=timeout)
+
+    def setup_method(self):
+        self.uploaded_parts = []
+
+    @mock.patch("gradient.commands.datasets.MULTIPART_CHUNK_SIZE", 10)
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_upload_parts_of_big_file_concurrently_and_complete_multipart_upload(
+            self, get_patched, post_patched, put_patched, tmpdir):
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = self.presign
+        put_patched.side_effect = self.record_uploads
+        source_path = tmpdir.join("checkpoint.bin")
+        source_path.write_binary(b"0123456789abcdefghijKLMNO")
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_path)])
+
+        assert result.exit_code == 0, result.exc_info
+        uploaded_parts = sorted(self.uploaded_parts)
+        assert uploaded_parts == [
+            ("https://s3.amazonaws.com/part/1", b"0123456789"),
+            ("https://s3.amazonaws.com/part/2", b"abcdefghij"),
+            ("https://s3.amazonaws.com/part/3", b"KLMNO"),
+        ]
+
+        methods = [[c["method"] for c in call[1]["json"]["calls"]] for call in post_patched.call_args_list]
+        assert methods == [
+            ["createMultipartUpload"],
+            ["uploadPart", "uploadPart", "uploadPart"],
+            ["completeMultipartUpload"],
+        ]
+        complete_params = post_patched.call_args_list[-1][1]["json"]["calls"][0]["params"]
+        assert complete_params == {
+            "Key": "/checkpoint.bin",
+            "UploadId": "some_upload_id",
+            "MultipartUpload": {"Parts": [
+                {"ETag": "etag-1", "PartNumber": 1},
+                {"ETag": "etag-2", "PartNumber": 2},
+                {"ETag": "etag-3", "PartNumber": 3},
+            ]},
+        }
+
+
+    @pytest.mark.parametrize("uploaded_size,uploaded_etag,completed", [
+        (25, None, True),
+        (25, "something else", False),
+        (None, None, False),
+    ])
+    @mock.patch("gradient.commands.datasets.MULTIPART_CHUNK_SIZE", 10)
+    @mock.patch("gradient.commands.datasets.requests.head")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_check_uploaded_object_when_completed_multipart_upload_no_longer_exists(
+            self, get_patched, post_patched, put_patched, head_patched, uploaded_size, uploaded_etag, completed,
+            tmpdir):
+        content = b"0123456789abcdefghijKLMNO"
+        expected_etag = datasets_journal.EtagHasher.combine(
+            [hashlib.md5(content[i:i + 10]).digest() for i in range(0, len(content), 10)])
+
+        def presign(*args, **kwargs):
+            if kwargs["json"]["calls"][0]["method"] == "completeMultipartUpload":
+                # upload was completed by a request whose response got lost
+                response = MockResponse(status_code=404)
+                response.text = "<Error><Code>NoSuchUpload</Code></Error>"
+                return response
+            return self.presign(*args, **kwargs)
+
+        def upload(url, data=None, headers=None, timeout=None):
+            return MockResponse(headers={"ETag": '"{}"'.format(hashlib.md5(data.read()).hexdigest())})
+
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = presign
+        put_patched.side_effect = upload
+        if uploaded_size is None:
+            head_patched.return_value = MockResponse(status_code=404)
+        else:
+            head_patched.return_value = MockResponse(headers={
+                "Content-Length": str(uploaded_size),
+                "ETag": '"{}"'.format(uploaded_etag or expected_etag),
+            })
+        source_path = tmpdir.join("checkpoint.bin")
+        source_path.write_binary(content)
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_path)])
+
+        assert result.exit_code == 0, result.exc_info
+        assert ("no longer exists" in result.output) is not completed
+        head_patched.assert_called_once()
+
+    @mock.patch("gradient.commands.datasets.MULTIPART_CHUNK_SIZE", 10)
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_skip_uploaded_files_and_resume_multipart_upload_when_resume_flag_was_used(
+            self, get_patched, post_patched, put_patched, tmpdir):
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = self.presign
+        put_patched.side_effect = self.record_uploads
+        source_dir = tmpdir.mkdir("data")
+        source_dir.join("uploaded.txt").write_binary(b"abc")
+        source_dir.join("checkpoint.bin").write_binary(b"0123456789abcdefghijKLMNO")
+
+        with mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            journal = datasets_journal.UploadJournal()
+            size, mtime = journal.get_file_signature(str(source_dir.join("uploaded.txt")))
+            journal.complete_object("dsttn2y7j1ux882:1rn19s2", "/uploaded.txt", size, mtime)
+            size, mtime = journal.get_file_signature(str(source_dir.join("checkpoint.bin")))
+            journal.start_multipart_upload(
+                "dsttn2y7j1ux882:1rn19s2", "/checkpoint.bin", size, mtime, "previous_upload_id", 10)
+            journal.complete_part("previous_upload_id", 1, "etag-1")
+            journal.close()
+
+            result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_dir) + "/", "--resume"])
+
+            journal = datasets_journal.UploadJournal()
+            assert journal.is_object_completed("dsttn2y7j1ux882:1rn19s2", "/checkpoint.bin", size, mtime)
+            assert journal.get_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/checkpoint.bin", size, mtime) is None
+            journal.close()
+
+        assert result.exit_code == 0, result.exc_info
+        assert "Skipped 1 files uploaded before" in result.output
+        uploaded_parts = sorted(self.uploaded_parts)
+        assert uploaded_parts == [
+            ("https://s3.amazonaws.com/part/2", b"abcdefghij"),
+            ("https://s3.amazonaws.com/part/3", b"KLMNO"),
+        ]
+
+        methods = [[c["method"] for c in call[1]["json"]["calls"]] for call in post_patched.call_args_list]
+        assert methods == [
+            ["uploadPart", "uploadPart"],
+            ["completeMultipartUpload"],
+        ]
+        complete_params = post_patched.call_args_list[-1][1]["json"]["calls"][0]["params"]
+        assert complete_params["UploadId"] == "previous_upload_id"
+        assert complete_params["MultipartUpload"]["Parts"] == [
+            {"ETag": "etag-1", "PartNumber": 1},
+            {"ETag": "etag-2", "PartNumber": 2},
+            {"ETag": "etag-3", "PartNumber": 3},
+        ]
+
+    @mock.patch("gradient.commands.datasets.MULTIPART_CHUNK_SIZE", 10)
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_send_whole_part_again_after_connection_error_in_the_middle_of_the_body(
+            self, get_patched, post_patched, put_patched, tmpdir):
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = self.presign
+        failed_urls = set()
+
+        def upload(url, data=None, headers=None, timeout=None):
+            if url not in failed_urls:
+                failed_urls.add(url)
+                data.read(3)
+                raise requests.exceptions.ConnectionError()
+            return self.record_uploads(url, data=data, headers=headers, timeout=timeout)
+
+        put_patched.side_effect = upload
+        source_path = tmpdir.join("checkpoint.bin")
+        source_path.write_binary(b"0123456789abcdefghijKLMNO")
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_path)])
+
+        assert result.exit_code == 0, result.exc_info
+        assert sorted(self.uploaded_parts) == [
+            ("https://s3.amazonaws.com/part/1", b"0123456789"),
+            ("https://s3.amazonaws.com/part/2", b"abcdefghij"),
+            ("https://s3.amazonaws.com/part/3", b"KLMNO"),
+        ]
+
+    @mock.patch("gradient.commands.datasets.MULTIPART_CHUNK_SIZE", 10)
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_send_part_again_with_content_md5_when_etag_does_not_match_sent_content(
+            self, get_patched, post_patched, put_patched, tmpdir):
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = self.presign
+        sent_headers = []
+
+        def upload(url, data=None, headers=None, timeout=None):
+            content = data.read()
+            sent_headers.append((url, headers))
+            if url.endswith("/2") and "Content-MD5" not in headers:
+                content = b"corrupted"
+            return MockResponse(headers={"ETag": '"{}"'.format(hashlib.md5(content).hexdigest())})
+
+        put_patched.side_effect = upload
+        source_path = tmpdir.join("checkpoint.bin")
+        source_path.write_binary(b"0123456789abcdefghijKLMNO")
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + [
+            "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_path)])
+
+        assert result.exit_code == 0, result.exc_info
+        part_2_headers = [headers for url, headers in sent_headers if url.endswith("/2")]
+        assert len(part_2_headers) == 2
+        assert "Content-MD5" not in part_2_headers[0]
+        assert part_2_headers[1]["Content-MD5"] == base64.b64encode(hashlib.md5(b"abcdefghij").digest()).decode()
+        assert len(sent_headers) == 4
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_upload_small_files_packed_in_tar_shard_and_manifest_when_pack_flag_was_used(
+            self, get_patched, post_patched, put_patched, list_patched, tmpdir):
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = self.presign
+        list_patched.side_effect = FakeStorage({}).list_objects
+        uploaded = {}
+
+        def upload(url, data=None, headers=None, timeout=None):
+            uploaded[url] = data.read() if hasattr(data, "read") else data
+            return MockResponse()
+
+        put_patched.side_effect = upload
+        source_dir = tmpdir.mkdir("data")
+        source_dir.join("a.txt").write_binary(b"aaa")
+        source_dir.mkdir("sub").join("b.txt").write_binary(b"bb")
+        source_dir.join("big.bin").write_binary(b"0123456789")
+
+        with mock.patch.object(datasets_commands.config, "DATASETS_PACK_FILE_SIZE", 5):
+            result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_dir) + "/", "--pack"])
+
+        assert result.exit_code == 0, result.exc_info
+        assert uploaded.pop("https://s3.amazonaws.com//big.bin") == b"0123456789"
+        manifest_url = [url for url in uploaded if url.endswith("/index.json")][0]
+        manifest = json.loads(uploaded.pop(manifest_url).decode("utf-8"))
+        (shard_url, shard_content), = uploaded.items()
+
+        assert manifest["version"] == 1
+        shard, = manifest["shards"]
+        assert shard_url == "https://s3.amazonaws.com//" + shard["key"]
+        assert shard["key"].startswith(".shards/")
+        assert shard["size"] == len(shard_content)
+        assert sorted((f["key"], f["size"]) for f in shard["files"]) == [("a.txt", 3), ("sub/b.txt", 2)]
+        for f in shard["files"]:
+            assert shard_content[f["offset"]:f["offset"] + f["size"]] in (b"aaa", b"bb")
+
+        with tarfile.open(fileobj=io.BytesIO(shard_content)) as tar:
+            assert sorted((m.name, tar.extractfile(m).read()) for m in tar) == [
+                ("a.txt", b"aaa"), ("sub/b.txt", b"bb")]
+
+
+class TestSyncDatasetFiles(object):
+    COMMAND = ["datasets", "files", "sync"]
+    LIST_OBJECTS_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">
+  <Prefix>/</Prefix>
+  <Contents><Key>/same.txt</Key><Size>4</Size><ETag>&quot;{}&quot;</ETag></Contents>
+  <Contents><Key>/changed.txt</Key><Size>4</Size><ETag>&quot;0123456789abcdef0123456789abcdef&quot;</ETag></Contents>
+  <Contents><Key>/stale.txt</Key><Size>4</Size><ETag>&quot;0123456789abcdef0123456789abcdef&quot;</ETag></Contents>
+</ListBucketResult>""".format(hashlib.md5(b"same").hexdigest())
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_upload_only_new_and_changed_files_and_delete_stale_ones(
+            self, get_patched, post_patched, put_patched, delete_patched, list_patched, tmpdir):
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = TestDeleteDatasetFiles.post
+        put_patched.return_value = MockResponse()
+        list_patched.return_value = MockResponse(content=self.LIST_OBJECTS_RESPONSE)
+        list_patched.return_value.text = self.LIST_OBJECTS_RESPONSE
+        source_dir = tmpdir.mkdir("data")
+        source_dir.join("same.txt").write_binary(b"same")
+        source_dir.join("changed.txt").write_binary(b"diff")
+        source_dir.join("new.txt").write_binary(b"new")
+
+        with mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_dir) + "/", "--delete"])
+
+        assert result.exit_code == 0, result.exc_info
+        assert "Uploaded 2 files, deleted 1 files, 1 files unchanged" in result.output
+        assert sorted(c[0][0] for c in put_patched.call_args_list) == [
+            "https://s3.amazonaws.com//changed.txt",
+            "https://s3.amazonaws.com//new.txt",
+        ]
+        bulk_deletes = [c for c in post_patched.call_args_list if c[0][0] == "https://s3.amazonaws.com/?delete"]
+        assert len(bulk_deletes) == 1
+        assert b"<Key>stale.txt</Key>" in bulk_deletes[0][1]["data"]
+        delete_patched.assert_not_called()
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_not_delete_remote_files_without_delete_flag(
+            self, get_patched, post_patched, put_patched, delete_patched, list_patched, tmpdir):
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = TestPutDatasetFiles.presign
+        put_patched.return_value = MockResponse()
+        list_patched.return_value = MockResponse(content=self.LIST_OBJECTS_RESPONSE)
+        list_patched.return_value.text = self.LIST_OBJECTS_RESPONSE
+        source_dir = tmpdir.mkdir("data")
+        source_dir.join("same.txt").write_binary(b"same")
+
+        with mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_dir) + "/"])
+
+        assert result.exit_code == 0, result.exc_info
+        assert "Uploaded 0 files, deleted 0 files, 1 files unchanged" in result.output
+        put_patched.assert_not_called()
+        delete_patched.assert_not_called()
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_recognize_files_uploaded_before_by_etag_that_is_not_md5_of_content(
+            self, get_patched, post_patched, put_patched, list_patched, tmpdir):
+        # SSE-KMS ETags look like MD5, ETags of other stores do not
+        etags = {"kms.txt": "0123456789abcdef0123456789abcdef", "other.txt": "0x8DB4F5E3C2A1B00"}
+        list_response = """<?xml version="1.0" encoding="UTF-8"?>
+<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">
+  <Prefix>/</Prefix>
+  <Contents><Key>/kms.txt</Key><Size>4</Size><ETag>&quot;{kms.txt}&quot;</ETag></Contents>
+  <Contents><Key>/other.txt</Key><Size>4</Size><ETag>&quot;{other.txt}&quot;</ETag></Contents>
+</ListBucketResult>""".replace("{kms.txt}", etags["kms.txt"]).replace("{other.txt}", etags["other.txt"])
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = TestPutDatasetFiles.presign
+        put_patched.side_effect = lambda url, **kwargs: MockResponse(
+            headers={"ETag": '"{}"'.format(etags[url.rsplit("/", 1)[-1]])})
+        list_patched.return_value = MockResponse(content=list_response)
+        list_patched.return_value.text = list_response
+        source_dir = tmpdir.mkdir("data")
+        source_dir.join("kms.txt").write_binary(b"same")
+        source_dir.join("other.txt").write_binary(b"same")
+
+        with mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            first_result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_dir) + "/"])
+            second_result = CliRunner().invoke(cli.cli, self.COMMAND + [
+                "--id=dsttn2y7j1ux882:1rn19s2", "--source-path", str(source_dir) + "/"])
+
+        assert first_result.exit_code == 0, first_result.exc_info
+        assert "Uploaded 2 files, deleted 0 files, 0 files unchanged" in first_result.output
+        assert "1 files could not be compared with remote objects by ETag" in first_result.output
+        assert second_result.exit_code == 0, second_result.exc_info
+        assert "Uploaded 0 files, deleted 0 files, 2 files unchanged" in second_result.output
+        assert put_patched.call_count == 2
+
+
+class TestDeleteDatasetFiles(object):
+    COMMAND = ["datasets", "files", "delete"]
+    DELETE_RESULT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<DeleteResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/"></DeleteResult>"""
+    DELETE_RESULT_WITH_ERROR = b"""<?xml version="1.0" encoding="UTF-8"?>
+<DeleteResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">
+  <Error><Key>same.txt</Key><Code>AccessDenied</Code><Message>Access Denied</Message></Error>
+</DeleteResult>"""
+
+    @classmethod
+    def post(cls, url, data=None, headers=None, json=None, **kwargs):
+        if url.startswith("https://s3.amazonaws.com"):
+            return MockResponse(content=cls.DELETE_RESULT)
+        return TestPutDatasetFiles.presign(json=json)
+
+    def setup_mocks(self, get_patched, post_patched, delete_patched, list_patched):
+        get_patched.return_value = MockResponse(example_responses.SHOW_DATASET_DETAILS_RESPONSE)
+        post_patched.side_effect = self.post
+        delete_patched.return_value = MockResponse()
+        list_patched.return_value = MockResponse(content=TestSyncDatasetFiles.LIST_OBJECTS_RESPONSE)
+        list_patched.return_value.text = TestSyncDatasetFiles.LIST_OBJECTS_RESPONSE
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_delete_listed_objects_with_single_bulk_request(
+            self, get_patched, post_patched, delete_patched, list_patched):
+        self.setup_mocks(get_patched, post_patched, delete_patched, list_patched)
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + ["--id=dsttn2y7j1ux882:1rn19s2", "--path", "/"])
+
+        assert result.exit_code == 0, result.exc_info
+        delete_patched.assert_not_called()
+        bulk_deletes = [c for c in post_patched.call_args_list if c[0][0] == "https://s3.amazonaws.com/?delete"]
+        assert len(bulk_deletes) == 1
+        body = bulk_deletes[0][1]["data"]
+        for key in (b"same.txt", b"changed.txt", b"stale.txt"):
+            assert b"<Key>" + key + b"</Key>" in body
+        assert bulk_deletes[0][1]["headers"]["Content-MD5"] == base64.b64encode(hashlib.md5(body).digest()).decode()
+
+        presign_calls = [c for call in post_patched.call_args_list if "json" in call[1]
+                         for c in call[1]["json"]["calls"]]
+        assert [c["method"] for c in presign_calls] == ["listObjectsV2", "deleteObjects"]
+        assert presign_calls[1]["params"]["Delete"]["Objects"] == [
+            {"Key": "same.txt"}, {"Key": "changed.txt"}, {"Key": "stale.txt"}]
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_fall_back_to_single_deletes_when_bulk_delete_is_not_supported(
+            self, get_patched, post_patched, delete_patched, list_patched):
+        self.setup_mocks(get_patched, post_patched, delete_patched, list_patched)
+
+        def post(url, **kwargs):
+            if url.startswith("https://s3.amazonaws.com"):
+                response = MockResponse(status_code=501)
+                response.text = "NotImplemented"
+                return response
+            return self.post(url, **kwargs)
+
+        post_patched.side_effect = post
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + ["--id=dsttn2y7j1ux882:1rn19s2", "--path", "/"])
+
+        assert result.exit_code == 0, result.exc_info
+        assert sorted(c[0][0] for c in delete_patched.call_args_list) == [
+            "https://s3.amazonaws.com/changed.txt",
+            "https://s3.amazonaws.com/same.txt",
+            "https://s3.amazonaws.com/stale.txt",
+        ]
+
+    @mock.patch("gradient.commands.datasets.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_report_keys_that_failed_to_be_deleted(
+            self, get_patched, post_patched, delete_patched, list_patched):
+        self.setup_mocks(get_patched, post_patched, delete_patched, list_patched)
+
+        def post(url, **kwargs):
+            if url.startswith("https://s3.amazonaws.com"):
+                return MockResponse(content=self.DELETE_RESULT_WITH_ERROR)
+            return self.post(url, **kwargs)
+
+        post_patched.side_effect = post
+
+        result = CliRunner().invoke(cli.cli, self.COMMAND + ["--id=dsttn2y7j1ux882:1rn19s2", "--path", "/"])
+
+        assert "Failed to delete same.txt: AccessDenied: Access Denied" in result.output
+        assert "Failed to delete 1 files" in result.output
+
+
+class TestPackedDatasetFiles(object):
+    DATASET_VERSION_ID = "--id=dsttn2y7j1ux882:1rn19s2"
+
+    def setup_method(self):
+        self.storage = FakeStorage({})
+
+    def invoke(self, tmpdir, command):
+        with mock.patch("gradient.commands.datasets.requests.get") as list_patched, \
+                mock.patch("gradient.commands.datasets.requests.head") as head_patched, \
+                mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get") as get_patched, \
+                mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post") as post_patched, \
+                mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put") as put_patched, \
+                mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete") as delete_patched, \
+                mock.patch.object(datasets_commands.config, "DATASETS_PACK_FILE_SIZE", 100), \
+                mock.patch.object(datasets_journal.config, "CONFIG_DIR_PATH", str(tmpdir.join("config"))):
+            self.storage.patch(get_patched, post_patched, list_patched, head_patched=head_patched,
+                               put_patched=put_patched, delete_patched=delete_patched)
+            result = CliRunner().invoke(cli.cli, ["datasets", "files"] + command + [self.DATASET_VERSION_ID])
+
+        assert result.exit_code == 0, result.exc_info
+        return result
+
+    def put_packed(self, tmpdir, files):
+        source_dir = tmpdir.join("source")
+        for key, content in files.items():
+            source_dir.join(*key.split("/")).write_binary(content, ensure=True)
+        self.invoke(tmpdir, ["put", "--source-path", str(source_dir) + "/", "--pack"])
+        return source_dir
+
+    def get_files(self, tmpdir):
+        target_dir = tmpdir.join("target")
+        if target_dir.exists():
+            target_dir.remove()
+        self.invoke(tmpdir, ["get", "--source-path", "/", "--target-path", str(target_dir)])
+        return {p.relto(target_dir): p.read_binary() for p in target_dir.visit() if p.isfile()}
+
+    def get_manifests(self):
+        return [json.loads(content.decode("utf-8")) for key, content in self.storage.objects.items()
+                if key.endswith("/index.json")]
+
+    def test_should_list_packed_files_but_not_objects_of_shards(self, tmpdir):
+        self.put_packed(tmpdir, {"data/a.txt": b"aaa", "data/sub/b.txt": b"bb"})
+
+        recursive_result = self.invoke(tmpdir, ["list", "--recursive", "true"])
+        root_result = self.invoke(tmpdir, ["list"])
+
+        assert "| data/a.txt     | 3    |" in recursive_result.output
+        assert "| data/sub/b.txt | 2    |" in recursive_result.output
+        assert "| data/ " in root_result.output
+        for result in (recursive_result, root_result):
+            assert ".shards" not in result.output
+
+    def test_should_keep_shards_and_unchanged_packed_files_when_syncing_with_delete(self, tmpdir):
+        source_dir = self.put_packed(tmpdir, {"data/a.txt": b"aaa", "data/sub/b.txt": b"bb"})
+        shard_keys = sorted(key for key in self.storage.objects if key.startswith(".shards/"))
+
+        result = self.invoke(tmpdir, ["sync", "--source-path", str(source_dir) + "/", "--delete"])
+
+        assert "Uploaded 0 files, deleted 0 files, 2 files unchanged" in result.output
+        assert sorted(self.storage.objects) == shard_keys
+        assert self.get_files(tmpdir) == {"data/a.txt": b"aaa", "data/sub/b.txt": b"bb"}
+
+    def test_should_remove_packed_files_missing_locally_when_syncing_with_delete(self, tmpdir):
+        source_dir = self.put_packed(tmpdir, {"data/a.txt": b"aaa", "data/sub/b.txt": b"bb"})
+        source_dir.join("data", "a.txt").remove()
+
+        result = self.invoke(tmpdir, ["sync", "--source-path", str(source_dir) + "/", "--delete"])
+
+        assert "Uploaded 0 files, deleted 1 files, 1 files unchanged" in result.output
+        manifest, = self.get_manifests()
+        assert [f["key"] for shard in manifest["shards"] for f in shard["files"]] == ["data/sub/b.txt"]
+        assert self.get_files(tmpdir) == {"data/sub/b.txt": b"bb"}
+
+    def test_should_delete_packed_files_and_shards_left_without_files(self, tmpdir):
+        self.put_packed(tmpdir, {"data/a.txt": b"aaa", "data/sub/b.txt": b"bb", "other.txt": b"o"})
+
+        self.invoke(tmpdir, ["delete", "--path", "/data/a.txt"])
+        assert self.get_files(tmpdir) == {"data/sub/b.txt": b"bb", "other.txt": b"o"}
+
+        self.invoke(tmpdir, ["delete", "--path", "/data/sub/b.txt"])
+        self.invoke(tmpdir, ["delete", "--path", "/other.txt"])
+        assert self.storage.objects == {}
+
+    def test_should_overwrite_packed_file_with_object_and_delete_both(self, tmpdir):
+        source_dir = self.put_packed(tmpdir, {"data/a.txt": b"aaa", "data/b.txt": b"bb"})
+        source_dir.join("data", "a.txt").write_binary(b"new")
+
+        self.invoke(tmpdir, ["put", "--source-path", str(source_dir.join("data", "a.txt")), "--target-path", "/data"])
+        listed = self.invoke(tmpdir, ["list", "--path", "/data"])
+        assert self.get_files(tmpdir) == {"data/a.txt": b"new", "data/b.txt": b"bb"}
+        assert listed.output.count("a.txt") == 1
+
+        self.invoke(tmpdir, ["delete", "--path", "/data/a.txt"])
+        assert self.get_files(tmpdir) == {"data/b.txt": b"bb"}
+
+    def test_should_replace_older_copies_when_files_are_packed_again(self, tmpdir):
+        self.storage.objects["data/a.txt"] = b"object"
+        source_dir = self.put_packed(tmpdir, {"data/a.txt": b"aaa", "data/b.txt": b"bb"})
+        assert self.storage.objects["data/a.txt"] == b"aaa"
+
+        source_dir.join("data", "b.txt").write_binary(b"new")
+        self.invoke(tmpdir, ["put", "--source-path", str(source_dir) + "/", "--pack"])
+
+        packed_keys = [f["key"] for manifest in self.get_manifests()
+                       for shard in manifest["shards"] for f in shard["files"]]
+        assert packed_keys == ["data/b.txt"]
+        assert self.get_files(tmpdir) == {"data/a.txt": b"aaa", "data/b.txt": b"new"}
+
+
+class TestGetMultipartPartSize(object):
+    def test_should_use_default_part_size_up_to_part_count_limit(self):
+        assert datasets_commands.get_multipart_part_size(int(60e9)) == datasets_commands.MULTIPART_CHUNK_SIZE
+        assert datasets_commands.get_multipart_part_size(int(150e9)) == datasets_commands.MULTIPART_CHUNK_SIZE
+
+    def test_should_grow_part_size_so_that_file_fits_in_part_count_limit(self):
+        size = int(500e9)
+        part_size = datasets_commands.get_multipart_part_size(size)
+
+        assert part_size % (1024 * 1024) == 0
+        assert size / part_size <= datasets_commands.MULTIPART_MAX_PARTS
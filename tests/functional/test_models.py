@@ -7,7 +7,7 @@ from click.testing import CliRunner
 
 from gradient.api_sdk.clients.http_client import default_headers
 from gradient.cli import cli
-from tests import example_responses, MockResponse
+from tests import example_responses, MockResponse, MockStreamResponse
 from tests.example_responses import LIST_MODEL_FILES_RESPONSE_JSON
 
 EXPECTED_HEADERS = default_headers.copy()
@@ -42,7 +42,7 @@ class TestModelsList(object):
     EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED = {
         "status": 401, "message": "No such API token"}
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_list_of_models(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.LIST_MODELS_RESPONSE_JSON)
@@ -58,7 +58,7 @@ class TestModelsList(object):
 
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_replate_api_key_in_headers_when_api_key_parameter_was_used(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.LIST_MODELS_RESPONSE_JSON)
@@ -75,7 +75,7 @@ class TestModelsList(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, models_list_config_path):
         get_patched.return_value = MockResponse(
             example_responses.LIST_MODELS_RESPONSE_JSON)
@@ -92,7 +92,7 @@ class TestModelsList(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_proper_message_when_no_models_were_found(
             self, get_patched):
         get_patched.return_value = MockResponse(
@@ -108,7 +108,7 @@ class TestModelsList(object):
 
         assert result.output == "No data found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, get_patched):
         get_patched.return_value = MockResponse(
             self.EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED, 401)
@@ -139,7 +139,7 @@ class TestDeleteModel(object):
     EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED = {
         "status": 400, "message": "Invalid API token"}
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_delete_command_was_executed(self, post_patched):
         post_patched.return_value = MockResponse(status_code=204)
 
@@ -156,7 +156,7 @@ class TestDeleteModel(object):
 
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_replace_api_key_in_headers_when_api_key_parameter_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=204)
 
@@ -174,7 +174,7 @@ class TestDeleteModel(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(self, post_patched, models_delete_config_path):
         post_patched.return_value = MockResponse(status_code=204)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + \
@@ -193,7 +193,7 @@ class TestDeleteModel(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_and_print_proper_message_when_model_with_given_id_was_not_found(
             self, post_patched):
         post_patched.return_value = MockResponse(
@@ -211,7 +211,7 @@ class TestDeleteModel(object):
 
         assert result.output == "Failed to delete resource: Unable to find model\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, post_patched):
         post_patched.return_value = MockResponse(
             self.EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED, 401)
@@ -264,7 +264,7 @@ class TestModelCreate(object):
 
     CREATE_MODEL_V2_REPONSE = example_responses.MODEL_CREATE_RESPONSE_JSON_V2
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_create_command_was_used_with_basic_options(
             self, post_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -282,7 +282,7 @@ class TestModelCreate(object):
                       params=self.BASE_PARAMS),
         ])
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_update_command_was_used_with_all_options(
             self, post_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -376,9 +376,9 @@ class TestModelUpload(object):
         "status": 400, "message": "Invalid API token"}
     UPDATE_TAGS_RESPONSE_JSON_200 = example_responses.UPDATE_TAGS_RESPONSE
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_update_command_was_used_with_basic_options(
             self, post_patched, put_patched, get_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -418,9 +418,9 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_update_command_was_used_with_all_options(
             self, post_patched, put_patched, get_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -459,9 +459,9 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_replace_api_key_in_headers_when_api_key_parameter_was_used(
             self, post_patched, put_patched, get_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -503,9 +503,9 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(
             self, post_patched, put_patched, get_patched, models_upload_config_path):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -547,7 +547,7 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, post_patched):
         post_patched.return_value = MockResponse(
             self.EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED, 401)
@@ -569,9 +569,9 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_proper_data_and_tag_machine(
             self, post_patched, put_patched, get_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -669,7 +669,7 @@ class TestModelDetails(object):
     EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED = {
         "status": 400, "message": "Invalid API token"}
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_details_of_model(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.MODEL_DETAILS_RESPONSE_JSON)
@@ -685,7 +685,7 @@ class TestModelDetails(object):
 
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_details_of_model_that_has_some_tags(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.MODEL_DETAILS_RESPONSE_JSON_WITH_TAGS)
@@ -701,7 +701,7 @@ class TestModelDetails(object):
 
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_replace_api_key_in_headers_when_api_key_parameter_was_used(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.MODEL_DETAILS_RESPONSE_JSON)
@@ -718,7 +718,7 @@ class TestModelDetails(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, models_details_config_path):
         get_patched.return_value = MockResponse(
             example_responses.MODEL_DETAILS_RESPONSE_JSON)
@@ -736,7 +736,7 @@ class TestModelDetails(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_proper_message_when_no_models_were_found(
             self, get_patched):
         get_patched.return_value = MockResponse(
@@ -752,7 +752,7 @@ class TestModelDetails(object):
 
         assert result.output == "Model not found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, get_patched):
         get_patched.return_value = MockResponse(
             self.EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED, 401)
@@ -776,48 +776,53 @@ class TestDownloadModelFiles(object):
 
     COMMAND = ["models", "download", "--id", "some_model_id",
                "--destinationDir", DESTINATION_DIR_PATH]
+    FILE_CONTENTS = {
+        "hello.txt": b"\"Hello Paperspace!\n\"",
+        "hello2.txt": b"\"Hello Paperspace 2\n\"",
+        "elo.txt": b"\"Elo\n\"",
+    }
 
     @classmethod
     def teardown_method(cls):
         shutil.rmtree(cls.DESTINATION_DIR_PATH)
 
+    @classmethod
+    def get_file(cls, url, headers=None, stream=False):
+        file_name = url.split("?")[0].rsplit("/", 1)[-1]
+        content = cls.FILE_CONTENTS[file_name]
+        if headers and headers.get("Range"):
+            offset = int(headers["Range"][len("bytes="):].rstrip("-"))
+            return MockStreamResponse(content[offset:], status_code=206)
+        return MockStreamResponse(content)
+
     @mock.patch("gradient.api_sdk.s3_downloader.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_get_a_list_of_files_and_download_them_to_defined_directory_when_download_command_was_executed(
-            self, get_patched,
+            self, api_get_patched, get_patched,
     ):
-        file_response_mock = mock.MagicMock()
-        file_response_mock.content = "\"Hello Paperspace!\n\""
-        file_response_mock_2 = mock.MagicMock()
-        file_response_mock_2.content = "\"Hello Paperspace 2\n\""
-        file_response_mock_3 = mock.MagicMock()
-        file_response_mock_3.content = "\"Elo\n\""
-        get_patched.side_effect = [
-            MockResponse(LIST_MODEL_FILES_RESPONSE_JSON),
-            file_response_mock,
-            file_response_mock_2,
-            file_response_mock_3,
-        ]
+        api_get_patched.return_value = MockResponse(LIST_MODEL_FILES_RESPONSE_JSON)
+        get_patched.side_effect = self.get_file
 
         result = self.runner.invoke(cli.cli, self.COMMAND)
 
+        api_get_patched.assert_called_once_with(self.LIST_FILES_URL,
+                                                headers=EXPECTED_HEADERS,
+                                                json={"links": True, "size": True, "id": "some_model_id"},
+                                                params=None)
         get_patched.assert_has_calls([
-            mock.call(self.LIST_FILES_URL,
-                      headers=EXPECTED_HEADERS,
-                      json={"links": True, "id": "some_model_id"},
-                      params=None),
             mock.call("https://ps-projects.s3.amazonaws.com/some/path/model/hello.txt?AWSAccessKeyId="
                       "some_aws_access_key_id&Expires=713274132&Signature=7CT5k6buEmZe5k5E7g6BXMs2xV4%3D&"
                       "response-content-disposition=attachment%3Bfilename%3D%22hello.txt%22&x-amz-security-token="
-                      "some_amz_security_token"),
+                      "some_amz_security_token", headers={}, stream=True),
             mock.call("https://ps-projects.s3.amazonaws.com/some/path/model/hello2.txt?AWSAccessKeyId="
                       "some_aws_access_key_id&Expires=713274132&Signature=L1lI47cNyiROzdYkf%2FF3Cm3165E%3D&"
                       "response-content-disposition=attachment%3Bfilename%3D%22hello2.txt%22&x-amz-security-token="
-                      "some_amz_security_token"),
+                      "some_amz_security_token", headers={}, stream=True),
             mock.call("https://ps-projects.s3.amazonaws.com/some/path/model/keton/elo.txt?AWSAccessKeyId="
                       "some_aws_access_key_id&Expires=713274132&Signature=tHriojGx03S%2FKkVGQGVI5CQRFTo%3D&"
                       "response-content-disposition=attachment%3Bfilename%3D%22elo.txt%22&x-amz-security-token="
-                      "some_amz_security_token"),
-        ])
+                      "some_amz_security_token", headers={}, stream=True),
+        ], any_order=True)
         assert os.path.exists(self.DESTINATION_DIR_PATH)
         assert os.path.isdir(self.DESTINATION_DIR_PATH)
         assert os.path.exists(os.path.join(self.DESTINATION_DIR_PATH, "keton"))
@@ -843,3 +848,86 @@ class TestDownloadModelFiles(object):
             assert h.read() == "\"Elo\n\""
 
         assert result.exit_code == 0
+
+    @mock.patch("gradient.api_sdk.s3_downloader.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_skip_downloaded_files_and_resume_partially_downloaded_ones(self, api_get_patched, get_patched):
+        files = [dict(f, size=len(self.FILE_CONTENTS[f["file"].rsplit("/", 1)[-1]]))
+                 for f in LIST_MODEL_FILES_RESPONSE_JSON]
+        api_get_patched.return_value = MockResponse(files)
+        get_patched.side_effect = self.get_file
+        os.makedirs(os.path.join(self.DESTINATION_DIR_PATH, "keton"))
+        with open(os.path.join(self.DESTINATION_DIR_PATH, "hello.txt"), "wb") as h:
+            h.write(self.FILE_CONTENTS["hello.txt"])
+        with open(os.path.join(self.DESTINATION_DIR_PATH, "keton", "elo.txt.download"), "wb") as h:
+            h.write(self.FILE_CONTENTS["elo.txt"][:3])
+
+        result = self.runner.invoke(cli.cli, self.COMMAND)
+
+        assert result.exit_code == 0, result.exc_info
+        requested = sorted((c[0][0].split("?")[0].rsplit("/", 1)[-1], c[1]["headers"])
+                           for c in get_patched.call_args_list)
+        assert requested == [("elo.txt", {"Range": "bytes=3-"}), ("hello2.txt", {})]
+        for path, file_name in (("hello.txt", "hello.txt"), ("hello2.txt", "hello2.txt"),
+                                (os.path.join("keton", "elo.txt"), "elo.txt")):
+            with open(os.path.join(self.DESTINATION_DIR_PATH, path), "rb") as h:
+                assert h.read() == self.FILE_CONTENTS[file_name]
+        assert sorted(os.listdir(os.path.join(self.DESTINATION_DIR_PATH, "keton"))) == ["elo.txt"]
+
+    @mock.patch("gradient.api_sdk.s3_downloader.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_move_completely_downloaded_file_into_place_without_requesting_it(
+            self, api_get_patched, get_patched):
+        files = [dict(f, size=len(self.FILE_CONTENTS[f["file"].rsplit("/", 1)[-1]]))
+                 for f in LIST_MODEL_FILES_RESPONSE_JSON]
+        api_get_patched.return_value = MockResponse(files)
+        get_patched.side_effect = self.get_file
+        os.makedirs(os.path.join(self.DESTINATION_DIR_PATH, "keton"))
+        with open(os.path.join(self.DESTINATION_DIR_PATH, "keton", "elo.txt.download"), "wb") as h:
+            h.write(self.FILE_CONTENTS["elo.txt"])
+
+        result = self.runner.invoke(cli.cli, self.COMMAND)
+
+        assert result.exit_code == 0, result.exc_info
+        requested = sorted(c[0][0].split("?")[0].rsplit("/", 1)[-1] for c in get_patched.call_args_list)
+        assert requested == ["hello.txt", "hello2.txt"]
+        with open(os.path.join(self.DESTINATION_DIR_PATH, "keton", "elo.txt"), "rb") as h:
+            assert h.read() == self.FILE_CONTENTS["elo.txt"]
+        assert sorted(os.listdir(os.path.join(self.DESTINATION_DIR_PATH, "keton"))) == ["elo.txt"]
+
+    @mock.patch("gradient.api_sdk.s3_downloader.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_keep_complete_partial_file_when_range_is_not_satisfiable_and_size_is_unknown(
+            self, api_get_patched, get_patched):
+        def get_file(url, headers=None, stream=False):
+            file_name = url.split("?")[0].rsplit("/", 1)[-1]
+            if file_name == "elo.txt" and headers:
+                return MockStreamResponse(b"", status_code=416, headers={
+                    "Content-Range": "bytes */{}".format(len(self.FILE_CONTENTS["elo.txt"]))})
+            return self.get_file(url, headers=headers, stream=stream)
+
+        api_get_patched.return_value = MockResponse(LIST_MODEL_FILES_RESPONSE_JSON)
+        get_patched.side_effect = get_file
+        os.makedirs(os.path.join(self.DESTINATION_DIR_PATH, "keton"))
+        with open(os.path.join(self.DESTINATION_DIR_PATH, "keton", "elo.txt.download"), "wb") as h:
+            h.write(self.FILE_CONTENTS["elo.txt"])
+
+        result = self.runner.invoke(cli.cli, self.COMMAND)
+
+        assert result.exit_code == 0, result.exc_info
+        elo_requests = [c[1]["headers"] for c in get_patched.call_args_list if "/elo.txt?" in c[0][0]]
+        assert elo_requests == [{"Range": "bytes={}-".format(len(self.FILE_CONTENTS["elo.txt"]))}]
+        with open(os.path.join(self.DESTINATION_DIR_PATH, "keton", "elo.txt"), "rb") as h:
+            assert h.read() == self.FILE_CONTENTS["elo.txt"]
+
+    @mock.patch("gradient.api_sdk.s3_downloader.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_not_show_signed_url_when_download_failed(self, api_get_patched, get_patched):
+        api_get_patched.return_value = MockResponse(LIST_MODEL_FILES_RESPONSE_JSON)
+        get_patched.return_value = MockStreamResponse(b"", status_code=403)
+
+        result = self.runner.invoke(cli.cli, self.COMMAND)
+
+        assert "resulted in error: 403" in result.output
+        assert "Signature" not in result.output
+        assert "x-amz-security-token" not in result.output
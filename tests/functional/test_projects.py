@@ -43,7 +43,7 @@ class TestListProjects(object):
     RESPONSE_JSON_WHEN_NO_PROJECTS_WERE_FOUND = {"data": [], "meta": {"totalItems": 0}}
     EXPECTED_STDOUT_WHEN_NO_PROJECTS_WERE_FOUND = "No data found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_and_print_table_when_projects_list_was_used(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -57,7 +57,7 @@ class TestListProjects(object):
                                        params=self.EXPECTED_PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_and_print_table_when_projects_list_was_used_with_filtering_by_tags(
             self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
@@ -72,7 +72,7 @@ class TestListProjects(object):
                                        params=self.EXPECTED_PARAMS_WITH_FILTERING_BY_TAGS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_projects_list_was_used_with_api_key_option(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -86,7 +86,7 @@ class TestListProjects(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, projects_list_config_path):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [projects_list_config_path]
@@ -101,7 +101,7 @@ class TestListProjects(object):
                                        params=self.EXPECTED_PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_projects_list_was_used_with_wrong_api_key(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -115,7 +115,7 @@ class TestListProjects(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_no_project_was_not_found(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WHEN_NO_PROJECTS_WERE_FOUND,
                                                 status_code=200)
@@ -130,7 +130,7 @@ class TestListProjects(object):
         assert result.output == self.EXPECTED_STDOUT_WHEN_NO_PROJECTS_WERE_FOUND
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_error_status_code_received_but_no_content_was_provided(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -229,7 +229,7 @@ class TestCreateProject(object):
     EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED = {"status": 400, "message": "Invalid API token"}
     EXPECTED_STDOUT_WHEN_WRONG_API_KEY_WAS_USED = "Failed to create resource: Invalid API token\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_and_print_proper_message_when_create_command_was_used(self, post_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON_WHEN_ALL_PARAMETERS_WERE_USED, 201)
 
@@ -246,7 +246,7 @@ class TestCreateProject(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_and_print_proper_message_when_create_command_was_used_with_all_options(
             self, post_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON_WHEN_ALL_PARAMETERS_WERE_USED, 201)
@@ -264,7 +264,7 @@ class TestCreateProject(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_replace_api_key_in_headers_when_api_key_parameter_was_used(self, post_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON, 201)
 
@@ -281,7 +281,7 @@ class TestCreateProject(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(self, post_patched, projects_create_config_path):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON, 201)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [projects_create_config_path]
@@ -297,7 +297,7 @@ class TestCreateProject(object):
                                              files=None,
                                              data=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_proper_message_when_error_message_received(self, post_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON_WITH_ERROR, 400)
 
@@ -313,7 +313,7 @@ class TestCreateProject(object):
 
         assert result.output == self.EXPECTED_STDOUT_WHEN_ERROR_RECEIVED
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, post_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED, 403)
 
@@ -330,7 +330,7 @@ class TestCreateProject(object):
         assert result.output == self.EXPECTED_STDOUT_WHEN_WRONG_API_KEY_WAS_USED
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_request_and_print_proper_message_when_error_code_returned_without_json_data(self,
                                                                                                      post_patched):
         post_patched.return_value = MockResponse(status_code=500)
@@ -348,9 +348,9 @@ class TestCreateProject(object):
         assert result.output == "Failed to create resource\n"
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_proper_data_and_tag_project(self, post_patched, get_patched, put_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON_WHEN_ALL_PARAMETERS_WERE_USED, 201)
         get_patched.return_value = MockResponse({}, 200, "fake content")
@@ -401,7 +401,7 @@ class TestDeleteProjects(object):
     EXPECTED_STDOUT_WHEN_PROJECT_IS_ALREADY_DELETED = \
         """Failed to delete resource: Project "some_project_id" is already deleted.\n"""
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_and_print_valid_message_when_delete_command_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=204)
 
@@ -417,7 +417,7 @@ class TestDeleteProjects(object):
                                         files=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_delete_was_used_with_api_key_option(self, post_patched):
         post_patched.return_value = MockResponse(status_code=204)
 
@@ -433,7 +433,7 @@ class TestDeleteProjects(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(self, post_patched, projects_delete_config_path):
         post_patched.return_value = MockResponse(status_code=204)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [projects_delete_config_path]
@@ -450,7 +450,7 @@ class TestDeleteProjects(object):
                                         files=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_delete_was_used_with_wrong_api_key(self, post_patched):
         post_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -466,7 +466,7 @@ class TestDeleteProjects(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_the_project_is_already_deleted(self, post_patched):
         post_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WHEN_PROJECT_IS_ALREADY_DELETED,
                                                  status_code=400)
@@ -483,12 +483,12 @@ class TestDeleteProjects(object):
         assert result.output == self.EXPECTED_STDOUT_WHEN_PROJECT_IS_ALREADY_DELETED
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_project_was_not_found(self, post_patched):
         # TODO: add test later when the API is fixed - it responds with invalid message
         pass
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_error_status_code_received_but_no_content_was_provided(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -549,7 +549,7 @@ class TestProjectsDetails(object):
     }
     EXPECTED_STDOUT_WHEN_PROJECT_WAS_NOT_FOUND = "Project not found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_and_print_table_when_projects_details_was_run(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON)
 
@@ -563,7 +563,7 @@ class TestProjectsDetails(object):
                                        params=self.EXPECTED_PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_and_print_table_when_projects_details_was_run_with_tags(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON_WITH_TAGS)
 
@@ -577,7 +577,7 @@ class TestProjectsDetails(object):
                                        params=self.EXPECTED_PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_projects_details_was_used_with_api_key_option(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON_WITH_TAGS)
 
@@ -591,7 +591,7 @@ class TestProjectsDetails(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_TAGS
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, projects_details_config_path):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON_WITH_TAGS)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [projects_details_config_path]
@@ -606,7 +606,7 @@ class TestProjectsDetails(object):
                                        params=self.EXPECTED_PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_projects_details_was_used_with_wrong_api_key(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -620,7 +620,7 @@ class TestProjectsDetails(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_project_was_not_found(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WHEN_PROJECT_WAS_NOT_FOUND)
 
@@ -634,7 +634,7 @@ class TestProjectsDetails(object):
         assert result.output == self.EXPECTED_STDOUT_WHEN_PROJECT_WAS_NOT_FOUND
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_error_status_code_received_but_no_content_was_provided(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -27,7 +27,7 @@ class TestSecretsList(object):
 +-----------------------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_list_of_secrets(self, get_patched):
         get_patched.return_value = MockResponse(self.LIST_SECRETS)
 
@@ -40,7 +40,7 @@ class TestSecretsList(object):
                                             json=None,
                                             params={})
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_list_of_secrets_with_id(self, get_patched):
         get_patched.return_value = MockResponse(self.LIST_SECRETS)
 
@@ -59,7 +59,7 @@ class TestSecretsSet(object):
 
     SET_STDOUT = "Set {} secret 'aws_access_key_id'\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
     def test_should_send_put_request_and_print_status(self, put_patched):
         put_patched.return_value = MockResponse()
 
@@ -74,7 +74,7 @@ class TestSecretsSet(object):
                                             data=None)
 
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
     def test_should_send_put_request_and_print_status_with_id(self, put_patched):
         put_patched.return_value = MockResponse()
 
@@ -95,7 +95,7 @@ class TestSecretsDelete(object):
 
     SET_STDOUT = "Deleted cluster secret 'aws_secret_access_key'\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
     def test_should_send_delete_request_and_print_status_with_id(self, delete_patched):
         delete_patched.return_value = MockResponse()
 
@@ -108,7 +108,7 @@ class TestSecretsDelete(object):
                                                params={},
                                                json=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
     def test_should_send_delete_request_and_print_status_with_id(self, delete_patched):
         delete_patched.return_value = MockResponse()
 
@@ -34,8 +34,8 @@ class TestEntityAddTags(object):
     UPDATE_TAGS_RESPONSE_JSON_200 = example_responses.UPDATE_TAGS_RESPONSE
     EXPECTED_STDOUT = "Tags added to %s\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     @pytest.mark.parametrize(
         "entity_command, entity, result_entity",
         [
@@ -71,8 +71,8 @@ class TestEntityAddTags(object):
 
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     @pytest.mark.parametrize(
         "entity_command, entity, result_entity",
         [
@@ -134,8 +134,8 @@ class TestEntityRemoveTags(object):
     UPDATE_TAGS_RESPONSE_JSON_200 = example_responses.UPDATE_TAGS_RESPONSE
     EXPECTED_STDOUT = "Tags removed from %s\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     @pytest.mark.parametrize(
         "entity_command, entity, result_entity",
         [
@@ -172,8 +172,8 @@ class TestEntityRemoveTags(object):
 
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     @pytest.mark.parametrize(
         "entity_command, entity, result_entity",
         [
@@ -1,12 +1,16 @@
+import io
 import os
 import shutil
 import tempfile
 import zipfile
 
 import mock
+import pytest
 
 import gradient.api_sdk.archivers
 import gradient.api_sdk.s3_uploader
+from gradient.api_sdk import sdk_exceptions
+from tests import MockResponse
 
 
 def create_file(dir_path, filename):
@@ -137,8 +141,170 @@ class TestZipArchiver(object):
         assert set(paths_in_extracted_dir.keys()) == expected_paths
 
 
+class TestParallelZipArchiver(object):
+    def create_model_dir(self, tmpdir):
+        model_dir = tmpdir.mkdir("model")
+        model_dir.join("config.json").write_binary(b'{"layers": 12}' * 1000)
+        model_dir.join("weights.pt").write_binary(b"weights" * 1000)
+        model_dir.mkdir("tokenizer").join("vocab.txt").write_binary(u"\u00e9t\u00e9\n".encode("utf-8") * 1000)
+        model_dir.join("random.bin").write_binary(os.urandom(1000))
+        model_dir.join("empty.txt").write_binary(b"")
+        return model_dir
+
+    def assert_archive_matches_dir(self, archive_path, model_dir):
+        with zipfile.ZipFile(archive_path) as zip_file:
+            assert zip_file.testzip() is None
+            infos = {info.filename: info for info in zip_file.infolist()}
+
+            assert sorted(infos) == ["config.json", "empty.txt", "random.bin", "tokenizer/vocab.txt", "weights.pt"]
+            for name, info in infos.items():
+                assert zip_file.read(info) == model_dir.join(*name.split("/")).read_binary()
+
+        return infos
+
+    def test_should_deflate_files_in_worker_processes_and_store_compressed_formats(self, tmpdir):
+        model_dir = self.create_model_dir(tmpdir)
+        archive_path = str(tmpdir.join("model.zip"))
+
+        gradient.api_sdk.archivers.ParallelZipArchiver(workers=2).archive(str(model_dir), archive_path)
+
+        infos = self.assert_archive_matches_dir(archive_path, model_dir)
+        assert infos["config.json"].compress_type == zipfile.ZIP_DEFLATED
+        assert infos["tokenizer/vocab.txt"].compress_type == zipfile.ZIP_DEFLATED
+        assert infos["weights.pt"].compress_type == zipfile.ZIP_STORED
+        assert infos["random.bin"].compress_type == zipfile.ZIP_STORED
+        assert sorted(p.basename for p in tmpdir.listdir()) == ["model", "model.zip"]
+
+    def test_should_write_zip64_records_when_limits_are_exceeded(self, tmpdir):
+        model_dir = self.create_model_dir(tmpdir)
+        archive_path = str(tmpdir.join("model.zip"))
+
+        with mock.patch.object(gradient.api_sdk.archivers, "ZIP64_LIMIT", 100), \
+                mock.patch.object(gradient.api_sdk.archivers, "ZIP_FILECOUNT_LIMIT", 2):
+            gradient.api_sdk.archivers.ParallelZipArchiver(workers=2).archive(str(model_dir), archive_path)
+
+        infos = self.assert_archive_matches_dir(archive_path, model_dir)
+        assert infos["weights.pt"].extract_version == 45
+
+
+class TestS3ModelUploader(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_upload_deflated_model_directory_and_remove_archive(self, get_patched, put_patched, tmpdir):
+        model_dir = tmpdir.mkdir("model")
+        model_dir.join("weights.pt").write_binary(b"weights")
+        archive_path = tmpdir.mkdir("upload").join("model.zip")
+        get_patched.return_value = MockResponse("https://s3.amazonaws.com/model.zip")
+        put_patched.return_value = MockResponse()
+        uploader = gradient.api_sdk.s3_uploader.S3ModelUploader("some_key")
+
+        with mock.patch.object(uploader, "_get_archive_path", return_value=str(archive_path)), \
+                mock.patch.object(gradient.api_sdk.s3_uploader.config, "MODELS_ARCHIVE_COMPRESS", True):
+            uploader.upload(str(model_dir), "some_model_id")
+
+        assert get_patched.call_args[1]["params"]["fileName"] == "model.zip"
+        put_patched.assert_called_once()
+        assert not tmpdir.join("upload").exists()
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_stream_stored_archive_of_model_directory_without_temporary_file(
+            self, get_patched, put_patched, tmpdir):
+        model_dir = TestStoredZipStream.create_model_dir(tmpdir)
+        sent = {}
+
+        def put(url, data=None, **kwargs):
+            sent["len"] = data.len
+            sent["body"] = data.read()
+            return MockResponse()
+
+        get_patched.return_value = MockResponse("https://s3.amazonaws.com/model.zip")
+        put_patched.side_effect = put
+        uploader = gradient.api_sdk.s3_uploader.S3ModelUploader("some_key")
+
+        with mock.patch.object(gradient.api_sdk.s3_uploader.tempfile, "mkdtemp") as mkdtemp_patched:
+            uploader.upload(str(model_dir), "some_model_id")
+
+        mkdtemp_patched.assert_not_called()
+        assert get_patched.call_args[1]["params"]["fileName"] == "model.zip"
+        assert len(sent["body"]) == sent["len"]
+        body = sent["body"]
+        archive = body[body.index(b"PK\003\004"):body.rindex(b"PK\005\006") + 22]
+        TestStoredZipStream.assert_archive_matches_dir(archive, model_dir)
+
+    def test_should_store_entries_unless_compression_is_turned_on(self, tmpdir):
+        model_dir = tmpdir.mkdir("model")
+        model_dir.join("config.json").write_binary(b'{"layers": 12}' * 1000)
+        uploader = gradient.api_sdk.s3_uploader.S3ModelUploader("some_key")
+
+        uploader._zip_model_directory(str(model_dir), str(tmpdir.join("stored.zip")))
+        with mock.patch.object(gradient.api_sdk.s3_uploader.config, "MODELS_ARCHIVE_COMPRESS", True), \
+                mock.patch.object(gradient.api_sdk.s3_uploader.config, "MODELS_ARCHIVE_WORKERS", 2):
+            uploader._zip_model_directory(str(model_dir), str(tmpdir.join("deflated.zip")))
+
+        with zipfile.ZipFile(str(tmpdir.join("stored.zip"))) as zip_file:
+            assert zip_file.getinfo("config.json").compress_type == zipfile.ZIP_STORED
+        with zipfile.ZipFile(str(tmpdir.join("deflated.zip"))) as zip_file:
+            assert zip_file.getinfo("config.json").compress_type == zipfile.ZIP_DEFLATED
+
+
+class TestStoredZipStream(object):
+    @staticmethod
+    def create_model_dir(tmpdir):
+        model_dir = tmpdir.mkdir("model")
+        model_dir.join("config.json").write_binary(b'{"layers": 12}' * 1000)
+        model_dir.join("weights.pt").write_binary(os.urandom(3000))
+        model_dir.mkdir("tokenizer").join("vocab.txt").write_binary(u"\u00e9t\u00e9\n".encode("utf-8") * 1000)
+        model_dir.join("empty.txt").write_binary(b"")
+        return model_dir
+
+    @staticmethod
+    def assert_archive_matches_dir(archive, model_dir):
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            assert zip_file.testzip() is None
+            infos = {info.filename: info for info in zip_file.infolist()}
+
+            assert sorted(infos) == ["config.json", "empty.txt", "tokenizer/vocab.txt", "weights.pt"]
+            for name, info in infos.items():
+                assert info.compress_type == zipfile.ZIP_STORED
+                assert zip_file.read(info) == model_dir.join(*name.split("/")).read_binary()
+
+    def test_should_build_archive_of_precomputed_size_while_it_is_read(self, tmpdir):
+        model_dir = self.create_model_dir(tmpdir)
+
+        stream = gradient.api_sdk.archivers.ZipArchiver().get_stream(str(model_dir))
+        size = stream.len
+        chunks = list(iter(lambda: stream.read(1000), b""))
+
+        archive = b"".join(chunks)
+        assert len(archive) == size
+        assert stream.len == 0
+        assert all(len(chunk) == 1000 for chunk in chunks[:-1])
+        self.assert_archive_matches_dir(archive, model_dir)
+
+    def test_should_write_zip64_records_when_limits_are_exceeded(self, tmpdir):
+        model_dir = self.create_model_dir(tmpdir)
+
+        with mock.patch.object(gradient.api_sdk.archivers, "ZIP64_LIMIT", 100), \
+                mock.patch.object(gradient.api_sdk.archivers, "ZIP_FILECOUNT_LIMIT", 2):
+            stream = gradient.api_sdk.archivers.ZipArchiver().get_stream(str(model_dir))
+            size = stream.len
+            archive = stream.read()
+
+        assert len(archive) == size
+        self.assert_archive_matches_dir(archive, model_dir)
+
+    def test_should_fail_when_file_changed_after_size_was_computed(self, tmpdir):
+        model_dir = self.create_model_dir(tmpdir)
+        stream = gradient.api_sdk.archivers.ZipArchiver().get_stream(str(model_dir))
+        model_dir.join("config.json").write_binary(b"{}")
+
+        with pytest.raises(IOError):
+            stream.read()
+
+
 class TestS3FileUploader(object):
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_upload_file_to_s3_and_get_bucket_url_when_upload_was_executed(self, post_patched):
         _, file_path = tempfile.mkstemp()
         uploader = gradient.api_sdk.s3_uploader.S3FileUploader()
@@ -146,3 +312,17 @@ class TestS3FileUploader(object):
         uploader.upload(file_path, "s3://some.url", {"key": "some_key"})
 
         post_patched.assert_called_once()
+
+
+class TestS3PutFileUploader(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    def test_should_not_send_streamed_file_again_when_upload_failed(self, put_patched, tmpdir):
+        file_path = tmpdir.join("model.zip")
+        file_path.write_binary(b"some content")
+        put_patched.return_value = MockResponse(status_code=503)
+        uploader = gradient.api_sdk.s3_uploader.S3PutFileUploader()
+
+        with pytest.raises(sdk_exceptions.S3UploadFailedError):
+            uploader.upload(str(file_path), "https://s3.amazonaws.com/model.zip")
+
+        put_patched.assert_called_once()
@@ -0,0 +1,66 @@
+import asyncio
+import copy
+import threading
+
+import mock
+
+from gradient.api_sdk.clients import AsyncSdkClient
+from gradient.api_sdk.clients import async_sdk_client
+from tests import example_responses, MockResponse
+
+
+def run(coroutine):
+    # run() is not available on Python 3.6
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestGather(object):
+    def test_should_return_results_in_order_and_never_exceed_limit(self):
+        running = []
+        max_running = []
+
+        async def job(i):
+            running.append(i)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(i)
+            return i
+
+        results = run(async_sdk_client.gather(*(job(i) for i in range(10)), limit=3))
+
+        assert results == list(range(10))
+        assert max(max_running) == 3
+
+
+class TestAsyncSdkClient(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_get_notebooks_concurrently_from_executor_threads(self, get_patched):
+        thread_names = set()
+
+        def get(*args, **kwargs):
+            thread_names.add(threading.current_thread().name)
+            return MockResponse(copy.deepcopy(example_responses.NOTEBOOK_GET_RESPONSE))
+
+        get_patched.side_effect = get
+
+        async def get_notebooks():
+            async with AsyncSdkClient(api_key="some_key", max_workers=4) as sdk:
+                return await sdk.gather(*(sdk.notebooks.get(id="n%d" % i) for i in range(8)), limit=4)
+
+        notebooks = run(get_notebooks())
+
+        assert len(notebooks) == 8
+        assert all(n.id == example_responses.NOTEBOOK_GET_RESPONSE["handle"] for n in notebooks)
+        assert get_patched.call_count == 8
+        assert threading.main_thread().name not in thread_names
+
+    def test_should_pass_streaming_methods_through_unchanged(self):
+        sdk = AsyncSdkClient(api_key="some_key")
+
+        assert not asyncio.iscoroutinefunction(sdk.notebooks.yield_logs)
+        assert asyncio.iscoroutinefunction(sdk.notebooks.list)
+        sdk.close()
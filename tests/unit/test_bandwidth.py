@@ -0,0 +1,71 @@
+import io
+import threading
+import time
+
+import mock
+
+from gradient.api_sdk import bandwidth
+
+
+class TestTokenBucket(object):
+    def test_should_wait_for_tokens_when_bucket_is_empty(self):
+        bucket = bandwidth.TokenBucket(rate=1000)
+        bucket.consume(1000)
+
+        start = time.monotonic()
+        bucket.consume(200)
+
+        assert time.monotonic() - start >= 0.15
+
+    def test_should_serve_high_priority_consumers_first(self):
+        bucket = bandwidth.TokenBucket(rate=100)
+        bucket.consume(100)
+        served = []
+
+        def consume(name, priority):
+            bucket.consume(30, priority)
+            served.append(name)
+
+        low = threading.Thread(target=consume, args=("low", bandwidth.PRIORITY_LOW))
+        high = threading.Thread(target=consume, args=("high", bandwidth.PRIORITY_HIGH))
+        low.start()
+        time.sleep(0.05)
+        high.start()
+        low.join()
+        high.join()
+
+        assert served == ["high", "low"]
+
+
+class TestBandwidthLimiter(object):
+    def test_should_return_body_as_is_when_there_are_no_limits(self):
+        limiter = bandwidth.BandwidthLimiter()
+        body = io.BytesIO(b"abc")
+
+        assert not limiter.enabled
+        assert limiter.wrap_reader(body) is body
+
+    def test_should_take_tokens_for_every_read_of_throttled_body(self):
+        limiter = bandwidth.BandwidthLimiter(rate=10 ** 9, transfer_rate=10 ** 9)
+        content = b"x" * (bandwidth.READ_SIZE * 2 + 10)
+
+        reader = limiter.wrap_reader(content, bandwidth.PRIORITY_LOW)
+
+        with mock.patch.object(limiter, "consume", wraps=limiter.consume) as consume_patched:
+            assert reader.len == len(content)
+            assert reader.read(5) == content[:5]
+            assert reader.read() == content[5:]
+
+        amounts = [c[0][0] for c in consume_patched.call_args_list]
+        assert sum(amounts) == len(content)
+        assert max(amounts) <= bandwidth.READ_SIZE
+        assert all(c[0][1] == bandwidth.PRIORITY_LOW for c in consume_patched.call_args_list)
+
+    def test_should_throttle_downloaded_chunks(self):
+        limiter = bandwidth.BandwidthLimiter(rate=1000)
+
+        start = time.monotonic()
+        chunks = list(limiter.iter_chunks([b"x" * 600, b"x" * 600]))
+
+        assert chunks == [b"x" * 600, b"x" * 600]
+        assert time.monotonic() - start >= 0.15
@@ -0,0 +1,81 @@
+import importlib
+import json
+import pkgutil
+import subprocess
+import sys
+
+import gradient.cli
+from gradient.cli import cli
+
+# time of "import gradient.main" which is paid by every "gradient <group> <cmd>" call
+IMPORT_TIME_BUDGET = 0.5
+
+MODULES_NOT_NEEDED_AT_STARTUP = [
+    "gradient_utils",
+    "gql",
+    "marshmallow",
+    "gradient.api_sdk.clients",
+    "gradient.api_sdk.repositories",
+    "gradient.api_sdk.serializers",
+    "gradient.cli.datasets",
+    "gradient.cli.notebooks",
+    "gradient.commands",
+]
+
+
+def run_python(code):
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def test_should_not_import_command_groups_and_sdk_when_starting_cli():
+    code = "\n".join([
+        "import json, sys, time",
+        "start = time.time()",
+        "import gradient.main",
+        "elapsed = time.time() - start",
+        "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))",
+    ])
+
+    result = run_python(code)
+
+    loaded = [name for name in MODULES_NOT_NEEDED_AT_STARTUP if name in result["modules"]]
+    assert loaded == []
+    assert result["elapsed"] < IMPORT_TIME_BUDGET, \
+        "import gradient.main took {:.3f}s, budget is {}s".format(result["elapsed"], IMPORT_TIME_BUDGET)
+
+
+def test_should_import_only_modules_of_invoked_command_group():
+    code = "\n".join([
+        "import json, sys",
+        "from click.testing import CliRunner",
+        "from gradient.cli import cli",
+        "result = CliRunner().invoke(cli.cli, ['datasets', '--help'])",
+        "print(json.dumps({'exit_code': result.exit_code, 'modules': sorted(sys.modules)}))",
+    ])
+
+    result = run_python(code)
+
+    assert result["exit_code"] == 0
+    assert "gradient.cli.datasets" in result["modules"]
+    assert "gradient.cli.notebooks" not in result["modules"]
+    assert "gradient.cli.gradient_deployments" not in result["modules"]
+
+
+def test_lazy_commands_should_cover_all_commands_registered_by_cli_modules():
+    for module_info in pkgutil.iter_modules(gradient.cli.__path__):
+        importlib.import_module("gradient.cli." + module_info.name)
+
+    assert set(cli.cli.commands) == set(cli.LAZY_COMMANDS) | {"version"}
+
+
+def test_should_expose_sdk_names_from_lazy_loaded_packages():
+    import gradient
+    from gradient import api_sdk
+    from gradient.api_sdk.clients import SdkClient
+    from gradient.api_sdk.sdk_exceptions import GradientSdkError
+
+    assert gradient.SdkClient is SdkClient
+    assert api_sdk.SdkClient is SdkClient
+    assert api_sdk.GradientSdkError is GradientSdkError
+    assert "SdkClient" in dir(gradient)
@@ -0,0 +1,154 @@
+import hashlib
+
+import mock
+
+from gradient.commands.datasets_journal import EtagHasher, FileHashCache, ListingCache, UploadJournal
+
+
+class TestUploadJournal(object):
+    def test_should_remember_completed_objects_by_size_and_mtime(self, tmpdir):
+        journal = UploadJournal(str(tmpdir.join("journal.sqlite")))
+
+        journal.complete_object("dsttn2y7j1ux882:1rn19s2", "/some/key", 10, 123)
+
+        assert journal.is_object_completed("dsttn2y7j1ux882:1rn19s2", "/some/key", 10, 123)
+        assert not journal.is_object_completed("dsttn2y7j1ux882:1rn19s2", "/some/key", 10, 124)
+        assert not journal.is_object_completed("dsttn2y7j1ux882:1rn19s2", "/some/key", 11, 123)
+        assert not journal.is_object_completed("dsttn2y7j1ux882:other", "/some/key", 10, 123)
+
+    def test_should_keep_progress_of_multipart_uploads_between_runs(self, tmpdir):
+        path = str(tmpdir.join("journal.sqlite"))
+        journal = UploadJournal(path)
+        journal.start_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/big", 25, 123, "some_upload_id", 10)
+        journal.complete_part("some_upload_id", 1, "etag-1")
+        journal.complete_part("some_upload_id", 3, "etag-3")
+        journal.close()
+
+        journal = UploadJournal(path)
+
+        assert journal.get_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/big", 25, 123) == (
+            "some_upload_id", 10, {1: "etag-1", 3: "etag-3"})
+        assert journal.get_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/big", 25, 124) is None
+
+    def test_should_forget_multipart_upload_when_object_was_completed(self, tmpdir):
+        journal = UploadJournal(str(tmpdir.join("journal.sqlite")))
+        journal.start_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/big", 25, 123, "some_upload_id", 10)
+        journal.complete_part("some_upload_id", 1, "etag-1")
+
+        journal.complete_object("dsttn2y7j1ux882:1rn19s2", "/big", 25, 123)
+
+        assert journal.get_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/big", 25, 123) is None
+
+    def test_should_replace_stale_multipart_upload_of_changed_file(self, tmpdir):
+        journal = UploadJournal(str(tmpdir.join("journal.sqlite")))
+        journal.start_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/big", 25, 123, "old_upload_id", 10)
+        journal.complete_part("old_upload_id", 1, "etag-1")
+
+        journal.start_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/big", 30, 456, "new_upload_id", 10)
+
+        assert journal.get_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/big", 25, 123) is None
+        assert journal.get_multipart_upload("dsttn2y7j1ux882:1rn19s2", "/big", 30, 456) == ("new_upload_id", 10, {})
+
+
+class TestFileHashCache(object):
+    def test_should_compute_md5_of_single_part_file(self, tmpdir):
+        path = tmpdir.join("file.txt")
+        path.write_binary(b"0123456789abcdefghijKLMNO")
+
+        assert FileHashCache.compute_etag(str(path)) == hashlib.md5(b"0123456789abcdefghijKLMNO").hexdigest()
+
+    def test_should_compute_etag_of_multipart_upload(self, tmpdir):
+        path = tmpdir.join("file.txt")
+        path.write_binary(b"0123456789abcdefghijKLMNO")
+        digests = b"".join(hashlib.md5(part).digest() for part in (b"0123456789", b"abcdefghij", b"KLMNO"))
+
+        assert FileHashCache.compute_etag(str(path), 10) == hashlib.md5(digests).hexdigest() + "-3"
+
+    def test_should_reuse_etag_until_file_changes(self, tmpdir):
+        cache = FileHashCache(str(tmpdir.join("cache.sqlite")))
+        path = tmpdir.join("file.txt")
+        path.write_binary(b"abc")
+
+        assert cache.get_etag(str(path)) == hashlib.md5(b"abc").hexdigest()
+        with mock.patch.object(FileHashCache, "compute_etag") as compute_etag_patched:
+            assert cache.get_etag(str(path)) == hashlib.md5(b"abc").hexdigest()
+            compute_etag_patched.assert_not_called()
+
+        path.write_binary(b"abcd")
+
+        assert cache.get_etag(str(path)) == hashlib.md5(b"abcd").hexdigest()
+
+    def test_should_remember_etags_of_uploads_until_file_changes(self, tmpdir):
+        cache = FileHashCache(str(tmpdir.join("cache.sqlite")))
+        path = tmpdir.join("file.txt")
+        path.write_binary(b"abc")
+
+        cache.record_upload(str(path), "kms-etag")
+
+        assert cache.is_uploaded(str(path), "kms-etag")
+        assert not cache.is_uploaded(str(path), "other-etag")
+
+        path.write_binary(b"abcd")
+
+        assert not cache.is_uploaded(str(path), "kms-etag")
+
+
+class TestEtagHasher(object):
+    def test_should_compute_multipart_etag_from_chunks_crossing_part_boundaries(self, tmpdir):
+        content = b"0123456789abcdefghijKLMNO"
+        tmpdir.join("file").write_binary(content)
+        hasher = EtagHasher(part_size=10)
+
+        for i in range(0, len(content), 7):
+            hasher.update(content[i:i + 7])
+
+        assert hasher.hexdigest() == FileHashCache.compute_etag(str(tmpdir.join("file")), 10)
+        assert hasher.get_part_digests() == [hashlib.md5(content[i:i + 10]).digest() for i in range(0, 25, 10)]
+
+    def test_should_compute_plain_md5_without_part_size(self):
+        hasher = EtagHasher()
+        hasher.update(b"abc")
+        hasher.update(b"def")
+
+        assert hasher.hexdigest() == hashlib.md5(b"abcdef").hexdigest()
+
+
+class TestListingCache(object):
+    def test_should_answer_prefix_queries_with_keys_under_prefix_only(self, tmpdir):
+        cache = ListingCache(str(tmpdir.join("cache.sqlite")))
+        cache.add_objects("dataset:1", [
+            {"key": "/a/1.txt", "size": "1", "etag": "etag1"},
+            {"key": "/a.txt", "size": "2"},
+            {"key": "/a/b/2.txt", "size": "3"},
+            {"key": "/b/3.txt", "size": "4"},
+        ])
+        cache.add_objects("dataset:2", [{"key": "/a/4.txt", "size": "5"}])
+
+        assert list(cache.iter_objects("dataset:1", "/a/")) == [
+            {"key": "/a/1.txt", "size": "1", "etag": "etag1"},
+            {"key": "/a/b/2.txt", "size": "3"},
+        ]
+        assert [o["key"] for o in cache.iter_objects("dataset:1", "")] == [
+            "/a.txt", "/a/1.txt", "/a/b/2.txt", "/b/3.txt"]
+
+    def test_should_read_results_in_batches(self, tmpdir):
+        cache = ListingCache(str(tmpdir.join("cache.sqlite")))
+        keys = ["/{:03}.txt".format(i) for i in range(7)]
+        cache.add_objects("dataset:1", [{"key": key, "size": "1"} for key in keys])
+
+        with mock.patch.object(ListingCache, "FETCH_SIZE", 3):
+            assert [o["key"] for o in cache.iter_objects("dataset:1", "/")] == keys
+
+    def test_should_treat_subdirectories_of_listed_prefix_as_listed(self, tmpdir):
+        path = str(tmpdir.join("cache.sqlite"))
+        cache = ListingCache(path)
+        cache.set_committed("dataset:1")
+        cache.set_listed("dataset:1", "/a/")
+        cache.close()
+
+        cache = ListingCache(path)
+        assert cache.is_committed("dataset:1")
+        assert not cache.is_committed("dataset:2")
+        assert cache.is_listed("dataset:1", "/a/b/")
+        assert not cache.is_listed("dataset:1", "/")
+        assert not cache.is_listed("dataset:2", "/a/")
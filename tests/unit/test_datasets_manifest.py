@@ -0,0 +1,38 @@
+import io
+
+import pytest
+
+from gradient.commands.datasets_manifest import find_objects, read_manifest, write_manifest
+
+
+def test_should_read_written_manifest():
+    f = io.StringIO()
+    count = write_manifest(f, "dataset:1", [
+        {"key": "a.txt", "size": "3", "etag": "etag1"},
+        {"key": "b/c.txt", "size": "5", "sha256": "abc"},
+    ])
+    f.seek(0)
+
+    assert count == 2
+    assert read_manifest(f) == ("dataset:1", [
+        {"key": "a.txt", "size": 3, "etag": "etag1", "sha256": None},
+        {"key": "b/c.txt", "size": 5, "etag": None, "sha256": "abc"},
+    ])
+
+
+def test_should_reject_unknown_manifest_version():
+    with pytest.raises(ValueError):
+        read_manifest(io.StringIO('{"version": 99, "datasetVersionId": "dataset:1"}\n'))
+
+
+class TestFindObjects(object):
+    OBJECTS = [{"key": "a"}, {"key": "a/b.txt"}, {"key": "a/c/d.txt"}, {"key": "ab.txt"}]
+
+    def test_should_find_single_file(self):
+        assert find_objects(self.OBJECTS, "/a/b.txt") == ([{"key": "a/b.txt"}], True)
+
+    def test_should_find_files_in_directory(self):
+        assert find_objects(self.OBJECTS, "/a/") == ([{"key": "a/b.txt"}, {"key": "a/c/d.txt"}], False)
+
+    def test_should_find_all_files_of_root_directory(self):
+        assert find_objects(self.OBJECTS, "/") == (self.OBJECTS, False)
@@ -0,0 +1,158 @@
+import threading
+
+import mock
+import pytest
+
+from gradient.api_sdk.models.dataset_version import DatasetVersionPreSignedURL
+from gradient.commands.datasets_pipeline import PrefixLister, PreSignedUrl, PreSignedUrlSigner, SigningPipeline
+
+
+class FakeClient(object):
+    def __init__(self, expires_in=3600):
+        self.expires_in = expires_in
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def generate_pre_signed_s3_urls(self, dataset_version_id, calls):
+        with self._lock:
+            self.batch_sizes.append(len(calls))
+            return [DatasetVersionPreSignedURL(
+                url="https://s3.amazonaws.com/{}?v={}".format(call["params"]["Key"], len(self.batch_sizes)),
+                expires_in=self.expires_in,
+            ) for call in calls]
+
+
+def get_call(item):
+    return dict(method="getObject", params=dict(Key=item))
+
+
+class TestSigningPipeline(object):
+    def test_should_sign_items_in_batches_and_submit_them_in_order(self):
+        client = FakeClient()
+        signer = PreSignedUrlSigner(client, "dsttn2y7j1ux882:1rn19s2")
+        submitted = []
+
+        SigningPipeline(signer, batch_size=100).run(
+            (str(i) for i in range(250)),
+            get_call=get_call,
+            submit=lambda item, pre_signed: submitted.append((item, pre_signed.url.partition("?")[0])),
+        )
+
+        assert submitted == [(str(i), "https://s3.amazonaws.com/{}".format(i)) for i in range(250)]
+        assert sum(client.batch_sizes) == 250
+        assert max(client.batch_sizes) <= 100
+
+    def test_should_raise_exception_from_lister(self):
+        signer = PreSignedUrlSigner(FakeClient(), "dsttn2y7j1ux882:1rn19s2")
+
+        def items():
+            yield "some_key"
+            raise ValueError("listing failed")
+
+        with pytest.raises(ValueError):
+            SigningPipeline(signer).run(items(), get_call=get_call, submit=lambda *args: None)
+
+    def test_should_stop_when_asked_to(self):
+        signer = PreSignedUrlSigner(FakeClient(), "dsttn2y7j1ux882:1rn19s2")
+        submitted = []
+
+        SigningPipeline(signer, batch_size=10).run(
+            (str(i) for i in range(10000)),
+            get_call=get_call,
+            submit=lambda item, pre_signed: submitted.append(item),
+            should_stop=lambda: len(submitted) >= 5,
+        )
+
+        assert len(submitted) == 5
+
+
+class TestPreSignedUrl(object):
+    def test_should_sign_url_again_when_it_is_about_to_expire(self):
+        client = FakeClient(expires_in=30)
+        signer = PreSignedUrlSigner(client, "dsttn2y7j1ux882:1rn19s2", refresh_margin=60)
+        pre_signed = signer.sign([get_call("some_key")])[0]
+
+        assert pre_signed.url == "https://s3.amazonaws.com/some_key?v=2"
+        assert client.batch_sizes == [1, 1]
+
+    def test_should_reuse_url_that_does_not_expire_soon(self):
+        client = FakeClient(expires_in=3600)
+        signer = PreSignedUrlSigner(client, "dsttn2y7j1ux882:1rn19s2", refresh_margin=60)
+        pre_signed = signer.sign([get_call("some_key")])[0]
+
+        assert pre_signed.url == "https://s3.amazonaws.com/some_key?v=1"
+        assert client.batch_sizes == [1]
+
+    def test_should_not_refresh_url_without_expiration(self):
+        signer = mock.Mock(refresh_margin=60)
+        pre_signed = PreSignedUrl(signer, get_call("some_key"), "https://s3.amazonaws.com/some_key")
+
+        assert pre_signed.url == "https://s3.amazonaws.com/some_key"
+        signer.sign_call.assert_not_called()
+
+
+class FakeBucket(object):
+    """Serves listObjectsV2-like pages of two items for a tree of prefixes"""
+
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+        self.listed_prefixes = []
+        self._lock = threading.Lock()
+
+    def list_page(self, prefix, continuation_token):
+        with self._lock:
+            self.listed_prefixes.append(prefix)
+
+        objects = []
+        common_prefixes = []
+        for key in self.keys:
+            if not key.startswith(prefix):
+                continue
+            rest = key[len(prefix):]
+            if "/" in rest:
+                common_prefix = prefix + rest.split("/")[0] + "/"
+                if common_prefix not in common_prefixes:
+                    common_prefixes.append(common_prefix)
+            else:
+                objects.append({"key": key})
+
+        start = int(continuation_token or 0)
+        page = objects[start:start + 2]
+        next_token = str(start + 2) if start + 2 < len(objects) else None
+        return page, common_prefixes if continuation_token is None else [], next_token
+
+
+class TestPrefixLister(object):
+    KEYS = ["/a.txt", "/b.txt", "/c.txt", "/dir/d.txt", "/dir/sub/e.txt", "/other/f.txt", "/other/g.txt"]
+
+    def test_should_list_all_objects_under_prefix_including_subdirectories(self):
+        bucket = FakeBucket(self.KEYS)
+
+        keys = [result["key"] for result in PrefixLister(bucket.list_page, concurrency=3).iter_objects("/")]
+
+        assert sorted(keys) == self.KEYS
+        assert sorted(set(bucket.listed_prefixes)) == ["/", "/dir/", "/dir/sub/", "/other/"]
+
+    def test_should_raise_exception_of_failed_listing(self):
+        def list_page(prefix, continuation_token):
+            if prefix == "/":
+                return [], ["/dir/"], None
+            raise ValueError("listing failed")
+
+        with pytest.raises(ValueError):
+            list(PrefixLister(list_page, concurrency=2).iter_objects("/"))
+
+    def test_should_stop_listing_when_consumer_stops(self):
+        calls = []
+
+        def list_page(prefix, continuation_token):
+            calls.append(continuation_token)
+            token = int(continuation_token or 0) + 1
+            return [{"key": "/{}".format(token)}], [], str(token)
+
+        results = PrefixLister(list_page, concurrency=1, queue_size=1).iter_objects("/")
+        assert next(results) == {"key": "/1"}
+        results.close()
+
+        assert len(calls) <= 3
+
@@ -0,0 +1,119 @@
+import hashlib
+import io
+import json
+import tarfile
+
+import pytest
+
+from gradient.commands.datasets_shards import ChunksReader, TarShard, dump_manifest, extract_members, \
+    is_under_path, load_manifest, remove_files
+
+
+class TestChunksReader(object):
+    def test_should_read_across_chunk_boundaries(self):
+        reader = ChunksReader([b"abc", b"", b"defg", b"h"], length=8)
+
+        assert reader.len == 8
+        assert reader.read(2) == b"ab"
+        assert reader.read(3) == b"cde"
+        assert reader.read() == b"fgh"
+        assert reader.read(1) == b""
+
+
+class TestTarShard(object):
+    def test_should_stream_tar_archive_of_exactly_precomputed_size(self, tmpdir):
+        tmpdir.join("a.txt").write_binary(b"aaa")
+        tmpdir.join("b.bin").write_binary(b"b" * 1000)
+        shard = TarShard("/.shards/some_id/0.tar")
+        shard.add(str(tmpdir.join("a.txt")), "/data/a.txt", 3, 1500000000.5)
+        shard.add(str(tmpdir.join("b.bin")), "/data/b.bin", 1000)
+
+        content = shard.open().read()
+
+        assert len(content) == shard.size
+        with tarfile.open(fileobj=io.BytesIO(content)) as tar:
+            members = tar.getmembers()
+            assert [(m.name, m.size) for m in members] == [("data/a.txt", 3), ("data/b.bin", 1000)]
+            assert members[0].mtime == 1500000000
+            assert tar.extractfile(members[1]).read() == b"b" * 1000
+
+        for f in shard.get_manifest_entry()["files"]:
+            assert content[f["offset"]:f["offset"] + f["size"]] in (b"aaa", b"b" * 1000)
+
+    def test_should_fail_when_file_was_truncated_after_it_was_added(self, tmpdir):
+        tmpdir.join("a.txt").write_binary(b"aaa")
+        shard = TarShard("/.shards/some_id/0.tar")
+        shard.add(str(tmpdir.join("a.txt")), "/a.txt", 3)
+        tmpdir.join("a.txt").write_binary(b"a")
+
+        with pytest.raises(IOError):
+            shard.open().read()
+
+
+class TestManifest(object):
+    def test_should_load_dumped_manifest(self, tmpdir):
+        tmpdir.join("a.txt").write_binary(b"aaa")
+        shard = TarShard("/.shards/some_id/0.tar")
+        shard.add(str(tmpdir.join("a.txt")), "/a.txt", 3)
+
+        shards = load_manifest(dump_manifest([shard]))
+
+        assert shards == [{"key": ".shards/some_id/0.tar", "size": shard.size,
+                           "files": [{"key": "a.txt", "size": 3, "offset": 512}]}]
+
+    def test_should_reject_unknown_manifest_version(self):
+        with pytest.raises(ValueError):
+            load_manifest(json.dumps({"version": 99, "shards": []}))
+
+    def test_should_add_md5_of_files_to_manifest_once_shard_was_read(self, tmpdir):
+        tmpdir.join("a.txt").write_binary(b"aaa")
+        shard = TarShard("/.shards/some_id/0.tar")
+        shard.add(str(tmpdir.join("a.txt")), "/a.txt", 3)
+        shard.open().read()
+
+        shards = load_manifest(dump_manifest([shard]))
+
+        assert shards[0]["files"][0]["etag"] == hashlib.md5(b"aaa").hexdigest()
+
+    def test_should_remove_files_and_report_shards_left_without_files(self):
+        shards = [
+            {"key": ".shards/some_id/0.tar", "size": 3072,
+             "files": [{"key": "data/a.txt", "size": 3, "offset": 512}, {"key": "b.txt", "size": 2, "offset": 1536}]},
+            {"key": ".shards/some_id/1.tar", "size": 2048, "files": [{"key": "data/c.txt", "size": 1, "offset": 512}]},
+        ]
+
+        kept_shards, emptied_keys, removed_count = remove_files(shards, lambda key: key.startswith("data/"))
+
+        assert kept_shards == [{"key": ".shards/some_id/0.tar", "size": 3072,
+                                "files": [{"key": "b.txt", "size": 2, "offset": 1536}]}]
+        assert emptied_keys == [".shards/some_id/1.tar"]
+        assert removed_count == 2
+        assert len(shards[0]["files"]) == 2
+
+
+@pytest.mark.parametrize("key,path,expected", [
+    ("data/a.txt", "/", True),
+    ("data/a.txt", "/data/", True),
+    ("data/a.txt", "/data", True),
+    ("data/a.txt", "/data/a.txt", True),
+    ("data/a.txt.bak", "/data/a.txt", False),
+    ("database/a.txt", "/data", False),
+    ("data/a.txt", "/data/a.txt/", False),
+])
+def test_should_match_packed_files_under_dataset_path(key, path, expected):
+    assert is_under_path(key, path) is expected
+
+
+def test_should_extract_only_requested_members(tmpdir):
+    tmpdir.join("a.txt").write_binary(b"aaa")
+    tmpdir.join("b.txt").write_binary(b"bb")
+    shard = TarShard("/.shards/some_id/0.tar")
+    shard.add(str(tmpdir.join("a.txt")), "/a.txt", 3)
+    shard.add(str(tmpdir.join("b.txt")), "/b.txt", 2)
+    target = tmpdir.mkdir("target")
+
+    extracted = extract_members(shard.open(), {"b.txt": str(target.join("sub", "b.txt"))})
+
+    assert extracted == [str(target.join("sub", "b.txt"))]
+    assert target.join("sub", "b.txt").read_binary() == b"bb"
+    assert [p.basename for p in target.join("sub").listdir()] == ["b.txt"]
@@ -0,0 +1,105 @@
+import threading
+
+import mock
+
+from gradient.commands.datasets import AdaptiveConcurrency, WorkerPool
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status_code=200, size=0):
+    return mock.Mock(status_code=status_code, headers={"Content-Length": str(size)}, request=mock.Mock(headers={}))
+
+
+class TestAdaptiveConcurrency(object):
+    def fill(self, concurrency):
+        for _ in range(concurrency.limit):
+            assert concurrency.acquire(timeout=0)
+
+    def test_should_grow_limit_by_one_while_all_workers_are_busy_and_throughput_holds(self):
+        clock = FakeClock()
+        concurrency = AdaptiveConcurrency(min_limit=2, max_limit=4, interval=1, clock=clock)
+
+        for expected_limit in (3, 4, 4):
+            limit = concurrency.limit
+            self.fill(concurrency)
+            concurrency.on_response(response(size=1000 * limit))
+            clock.now += 1
+            for _ in range(limit):
+                concurrency.release()
+
+            assert concurrency.limit == expected_limit
+
+    def test_should_not_grow_limit_when_workers_are_idle(self):
+        clock = FakeClock()
+        concurrency = AdaptiveConcurrency(min_limit=2, max_limit=8, interval=1, clock=clock)
+
+        assert concurrency.acquire(timeout=0)
+        clock.now += 1
+        concurrency.on_response(response(size=1000))
+
+        assert concurrency.limit == 2
+
+    def test_should_cut_limit_in_half_when_storage_provider_throttles_requests(self):
+        clock = FakeClock()
+        concurrency = AdaptiveConcurrency(min_limit=2, max_limit=32, initial_limit=16, interval=1, clock=clock)
+
+        concurrency.on_response(response(status_code=503))
+        clock.now += 1
+        concurrency.on_response(response())
+
+        assert concurrency.limit == 8
+
+    def test_should_never_go_below_min_limit(self):
+        clock = FakeClock()
+        concurrency = AdaptiveConcurrency(min_limit=2, max_limit=32, initial_limit=3, interval=1, clock=clock)
+
+        for _ in range(3):
+            clock.now += 1
+            concurrency.on_response(response(status_code=500))
+
+        assert concurrency.limit == 2
+
+    def test_should_block_workers_above_limit(self):
+        concurrency = AdaptiveConcurrency(min_limit=1, max_limit=1)
+
+        assert concurrency.acquire(timeout=0)
+        assert not concurrency.acquire(timeout=0.01)
+
+        concurrency.release()
+
+        assert concurrency.acquire(timeout=0)
+
+
+class TestWorkerPool(object):
+    def test_should_run_all_work_in_adaptive_mode(self):
+        done = []
+        lock = threading.Lock()
+
+        def work(i):
+            with lock:
+                done.append(i)
+
+        with mock.patch("gradient.commands.datasets.config.DATASETS_MIN_CONCURRENCY", 1), \
+                mock.patch("gradient.commands.datasets.config.DATASETS_MAX_CONCURRENCY", 4):
+            with WorkerPool(adaptive=True) as pool:
+                assert pool.worker_count == 4
+                assert pool.active_worker_limit == 1
+                for i in range(20):
+                    pool.put(work, i)
+
+        assert sorted(done) == list(range(20))
+        assert pool.get_progress() == "20, 1 workers"
+
+    def test_should_show_only_completed_count_in_fixed_mode(self):
+        with WorkerPool(count=2, adaptive=False) as pool:
+            pool.put(lambda: None)
+
+        assert pool.active_worker_limit == 2
+        assert pool.get_progress() == "1"
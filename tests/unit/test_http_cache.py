@@ -0,0 +1,168 @@
+import json
+
+import mock
+import requests
+
+from gradient.api_sdk import http_cache
+from gradient.api_sdk.clients import DatasetsClient, DatasetVersionsClient, http_client
+from gradient.api_sdk.config import config
+
+URL = "https://api.paperspace.io/datasets/dsttn2y7j1ux882"
+HEADERS = {"X-API-Key": "some_key"}
+DATASET = {"id": "dsttn2y7j1ux882", "name": "some_dataset", "storageProvider": {"type": "s3"}}
+
+
+def make_response(status_code=200, data=None, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.url = URL
+    response._content = json.dumps(data).encode("utf-8") if data is not None else b""
+    return response
+
+
+class TestHttpCache(object):
+    def test_should_use_stored_response_while_it_is_fresh_according_to_cache_control(self, tmpdir):
+        cache = http_cache.HttpCache(str(tmpdir))
+        send_request = mock.MagicMock(return_value=make_response(data=DATASET, headers={"Cache-Control": "max-age=60"}))
+
+        cache.send(URL, {"a": 1}, HEADERS, send_request)
+        response = cache.send(URL, {"a": 1}, HEADERS, send_request)
+
+        send_request.assert_called_once_with(HEADERS)
+        assert response.status_code == 200
+        assert response.json() == DATASET
+
+    def test_should_use_stored_response_for_ttl_overriding_cache_control(self, tmpdir):
+        cache = http_cache.HttpCache(str(tmpdir))
+        send_request = mock.MagicMock(return_value=make_response(data=DATASET, headers={"Cache-Control": "no-store"}))
+
+        cache.send(URL, None, HEADERS, send_request, ttl=60)
+        response = cache.send(URL, None, HEADERS, send_request, ttl=60)
+
+        send_request.assert_called_once()
+        assert response.json() == DATASET
+
+    def test_should_not_store_response_without_freshness_or_validators(self, tmpdir):
+        cache = http_cache.HttpCache(str(tmpdir))
+        send_request = mock.MagicMock(return_value=make_response(data=DATASET))
+
+        cache.send(URL, None, HEADERS, send_request)
+        cache.send(URL, None, HEADERS, send_request)
+
+        assert send_request.call_count == 2
+        assert not tmpdir.listdir()
+
+    def test_should_revalidate_stale_response_with_etag_and_use_it_when_not_modified(self, tmpdir):
+        cache = http_cache.HttpCache(str(tmpdir))
+        headers = {"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT", "Cache-Control": "no-cache"}
+        send_request = mock.MagicMock(side_effect=[
+            make_response(data=DATASET, headers=headers),
+            make_response(status_code=304, headers={"ETag": '"v1"'}),
+        ])
+
+        cache.send(URL, None, HEADERS, send_request)
+        response = cache.send(URL, None, HEADERS, send_request)
+
+        send_request.assert_called_with({
+            "X-API-Key": "some_key",
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        })
+        assert response.status_code == 200
+        assert response.json() == DATASET
+
+    def test_should_replace_stored_response_when_it_was_modified(self, tmpdir):
+        cache = http_cache.HttpCache(str(tmpdir))
+        new_dataset = dict(DATASET, name="new_name")
+        send_request = mock.MagicMock(side_effect=[
+            make_response(data=DATASET, headers={"ETag": '"v1"'}),
+            make_response(data=new_dataset, headers={"ETag": '"v2"', "Cache-Control": "max-age=60"}),
+        ])
+
+        cache.send(URL, None, HEADERS, send_request)
+        cache.send(URL, None, HEADERS, send_request)
+        response = cache.send(URL, None, HEADERS, send_request)
+
+        assert send_request.call_count == 2
+        assert response.json() == new_dataset
+
+    def test_should_store_responses_separately_for_each_api_key_and_params(self, tmpdir):
+        cache = http_cache.HttpCache(str(tmpdir))
+        send_request = mock.MagicMock(return_value=make_response(data=DATASET, headers={"Cache-Control": "max-age=60"}))
+
+        cache.send(URL, None, HEADERS, send_request)
+        cache.send(URL, None, {"X-API-Key": "other_key"}, send_request)
+        cache.send(URL, {"limit": 20}, HEADERS, send_request)
+        cache.send(URL, {"limit": 20}, HEADERS, send_request)
+
+        assert send_request.call_count == 3
+
+    def test_should_remove_stored_responses_of_host_when_invalidated(self, tmpdir):
+        cache = http_cache.HttpCache(str(tmpdir))
+        send_request = mock.MagicMock(return_value=make_response(data=DATASET, headers={"Cache-Control": "max-age=60"}))
+        cache.send(URL, None, HEADERS, send_request)
+
+        cache.invalidate("https://api.paperspace.io")
+        cache.send(URL, None, HEADERS, send_request)
+
+        assert send_request.call_count == 2
+
+
+class TestAPIWithHttpCache(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_send_get_request_once_when_response_is_cached(self, get_patched, tmpdir):
+        get_patched.return_value = make_response(data=DATASET)
+        api = http_client.API("https://api.paperspace.io", api_key="some_key",
+                              cache=http_cache.HttpCache(str(tmpdir)), cache_ttl=60)
+
+        api.get("/datasets/dsttn2y7j1ux882")
+        response = api.get("/datasets/dsttn2y7j1ux882")
+
+        get_patched.assert_called_once()
+        assert response.json() == DATASET
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_invalidate_cache_after_successful_post(self, get_patched, post_patched, tmpdir):
+        get_patched.return_value = make_response(data=DATASET)
+        post_patched.return_value = make_response(data={})
+        api = http_client.API("https://api.paperspace.io", api_key="some_key",
+                              cache=http_cache.HttpCache(str(tmpdir)), cache_ttl=60)
+
+        api.get("/datasets/dsttn2y7j1ux882")
+        api.post("/datasets/dsttn2y7j1ux882", json={"name": "new_name"})
+        api.get("/datasets/dsttn2y7j1ux882")
+
+        assert get_patched.call_count == 2
+
+
+@mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+def test_should_get_dataset_from_cache_when_http_cache_is_enabled(get_patched, tmpdir):
+    get_patched.return_value = make_response(data=DATASET)
+    client = DatasetsClient(api_key="some_key")
+
+    with mock.patch.object(config, "HTTP_CACHE", True), mock.patch.object(config, "HTTP_CACHE_PATH", str(tmpdir)):
+        client.get("dsttn2y7j1ux882")
+        dataset = client.get("dsttn2y7j1ux882")
+
+    get_patched.assert_called_once()
+    assert dataset.id == "dsttn2y7j1ux882"
+
+
+@mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+@mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+def test_should_keep_cached_dataset_after_signing_urls(get_patched, post_patched, tmpdir):
+    get_patched.return_value = make_response(data=DATASET)
+    post_patched.return_value = make_response(data=[{"url": "https://s3.amazonaws.com/some_key", "expiresIn": 3600}])
+    client = DatasetsClient(api_key="some_key")
+    versions_client = DatasetVersionsClient(api_key="some_key")
+
+    with mock.patch.object(config, "HTTP_CACHE", True), mock.patch.object(config, "HTTP_CACHE_PATH", str(tmpdir)):
+        client.get("dsttn2y7j1ux882")
+        versions_client.generate_pre_signed_s3_urls("dsttn2y7j1ux882:1rn19s2", [
+            {"method": "getObject", "params": {"Key": "some_key"}}])
+        client.get("dsttn2y7j1ux882")
+
+    get_patched.assert_called_once()
+    post_patched.assert_called_once()
@@ -0,0 +1,79 @@
+import threading
+
+from gradient.api_sdk.clients import http_client
+
+
+class TestSessionPool(object):
+    def test_should_return_the_same_session_for_urls_with_the_same_host(self):
+        pool = http_client.SessionPool()
+
+        session = pool.get_session("https://api.paperspace.io/notebooks/getNotebooks")
+
+        assert pool.get_session("https://api.paperspace.io") is session
+        assert pool.get_session("HTTPS://API.paperspace.io/projects/") is session
+
+    def test_should_return_separate_sessions_for_different_hosts(self):
+        pool = http_client.SessionPool()
+
+        api_session = pool.get_session("https://api.paperspace.io")
+        logs_session = pool.get_session("https://logs.paperspace.io")
+        http_session = pool.get_session("http://api.paperspace.io")
+
+        assert api_session is not logs_session
+        assert api_session is not http_session
+
+    def test_should_mount_adapters_with_configured_pool_size(self):
+        pool = http_client.SessionPool(pool_connections=3, pool_maxsize=7)
+
+        session = pool.get_session("https://api.paperspace.io")
+        adapter = session.get_adapter("https://api.paperspace.io")
+
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+        assert session.headers.get("Connection") != "close"
+
+    def test_should_close_connections_after_each_request_when_keep_alive_is_disabled(self):
+        pool = http_client.SessionPool(keep_alive=False)
+
+        session = pool.get_session("https://api.paperspace.io")
+
+        assert session.headers["Connection"] == "close"
+
+    def test_should_create_single_session_per_host_when_used_from_many_threads(self):
+        pool = http_client.SessionPool()
+        sessions = []
+
+        def get_session():
+            sessions.append(pool.get_session("https://api.paperspace.io"))
+
+        threads = [threading.Thread(target=get_session) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(id(s) for s in sessions)) == 1
+
+    def test_should_drop_sessions_when_pool_was_closed(self):
+        pool = http_client.SessionPool()
+        session = pool.get_session("https://api.paperspace.io")
+
+        pool.close()
+
+        assert pool.get_session("https://api.paperspace.io") is not session
+
+
+class TestAPI(object):
+    def test_should_use_shared_session_for_api_url_host(self):
+        api = http_client.API("https://api.paperspace.io")
+        other_api = http_client.API("https://api.paperspace.io/", api_key="some_key")
+
+        assert api.session is other_api.session
+        assert api.session is http_client.session_pool.get_session("https://api.paperspace.io")
+
+    def test_should_use_session_passed_to_constructor(self):
+        session = http_client.requests.Session()
+
+        api = http_client.API("https://api.paperspace.io", session=session)
+
+        assert api.session is session
@@ -0,0 +1,143 @@
+import threading
+
+import mock
+import pytest
+
+from gradient.api_sdk.clients import DatasetsClient, DatasetVersionsClient
+from gradient.api_sdk.request_memo import RequestMemo
+from tests import MockResponse
+
+URL = "https://api.paperspace.io/datasets/dsttn2y7j1ux882"
+HEADERS = {"X-API-Key": "some_key"}
+DATASET = {"id": "dsttn2y7j1ux882", "name": "some_dataset", "storageProvider": {"type": "s3"}}
+
+
+class TestRequestMemo(object):
+    def test_should_send_identical_requests_once(self):
+        memo = RequestMemo()
+        send_request = mock.MagicMock(return_value=MockResponse(DATASET))
+
+        first = memo.get(URL, {"a": 1}, None, HEADERS, send_request)
+        second = memo.get(URL, {"a": 1}, None, HEADERS, send_request)
+
+        send_request.assert_called_once()
+        assert first is second
+
+    def test_should_send_requests_with_different_params_body_or_api_key(self):
+        memo = RequestMemo()
+        send_request = mock.MagicMock(return_value=MockResponse(DATASET))
+
+        memo.get(URL, None, None, HEADERS, send_request)
+        memo.get(URL, {"a": 1}, None, HEADERS, send_request)
+        memo.get(URL, None, {"notebookId": "some_id"}, HEADERS, send_request)
+        memo.get(URL, None, None, {"X-API-Key": "other_key"}, send_request)
+
+        assert send_request.call_count == 4
+
+    def test_should_wait_for_request_in_flight_instead_of_sending_it_again(self):
+        memo = RequestMemo()
+        release = threading.Event()
+        responses = []
+
+        def send_request():
+            release.wait(5)
+            return MockResponse(DATASET)
+
+        send_request_mock = mock.MagicMock(side_effect=send_request)
+
+        def get():
+            responses.append(memo.get(URL, None, None, HEADERS, send_request_mock))
+
+        threads = [threading.Thread(target=get) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        send_request_mock.assert_called_once()
+        assert len(responses) == 10
+        assert len(set(id(r) for r in responses)) == 1
+
+    def test_should_not_remember_failed_responses(self):
+        memo = RequestMemo()
+        send_request = mock.MagicMock(side_effect=[MockResponse(status_code=500), MockResponse(DATASET)])
+
+        first = memo.get(URL, None, None, HEADERS, send_request)
+        second = memo.get(URL, None, None, HEADERS, send_request)
+
+        assert first.status_code == 500
+        assert second.json() == DATASET
+
+    def test_should_not_remember_exceptions(self):
+        memo = RequestMemo()
+        send_request = mock.MagicMock(side_effect=[IOError("connection reset"), MockResponse(DATASET)])
+
+        with pytest.raises(IOError):
+            memo.get(URL, None, None, HEADERS, send_request)
+        response = memo.get(URL, None, None, HEADERS, send_request)
+
+        assert response.json() == DATASET
+
+    def test_should_send_request_again_after_memo_was_cleared(self):
+        memo = RequestMemo()
+        send_request = mock.MagicMock(return_value=MockResponse(DATASET))
+
+        memo.get(URL, None, None, HEADERS, send_request)
+        memo.clear()
+        memo.get(URL, None, None, HEADERS, send_request)
+
+        assert send_request.call_count == 2
+
+
+class TestClientWithRequestMemo(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_get_dataset_once_when_client_uses_memo(self, get_patched):
+        get_patched.return_value = MockResponse(DATASET)
+        client = DatasetsClient(api_key="some_key", memo=RequestMemo())
+
+        client.get("dsttn2y7j1ux882")
+        dataset = client.get("dsttn2y7j1ux882")
+
+        get_patched.assert_called_once()
+        assert dataset.id == "dsttn2y7j1ux882"
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_get_dataset_every_time_when_client_does_not_use_memo(self, get_patched):
+        get_patched.return_value = MockResponse(DATASET)
+        client = DatasetsClient(api_key="some_key")
+
+        client.get("dsttn2y7j1ux882")
+        client.get("dsttn2y7j1ux882")
+
+        assert get_patched.call_count == 2
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_get_dataset_again_after_it_was_updated(self, get_patched, post_patched):
+        get_patched.return_value = MockResponse(DATASET)
+        post_patched.return_value = MockResponse(DATASET)
+        client = DatasetsClient(api_key="some_key", memo=RequestMemo())
+
+        client.get("dsttn2y7j1ux882")
+        client.update("dsttn2y7j1ux882", name="new_name")
+        client.get("dsttn2y7j1ux882")
+
+        assert get_patched.call_count == 2
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_keep_remembered_dataset_after_signing_urls(self, get_patched, post_patched):
+        get_patched.return_value = MockResponse(DATASET)
+        post_patched.return_value = MockResponse([{"url": "https://s3.amazonaws.com/some_key", "expiresIn": 3600}])
+        memo = RequestMemo()
+        client = DatasetsClient(api_key="some_key", memo=memo)
+        versions_client = DatasetVersionsClient(api_key="some_key", memo=memo)
+
+        client.get("dsttn2y7j1ux882")
+        versions_client.generate_pre_signed_s3_urls("dsttn2y7j1ux882:1rn19s2", [
+            {"method": "getObject", "params": {"Key": "some_key"}}])
+        client.get("dsttn2y7j1ux882")
+
+        get_patched.assert_called_once()
+        post_patched.assert_called_once()
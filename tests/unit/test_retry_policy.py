@@ -0,0 +1,124 @@
+import mock
+import pytest
+import requests
+
+from gradient.api_sdk import retry_policy
+from gradient.api_sdk.clients import http_client
+from tests import MockResponse
+
+URL = "https://api.paperspace.io/datasets/some_id"
+
+
+class TestRetryPolicy(object):
+    def test_should_retry_get_request_until_success_when_server_responded_with_retryable_status(self):
+        sleep = mock.MagicMock()
+        policy = retry_policy.RetryPolicy(max_retries=3, sleep=sleep)
+        send_request = mock.MagicMock(side_effect=[
+            MockResponse(status_code=503),
+            MockResponse(status_code=502),
+            MockResponse({"id": "some_id"}),
+        ])
+
+        response = policy.send("GET", URL, send_request)
+
+        assert response.status_code == 200
+        assert send_request.call_count == 3
+        assert sleep.call_count == 2
+        assert policy.retry_counts == {"GET " + URL: 2}
+
+    def test_should_return_last_response_when_retries_were_exhausted(self):
+        policy = retry_policy.RetryPolicy(max_retries=2, sleep=mock.MagicMock())
+        send_request = mock.MagicMock(return_value=MockResponse(status_code=429))
+
+        response = policy.send("DELETE", URL, send_request)
+
+        assert response.status_code == 429
+        assert send_request.call_count == 3
+
+    def test_should_not_retry_post_request_unless_it_was_marked_as_idempotent(self):
+        policy = retry_policy.RetryPolicy(max_retries=3, sleep=mock.MagicMock())
+        send_request = mock.MagicMock(return_value=MockResponse(status_code=503))
+
+        policy.send("POST", URL, send_request)
+        assert send_request.call_count == 1
+
+        policy.send("POST", URL, send_request, idempotent=True)
+        assert send_request.call_count == 5
+
+    def test_should_retry_post_request_when_policy_allows_retrying_non_idempotent_requests(self):
+        policy = retry_policy.RetryPolicy(max_retries=1, retry_non_idempotent=True, sleep=mock.MagicMock())
+        send_request = mock.MagicMock(return_value=MockResponse(status_code=503))
+
+        policy.send("POST", URL, send_request)
+
+        assert send_request.call_count == 2
+
+    def test_should_not_retry_client_and_server_errors_other_than_retryable_ones(self):
+        policy = retry_policy.RetryPolicy(max_retries=3, sleep=mock.MagicMock())
+        send_request = mock.MagicMock(side_effect=[MockResponse(status_code=500), MockResponse(status_code=404)])
+
+        assert policy.send("GET", URL, send_request).status_code == 500
+        assert policy.send("GET", URL, send_request).status_code == 404
+        assert send_request.call_count == 2
+        assert policy.retry_counts == {}
+
+    def test_should_retry_connection_errors_and_reraise_when_retries_were_exhausted(self):
+        policy = retry_policy.RetryPolicy(max_retries=2, sleep=mock.MagicMock())
+        send_request = mock.MagicMock(side_effect=requests.exceptions.ConnectionError("connection reset"))
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            policy.send("PUT", URL, send_request)
+
+        assert send_request.call_count == 3
+
+    def test_should_wait_as_long_as_retry_after_header_says(self):
+        sleep = mock.MagicMock()
+        policy = retry_policy.RetryPolicy(max_retries=1, sleep=sleep)
+        send_request = mock.MagicMock(side_effect=[
+            MockResponse(status_code=429, headers={"Retry-After": "7"}),
+            MockResponse(),
+        ])
+
+        policy.send("GET", URL, send_request)
+
+        sleep.assert_called_once_with(7.0)
+
+    def test_should_limit_retry_after_to_max_backoff(self):
+        response = MockResponse(status_code=503, headers={"Retry-After": "3600"})
+        policy = retry_policy.RetryPolicy(max_backoff=20)
+
+        assert policy.get_backoff_time(0, response) == 20
+
+    def test_should_parse_retry_after_http_date(self):
+        response = MockResponse(status_code=503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+        assert retry_policy.RetryPolicy.get_retry_after(response) == 0
+
+    @mock.patch("gradient.api_sdk.retry_policy.random.uniform")
+    def test_should_grow_backoff_exponentially_up_to_max_backoff(self, uniform_patched):
+        uniform_patched.side_effect = lambda a, b: b
+        policy = retry_policy.RetryPolicy(backoff_factor=0.5, max_backoff=3)
+
+        assert [policy.get_backoff_time(attempt) for attempt in range(5)] == [0.5, 1, 2, 3, 3]
+
+    def test_should_not_retry_anything_when_no_retry_policy_was_used(self):
+        policy = retry_policy.NoRetryPolicy()
+        send_request = mock.MagicMock(return_value=MockResponse(status_code=503))
+
+        policy.send("GET", URL, send_request)
+
+        assert send_request.call_count == 1
+
+
+class TestAPIRetries(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_retry_get_request_sent_by_api_client(self, get_patched):
+        get_patched.side_effect = [MockResponse(status_code=503), MockResponse({"id": "some_id"})]
+        policy = retry_policy.RetryPolicy(max_retries=3, sleep=mock.MagicMock())
+        api = http_client.API("https://api.paperspace.io", retry_policy=policy)
+
+        response = api.get("/datasets/some_id")
+
+        assert response.json() == {"id": "some_id"}
+        assert get_patched.call_count == 2
+        assert policy.retry_counts == {"GET " + URL: 1}
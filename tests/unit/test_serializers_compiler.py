@@ -0,0 +1,79 @@
+import copy
+
+from gradient.api_sdk import serializers
+from gradient.api_sdk.serializers import compiler
+from tests import example_responses
+
+
+def get_notebook_rows():
+    rows = copy.deepcopy(example_responses.NOTEBOOKS_LIST_RESPONSE_JSON["notebookList"])
+    for row in rows:
+        row["id"] = row["handle"]
+    return rows
+
+
+def as_dict(instance):
+    if isinstance(instance, list):
+        return [as_dict(item) for item in instance]
+    if hasattr(instance, "__dict__"):
+        return {key: as_dict(value) for key, value in instance.__dict__.items()}
+    return instance
+
+
+class TestCompiledLoader(object):
+    def _assert_same_as_regular_path(self, schema_cls, rows):
+        schema = schema_cls()
+        loader = compiler.get_loader(schema)
+        assert loader is not None
+
+        for row in rows:
+            expected = schema_cls()._get_instance(copy.deepcopy(row))
+            assert as_dict(loader(copy.deepcopy(row))) == as_dict(expected)
+
+    def test_should_build_notebooks_same_as_regular_path(self):
+        self._assert_same_as_regular_path(serializers.NotebookSchema, get_notebook_rows())
+
+    def test_should_build_machines_same_as_regular_path(self):
+        self._assert_same_as_regular_path(serializers.MachineSchema, example_responses.LIST_MACHINES_RESPONSE)
+
+    def test_should_build_models_same_as_regular_path(self):
+        self._assert_same_as_regular_path(serializers.Model, example_responses.LIST_MODELS_RESPONSE_JSON["modelList"])
+
+    def test_should_be_used_by_get_instance_for_lists(self):
+        rows = example_responses.LIST_MACHINES_RESPONSE
+
+        machines = serializers.MachineSchema().get_instance(copy.deepcopy(rows), many=True)
+
+        assert [m.id for m in machines] == [row["id"] for row in rows]
+
+    def test_should_skip_invalid_values_the_way_load_does(self):
+        row = dict(example_responses.LIST_MACHINES_RESPONSE[0], cpus="not a number")
+        schema = serializers.MachineSchema()
+
+        machine = compiler.get_loader(schema)(copy.deepcopy(row))
+
+        assert as_dict(machine) == as_dict(serializers.MachineSchema()._get_instance(copy.deepcopy(row)))
+        assert machine.cpus is None
+
+    def test_should_return_none_for_data_that_is_not_an_object(self):
+        loader = compiler.get_loader(serializers.MachineSchema())
+
+        assert loader(None) is None
+        assert loader("some string") is None
+
+
+class TestGetLoader(object):
+    def test_should_not_compile_schemas_with_load_hooks(self):
+        assert compiler.get_loader(serializers.VmTypeSchema()) is None
+        assert compiler.get_loader(serializers.LogRowSchema()) is None
+
+    def test_should_not_use_compiled_loader_for_schema_with_non_default_options(self):
+        assert compiler.get_loader(serializers.NotebookSchema()) is not None
+        assert compiler.get_loader(serializers.NotebookSchema(only=("id",))) is None
+        assert compiler.get_loader(serializers.NotebookSchema(strict=True)) is None
+
+    def test_should_compile_loader_once_per_schema_class(self):
+        first = compiler.get_loader(serializers.NotebookSchema())
+        second = compiler.get_loader(serializers.NotebookSchema())
+
+        assert first is second
@@ -1,7 +1,11 @@
+import json
+import time
+
 import mock
 import pytest
 
 from gradient import version_checker
+from gradient.api_sdk.config import config
 from gradient.version import version
 
 
@@ -93,3 +97,71 @@ def test_should_return_false_when_current_version_is_lower_than_latest_from_pypi
 
     assert not up_to_date
     assert version_in_repository == "1.2.3"
+
+
+def write_version_cache(config_dir, **cache):
+    with open(str(config_dir.join(version_checker.VERSION_CHECK_CACHE_FILE_NAME)), "w") as f:
+        json.dump(cache, f)
+
+
+def read_version_cache(config_dir):
+    with open(str(config_dir.join(version_checker.VERSION_CHECK_CACHE_FILE_NAME))) as f:
+        return json.load(f)
+
+
+@mock.patch("gradient.version_checker.GradientVersionChecker._should_check_version", return_value=True)
+@mock.patch("gradient.version_checker.GradientVersionChecker._start_cache_refresh")
+@mock.patch("gradient.version_checker.VersionChecker.get_version_from_repository")
+@mock.patch("gradient.version_checker.logger")
+def test_should_warn_about_new_version_from_fresh_cache_without_refreshing_it(
+        logger_patched, get_version_patched, start_refresh_patched, _, tmpdir):
+    write_version_cache(tmpdir, checkedAt=time.time(), latestVersion="999.0.0")
+
+    with mock.patch.object(config, "CONFIG_DIR_PATH", str(tmpdir)):
+        version_checker.GradientVersionChecker.look_for_new_version_in_background()
+
+    logger_patched.warning.assert_called_once()
+    get_version_patched.assert_not_called()
+    start_refresh_patched.assert_not_called()
+
+
+@mock.patch("gradient.version_checker.GradientVersionChecker._should_check_version", return_value=True)
+@mock.patch("gradient.version_checker.GradientVersionChecker._start_cache_refresh")
+@mock.patch("gradient.version_checker.logger")
+def test_should_start_cache_refresh_only_once_when_cache_is_stale(logger_patched, start_refresh_patched, _, tmpdir):
+    write_version_cache(tmpdir, checkedAt=time.time() - 2 * config.VERSION_CHECK_INTERVAL, latestVersion=version)
+
+    with mock.patch.object(config, "CONFIG_DIR_PATH", str(tmpdir)):
+        version_checker.GradientVersionChecker.look_for_new_version_in_background()
+        version_checker.GradientVersionChecker.look_for_new_version_in_background()
+
+    logger_patched.warning.assert_not_called()
+    start_refresh_patched.assert_called_once()
+    assert read_version_cache(tmpdir)["latestVersion"] == version
+
+
+@mock.patch("gradient.version_checker.GradientVersionChecker._should_check_version", return_value=True)
+@mock.patch("gradient.version_checker.GradientVersionChecker._start_cache_refresh")
+@mock.patch("gradient.version_checker.logger")
+def test_should_start_cache_refresh_when_there_is_no_cache(logger_patched, start_refresh_patched, _, tmpdir):
+    config_dir = tmpdir.join("config")
+
+    with mock.patch.object(config, "CONFIG_DIR_PATH", str(config_dir)):
+        version_checker.GradientVersionChecker.look_for_new_version_in_background()
+
+    logger_patched.warning.assert_not_called()
+    start_refresh_patched.assert_called_once()
+    assert "attemptedAt" in read_version_cache(config_dir)
+
+
+@mock.patch("gradient.version_checker.VersionChecker.get_version_from_repository")
+def test_should_save_latest_version_in_cache_when_refreshing_cache(get_version_patched, tmpdir):
+    get_version_patched.return_value = "1.2.3"
+    write_version_cache(tmpdir, checkedAt=0, attemptedAt=time.time())
+
+    with mock.patch.object(config, "CONFIG_DIR_PATH", str(tmpdir)), mock.patch("socket.setdefaulttimeout"):
+        version_checker.GradientVersionChecker.refresh_cache()
+
+    cache = read_version_cache(tmpdir)
+    assert cache["latestVersion"] == "1.2.3"
+    assert cache["checkedAt"] > 0